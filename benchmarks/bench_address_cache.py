@@ -0,0 +1,54 @@
+"""Measures building output blocks for a set of repeat payees with the
+decoded address cache enabled and disabled, and get_version on its own.
+
+Run from the repository root: python -m benchmarks.bench_address_cache
+"""
+import os
+import timeit
+
+from lit.bech32 import segwit_encode
+from lit.format import (
+    ADDRESS_CACHE, DEFAULT_ADDRESS_CACHE_SIZE, get_version, public_key_to_address,
+    set_address_cache_size
+)
+from lit.transaction import construct_output_block
+from lit.wallet import PrivateKey
+
+PAYEES = 100
+OUTPUTS = 20
+BLOCKS = 500
+
+
+def main():
+    addresses = [public_key_to_address(PrivateKey().public_key) for _ in range(PAYEES // 2)]
+    addresses += [segwit_encode('ltc', 0, os.urandom(20)) for _ in range(PAYEES - len(addresses))]
+    batches = [
+        [(addresses[(i * OUTPUTS + j) % PAYEES], 10000 + j) for j in range(OUTPUTS)]
+        for i in range(BLOCKS)
+    ]
+
+    def build():
+        for outputs in batches:
+            construct_output_block(outputs)
+
+    def versions():
+        for address in addresses[:PAYEES // 2] * 10:
+            get_version(address)
+
+    print('{} payees, {} blocks of {} outputs'.format(PAYEES, BLOCKS, OUTPUTS))
+    print('{:>10} {:>16} {:>16}'.format('cache', 'blocks (ms)', 'get_version (us)'))
+
+    for size in (0, DEFAULT_ADDRESS_CACHE_SIZE):
+        set_address_cache_size(size)
+        ADDRESS_CACHE.clear()
+
+        block_time = min(timeit.repeat(build, number=1, repeat=3)) * 1e3
+        version_time = min(timeit.repeat(versions, number=1, repeat=3)) / (PAYEES // 2 * 10) * 1e6
+
+        print('{:>10} {:>16.1f} {:>16.2f}'.format(size, block_time, version_time))
+
+    print(ADDRESS_CACHE.stats())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Compares base58 encoding and decoding one digit at a time, as b58encode
+and b58decode used to for every size, with splitting numbers in halves by
+powers of 58, which they now use above LARGE_BYTES and LARGE_CHARS.
+
+Run from the repository root: python -m benchmarks.bench_base58
+"""
+import os
+import timeit
+from collections import deque
+
+from lit.base58 import (
+    BASE58_ALPHABET_INDEX, BASE58_ALPHABET_LIST, b58decode_large, b58encode_large
+)
+
+SIZES = (21, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+def digitwise_encode(num):
+    alphabet = BASE58_ALPHABET_LIST
+    encoded = deque()
+    append = encoded.appendleft
+
+    while num > 0:
+        num, rem = divmod(num, 58)
+        append(alphabet[rem])
+
+    return ''.join(encoded)
+
+
+def digitwise_decode(string):
+    alphabet_index = BASE58_ALPHABET_INDEX
+    num = 0
+
+    for char in string:
+        num *= 58
+        num += alphabet_index[char]
+
+    return num
+
+
+def main():
+    print('{:>6} {:>14} {:>14} {:>14} {:>14}'.format(
+        'bytes', 'encode (us)', 'split (us)', 'decode (us)', 'split (us)'
+    ))
+
+    for size in SIZES:
+        num = int.from_bytes(b'\xff' + os.urandom(size - 1), 'big')
+        string = digitwise_encode(num)
+        assert b58encode_large(num) == string
+        assert b58decode_large(string) == digitwise_decode(string) == num
+
+        number = max(10, 20000 // size)
+        times = [
+            min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+            for func in (
+                lambda: digitwise_encode(num),
+                lambda: b58encode_large(num),
+                lambda: digitwise_decode(string),
+                lambda: b58decode_large(string),
+            )
+        ]
+
+        print('{:>6} {:>14.1f} {:>14.1f} {:>14.1f} {:>14.1f}'.format(size, *times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Measures encoding and decoding batches of addresses and WIF keys with
+b58encode_check_many and b58decode_check_many against calling
+b58encode_check and b58decode_check for each one.
+
+Run from the repository root: python -m benchmarks.bench_base58_check
+"""
+import os
+import timeit
+
+from lit.base58 import (
+    b58decode_check, b58decode_check_many, b58encode_check, b58encode_check_many
+)
+
+BATCH = 10000
+KINDS = (
+    ('address', lambda: b'\x30' + os.urandom(20)),
+    ('wif', lambda: b'\xb0' + os.urandom(32)),
+    ('compressed wif', lambda: b'\xb0' + os.urandom(32) + b'\x01'),
+)
+
+
+def main():
+    print('{} payloads per batch'.format(BATCH))
+    print('{:>16} {:>14} {:>14} {:>14} {:>14}'.format(
+        '', 'encode (us)', 'many (us)', 'decode (us)', 'many (us)'
+    ))
+
+    for name, make in KINDS:
+        payloads = [make() for _ in range(BATCH)]
+        strings = [b58encode_check(payload) for payload in payloads]
+        assert [encoded for encoded, _ in b58encode_check_many(payloads)] == strings
+        assert [payload for payload, _ in b58decode_check_many(strings)] == payloads
+
+        times = [
+            min(timeit.repeat(func, number=1, repeat=3)) / BATCH * 1e6
+            for func in (
+                lambda: [b58encode_check(payload) for payload in payloads],
+                lambda: list(b58encode_check_many(payloads)),
+                lambda: [b58decode_check(string) for string in strings],
+                lambda: list(b58decode_check_many(strings)),
+            )
+        ]
+
+        print('{:>16} {:>14.2f} {:>14.2f} {:>14.2f} {:>14.2f}'.format(name, *times))
+
+
+if __name__ == '__main__':
+    main()
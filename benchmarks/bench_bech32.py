@@ -0,0 +1,79 @@
+"""Compares decoding a payout file's worth of native SegWit addresses with the
+BIP173 reference algorithm and with segwit_decode_many.
+
+Run from the repository root: python -m benchmarks.bench_bech32
+"""
+import os
+import timeit
+
+from lit.bech32 import (
+    BECH32_ALPHABET, BECH32_CONST, BECH32M_CONST, segwit_decode_many, segwit_encode
+)
+
+HRP = 'ltc'
+SIZES = (1000, 10000, 100000)
+
+
+def reference_polymod(values):
+    generator = [0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3]
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1ffffff) << 5 ^ value
+        for i in range(5):
+            chk ^= generator[i] if ((top >> i) & 1) else 0
+    return chk
+
+
+def reference_convertbits(data, frombits, tobits):
+    acc = 0
+    bits = 0
+    ret = []
+    maxv = (1 << tobits) - 1
+    for value in data:
+        acc = (acc << frombits) | value
+        bits += frombits
+        while bits >= tobits:
+            bits -= tobits
+            ret.append((acc >> bits) & maxv)
+    if bits >= frombits or ((acc << (tobits - bits)) & maxv):
+        return None
+    return ret
+
+
+def reference_decode(hrp, address):
+    address = address.lower()
+    pos = address.rfind('1')
+    if address[:pos] != hrp:
+        return None
+    data = [BECH32_ALPHABET.find(char) for char in address[pos + 1:]]
+    if -1 in data:
+        return None
+    expanded = [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp]
+    const = reference_polymod(expanded + data)
+    if const != (BECH32_CONST if data[0] == 0 else BECH32M_CONST):
+        return None
+    program = reference_convertbits(data[1:-6], 5, 8)
+    if program is None or not 2 <= len(program) <= 40:
+        return None
+    return data[0], bytes(program)
+
+
+def main():
+    print('{:>10} {:>16} {:>16} {:>12}'.format('addresses', 'reference (s)', 'batch (s)', 'batch us'))
+
+    for n in SIZES:
+        addresses = [segwit_encode(HRP, 0, os.urandom(20 if i % 2 else 32)) for i in range(n)]
+        assert [reference_decode(HRP, address) for address in addresses] == \
+            segwit_decode_many(HRP, addresses)
+
+        reference = min(timeit.repeat(
+            lambda: [reference_decode(HRP, address) for address in addresses], number=1, repeat=3
+        ))
+        batch = min(timeit.repeat(lambda: segwit_decode_many(HRP, addresses), number=1, repeat=3))
+
+        print('{:>10} {:>16.4f} {:>16.4f} {:>12.2f}'.format(n, reference, batch, batch / n * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Compares bumping the fee of a backlog of stuck payout transactions with
+bump_fee, which reuses their parsed inputs and serialized outputs, against
+rebuilding each one from its outputs with create_p2pkh_transaction.
+
+Run from the repository root: python -m benchmarks.bench_bump_fee
+"""
+import timeit
+
+from benchmarks.samples import RECIPIENTS, TXID
+from lit import PrivateKeyTestnet
+from lit.network.meta import Unspent
+from lit.transaction import (
+    bump_fee, calc_output_block_size, calc_tx_vsize, create_p2pkh_transaction
+)
+
+BACKLOG = 200
+PAYOUTS = 50
+INPUTS = 3
+
+
+def main():
+    private_key = PrivateKeyTestnet()
+    backlog = []
+
+    for i in range(BACKLOG):
+        unspents = [Unspent(10 ** 7, 1, '', TXID, i * INPUTS + j) for j in range(INPUTS)]
+        outputs = [(RECIPIENTS[j % 2], 1000 + j) for j in range(PAYOUTS)]
+        change = sum(unspent.amount for unspent in unspents) - sum(amount for _, amount in outputs)
+        outputs.append((private_key.address, change))
+        outputs[-1] = (private_key.address,
+                       change - calc_tx_vsize(unspents, calc_output_block_size(outputs)))
+
+        tx = create_p2pkh_transaction(private_key, unspents, outputs, as_bytes=True, replaceable=True)
+        backlog.append((tx, unspents, outputs))
+
+    def rebuilt():
+        for _, unspents, outputs in backlog:
+            size = calc_tx_vsize(unspents, calc_output_block_size(outputs))
+            bumped = outputs[:-1] + [(outputs[-1][0], outputs[-1][1] - size * 9)]
+            create_p2pkh_transaction(private_key, unspents, bumped, as_bytes=True, replaceable=True)
+
+    def bumped():
+        for tx, unspents, _ in backlog:
+            bump_fee(private_key, tx, unspents, 10, as_bytes=True)
+
+    rebuild = min(timeit.repeat(rebuilt, number=1, repeat=3))
+    bump = min(timeit.repeat(bumped, number=1, repeat=3))
+
+    print('{} transactions of {} inputs and {} outputs'.format(BACKLOG, INPUTS, PAYOUTS + 1))
+    print('{:>10} {:>10} {:>10}'.format('', 'time (s)', 'ms/tx'))
+    print('{:>10} {:>10.3f} {:>10.2f}'.format('rebuild', rebuild, rebuild / BACKLOG * 1e3))
+    print('{:>10} {:>10.3f} {:>10.2f}'.format('bump_fee', bump, bump / BACKLOG * 1e3))
+
+
+if __name__ == '__main__':
+    main()
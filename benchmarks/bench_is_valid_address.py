@@ -0,0 +1,56 @@
+"""Measures screening user-supplied addresses with is_valid_address against
+catching the ValueError of decode_address, for valid addresses and for
+typical garbage.
+
+Run from the repository root: python -m benchmarks.bench_is_valid_address
+"""
+import os
+import timeit
+
+from lit.bech32 import segwit_encode
+from lit.format import decode_address, is_valid_address, public_key_to_address
+from lit.wallet import PrivateKey
+
+COUNT = 10000
+
+
+def decodes(address):
+    try:
+        decode_address(address)
+    except ValueError:
+        return False
+    return True
+
+
+def main():
+    address = public_key_to_address(PrivateKey().public_key)
+    bech32 = segwit_encode('ltc', 0, os.urandom(20))
+    samples = (
+        ('valid base58', address),
+        ('valid bech32', bech32),
+        ('bitcoin', '1ExJJsNLQDNVVM1s1sdyt1o5P3GC5r32UG'),
+        ('truncated', address[:-1]),
+        ('bad character', address[:-1] + 'l'),
+        ('bad checksum', address[:-1] + ('2' if address[-1] != '2' else '3')),
+        ('text', 'please send it to my usual address'),
+    )
+
+    print('{:>16} {:>16} {:>14} {:>14}'.format('', 'decode (us)', 'valid (us)', 'screen (us)'))
+
+    for name, sample in samples:
+        assert decodes(sample) == is_valid_address(sample)
+
+        times = [
+            min(timeit.repeat(func, number=COUNT, repeat=3)) / COUNT * 1e6
+            for func in (
+                lambda: decodes(sample),
+                lambda: is_valid_address(sample),
+                lambda: is_valid_address(sample, checksum=False),
+            )
+        ]
+
+        print('{:>16} {:>16.2f} {:>14.2f} {:>14.2f}'.format(name, *times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Compares writing and reading a batch of prepared transactions as JSON, as
+prepare_transaction does by default, with the binary container of
+lit.offline.
+
+Run from the repository root: python -m benchmarks.bench_offline
+"""
+import json
+import timeit
+from io import BytesIO
+
+from benchmarks.samples import RECIPIENT, RECIPIENT_SCRIPT, TXID
+from lit.network.meta import Unspent
+from lit.offline import read_prepared, write_prepared
+
+SIZES = (100, 1000, 10000)
+INPUTS = 3
+
+
+def to_json(transactions):
+    return [
+        json.dumps({
+            'unspents': [unspent.to_dict() for unspent in unspents],
+            'outputs': outputs
+        }, separators=(',', ':'))
+        for unspents, outputs in transactions
+    ]
+
+
+def from_json(prepared):
+    transactions = []
+
+    for tx_data in prepared:
+        data = json.loads(tx_data)
+        unspents = [Unspent.from_dict(unspent) for unspent in data['unspents']]
+        transactions.append((unspents, [tuple(output) for output in data['outputs']]))
+
+    return transactions
+
+
+def to_binary(transactions):
+    stream = BytesIO()
+    write_prepared(stream, transactions)
+    return stream.getvalue()
+
+
+def from_binary(data):
+    return list(read_prepared(BytesIO(data)))
+
+
+def main():
+    print('{:>8} {:>12} {:>12} {:>14} {:>14} {:>12} {:>12}'.format(
+        'txs', 'json (KB)', 'binary (KB)', 'json r+w (ms)', 'binary r+w (ms)', 'json us/tx', 'bin us/tx'
+    ))
+
+    for n in SIZES:
+        transactions = [
+            ([Unspent(10000 + i, 6, RECIPIENT_SCRIPT, TXID, i * INPUTS + j) for j in range(INPUTS)],
+             [(RECIPIENT, 20000), (RECIPIENT, 9000 + i)])
+            for i in range(n)
+        ]
+
+        prepared_json = to_json(transactions)
+        prepared = to_binary(transactions)
+        assert from_json(prepared_json) == from_binary(prepared) == transactions
+
+        json_size = sum(len(tx_data) for tx_data in prepared_json)
+        number = max(1, 1000 // n)
+
+        json_time = min(timeit.repeat(
+            lambda: from_json(to_json(transactions)), number=number, repeat=3
+        )) / number
+        binary_time = min(timeit.repeat(
+            lambda: from_binary(to_binary(transactions)), number=number, repeat=3
+        )) / number
+
+        print('{:>8} {:>12.1f} {:>12.1f} {:>14.2f} {:>14.2f} {:>12.2f} {:>12.2f}'.format(
+            n, json_size / 1024, len(prepared) / 1024, json_time * 1e3, binary_time * 1e3,
+            json_time / n * 1e6, binary_time / n * 1e6
+        ))
+
+
+if __name__ == '__main__':
+    main()
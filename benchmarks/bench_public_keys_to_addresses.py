@@ -0,0 +1,46 @@
+"""Measures deriving P2PKH addresses from many public keys one at a time,
+with RIPEMD-160 looked up by name as ripemd160_sha256 used to, against
+public_keys_to_addresses in the calling process and on process pools.
+
+Run from the repository root: python -m benchmarks.bench_public_keys_to_addresses
+"""
+import os
+import timeit
+from hashlib import new, sha256
+
+from lit.base58 import b58encode_check
+from lit.crypto import ECPrivateKey
+from lit.format import MAIN_PUBKEY_HASH, public_key_to_address, public_keys_to_addresses
+
+KEYS = 20000
+
+
+def by_name(public_key):
+    return b58encode_check(MAIN_PUBKEY_HASH + new('ripemd160', sha256(public_key).digest()).digest())
+
+
+def main():
+    public_keys = [ECPrivateKey().public_key.format() for _ in range(KEYS)]
+    expected = [by_name(key) for key in public_keys]
+    assert list(public_keys_to_addresses(public_keys)) == expected
+
+    print('{} keys, {} CPUs'.format(KEYS, os.cpu_count()))
+    print('{:>24} {:>10} {:>10}'.format('', 'time (s)', 'us/key'))
+
+    cases = [
+        ('by name', lambda: [by_name(key) for key in public_keys]),
+        ('public_key_to_address', lambda: [public_key_to_address(key) for key in public_keys]),
+    ]
+    cases += [
+        ('batch ({})'.format(workers or 1),
+         lambda workers=workers: list(public_keys_to_addresses(public_keys, workers=workers)))
+        for workers in (None, 2, 4)
+    ]
+
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+        print('{:>24} {:>10.3f} {:>10.2f}'.format(name, seconds, seconds / KEYS * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Compares the previous coin selection of sanitize_tx_data with
+combine=False, which sorted and walked every UTXO on each send, with
+selecting from a prebuilt UnspentIndex, alone and through sanitize_tx_data.
+
+Run from the repository root: python -m benchmarks.bench_selection
+"""
+import random
+import timeit
+
+from benchmarks.samples import RECIPIENT, RECIPIENT_SCRIPT
+from lit.network.meta import Unspent
+from lit.selection import UnspentIndex
+from lit.transaction import sanitize_tx_data
+
+SIZES = (1000, 10000, 100000)
+TARGETS = 200
+INPUT_COST = 148 * 10
+CHANGE_COST = 34 * 10
+
+
+def sorted_walk(unspents, target):
+    unspents = sorted(unspents, key=lambda x: x.amount)
+
+    total_in = 0
+    index = 0
+
+    for index, unspent in enumerate(unspents):
+        total_in += unspent.amount
+
+        if total_in >= target:
+            break
+
+    return unspents[:index + 1]
+
+
+def main():
+    rng = random.Random(1)
+
+    print('{:>8} {:>14} {:>12} {:>14} {:>12} {:>12} {:>14}'.format(
+        'utxos', 'sort+walk (ms)', 'avg inputs', 'index (ms)', 'avg inputs', 'build (ms)',
+        'sanitize (ms)'))
+
+    for n in SIZES:
+        unspents = [Unspent(rng.randint(10000, 10000000), 1, RECIPIENT_SCRIPT, '', i) for i in range(n)]
+        targets = [rng.randint(100000, 20000000) for _ in range(TARGETS)]
+
+        start = timeit.default_timer()
+        walked = [sorted_walk(unspents, target) for target in targets]
+        walk_time = (timeit.default_timer() - start) / TARGETS
+
+        start = timeit.default_timer()
+        index = UnspentIndex(unspents)
+        build_time = timeit.default_timer() - start
+
+        start = timeit.default_timer()
+        selected = [index.select(target, INPUT_COST, CHANGE_COST)[0] for target in targets]
+        select_time = (timeit.default_timer() - start) / TARGETS
+
+        start = timeit.default_timer()
+        for target in targets:
+            sanitize_tx_data(index, [(RECIPIENT, target, 'satoshi')], 10, RECIPIENT, combine=False)
+        sanitize_time = (timeit.default_timer() - start) / TARGETS
+
+        print('{:>8} {:>14.3f} {:>12.1f} {:>14.3f} {:>12.1f} {:>12.1f} {:>14.3f}'.format(
+            n,
+            walk_time * 1e3, sum(map(len, walked)) / TARGETS,
+            select_time * 1e3, sum(map(len, selected)) / TARGETS,
+            build_time * 1e3, sanitize_time * 1e3
+        ))
+
+
+if __name__ == '__main__':
+    main()
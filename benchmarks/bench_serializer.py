@@ -0,0 +1,63 @@
+"""Compares building output blocks by repeated ``bytes`` concatenation, as
+construct_output_block used to, with the TxWriter-based serializer.
+
+Run from the repository root: python -m benchmarks.bench_serializer
+"""
+import timeit
+
+from lit.transaction import TxWriter, construct_output_block
+from lit.utils import int_to_varint
+
+SCRIPT = bytes.fromhex('76a91492461bde6283b461ece7ddf4dbf1e0a48bd113d888ac')
+SIZES = (1, 100, 10000)
+
+
+def concatenated(outputs):
+    output_block = b''
+
+    for script, amount in outputs:
+        output_block += amount.to_bytes(8, byteorder='little')
+        output_block += int_to_varint(len(script))
+        output_block += script
+
+    return output_block
+
+
+def written(outputs):
+    writer = TxWriter()
+
+    for script, amount in outputs:
+        writer.write_uint64(amount)
+        writer.write_varint(len(script))
+        writer.write(script)
+
+    return writer.getvalue()
+
+
+def main():
+    print('Serialization only (scripts precomputed):')
+    print('{:>8} {:>16} {:>16}'.format('outputs', 'concat (ms)', 'writer (ms)'))
+
+    for n in SIZES:
+        outputs = [(SCRIPT, 1000 + i) for i in range(n)]
+        assert concatenated(outputs) == written(outputs)
+
+        number = max(1, 1000 // n)
+        concat = min(timeit.repeat(lambda: concatenated(outputs), number=number, repeat=3)) / number
+        writer = min(timeit.repeat(lambda: written(outputs), number=number, repeat=3)) / number
+
+        print('{:>8} {:>16.3f} {:>16.3f}'.format(n, concat * 1e3, writer * 1e3))
+
+    print('\nconstruct_output_block (including address decoding):')
+    print('{:>8} {:>16}'.format('outputs', 'time (ms)'))
+
+    for n in SIZES:
+        outputs = [('n2eMqTT929pb1RDNuqEnxdaLau1rxy3efi', 1000 + i) for i in range(n)]
+        number = max(1, 1000 // n)
+        elapsed = min(timeit.repeat(lambda: construct_output_block(outputs), number=number, repeat=3)) / number
+
+        print('{:>8} {:>16.3f}'.format(n, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main()
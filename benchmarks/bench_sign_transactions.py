@@ -0,0 +1,52 @@
+"""Compares signing a batch of prepared transactions one by one with
+sign_transaction against sign_transactions on a process pool.
+
+Run from the repository root: python -m benchmarks.bench_sign_transactions
+"""
+import os
+import timeit
+
+from benchmarks.samples import RECIPIENT, TXID
+from lit import PrivateKeyTestnet
+from lit.network.meta import Unspent
+
+PAYLOADS = 10000
+INPUTS = 2
+
+
+def main():
+    private_key = PrivateKeyTestnet()
+    workers = os.cpu_count()
+
+    prepared = [
+        private_key.prepare_transaction(
+            private_key.address, [(RECIPIENT, 5000 + i, 'satoshi')], fee=1,
+            unspents=[Unspent(10000, 1, '', TXID, i * INPUTS + j) for j in range(INPUTS)],
+            as_bytes=True
+        )
+        for i in range(PAYLOADS)
+    ]
+
+    expected = [private_key.sign_transaction(tx_data) for tx_data in prepared]
+    assert list(private_key.sign_transactions(prepared, workers=workers, chunksize=64)) == expected
+
+    loop = min(timeit.repeat(
+        lambda: [private_key.sign_transaction(tx_data) for tx_data in prepared], number=1, repeat=3
+    ))
+
+    print('{} payloads of {} inputs, {} CPUs'.format(PAYLOADS, INPUTS, workers))
+    print('{:>10} {:>10} {:>10} {:>10}'.format('chunksize', 'time (s)', 'us/tx', 'speedup'))
+    print('{:>10} {:>10.2f} {:>10.1f} {:>10}'.format('loop', loop, loop / PAYLOADS * 1e6, '1.0x'))
+
+    for chunksize in (1, 16, 64, 256):
+        pooled = min(timeit.repeat(
+            lambda: list(private_key.sign_transactions(prepared, workers=workers, chunksize=chunksize)),
+            number=1, repeat=3
+        ))
+        print('{:>10} {:>10.2f} {:>10.1f} {:>9.1f}x'.format(
+            chunksize, pooled, pooled / PAYLOADS * 1e6, loop / pooled
+        ))
+
+
+if __name__ == '__main__':
+    main()
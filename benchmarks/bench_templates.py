@@ -0,0 +1,60 @@
+"""Compares building payout transactions to a fixed set of destinations
+through create_p2pkh_transaction, which decodes every address each time,
+with a PayoutTemplate compiled once.
+
+Run from the repository root: python -m benchmarks.bench_templates
+"""
+import timeit
+
+from benchmarks.samples import RECIPIENTS as DESTINATIONS, TXID
+from lit import PrivateKeyTestnet
+from lit.network.meta import Unspent
+from lit.templates import PayoutTemplate
+from lit.transaction import construct_output_block, create_p2pkh_transaction, sanitize_tx_data
+
+SIZES = (1, 10, 100, 1000)
+FEE = 10
+
+
+def main():
+    private_key = PrivateKeyTestnet()
+    unspents = [Unspent(10 ** 8, 1, '', TXID, i) for i in range(3)]
+
+    print('{:>8} {:>14} {:>14} {:>14} {:>14}'.format(
+        'outputs', 'block (us)', 'template (us)', 'tx (ms)', 'template tx (ms)'
+    ))
+
+    for n in SIZES:
+        destinations = [DESTINATIONS[i % 2] for i in range(n)]
+        amounts = [1000 + i for i in range(n)]
+        template = PayoutTemplate(destinations)
+        outputs = template.outputs(amounts)
+
+        def current():
+            selected, sanitized = sanitize_tx_data(
+                unspents, [(dest, amount, 'satoshi') for dest, amount in outputs], FEE,
+                private_key.address
+            )
+            return create_p2pkh_transaction(private_key, selected, sanitized)
+
+        def templated():
+            return template.create_transaction(private_key, unspents, amounts, fee=FEE)
+
+        assert current() == templated()
+
+        number = max(10, 10000 // n)
+        block = min(timeit.repeat(lambda: construct_output_block(outputs), number=number, repeat=3))
+        compiled = min(timeit.repeat(lambda: template.output_block(outputs), number=number, repeat=3))
+        block, compiled = block / number, compiled / number
+
+        number = max(5, 1000 // n)
+        tx = min(timeit.repeat(current, number=number, repeat=3)) / number
+        template_tx = min(timeit.repeat(templated, number=number, repeat=3)) / number
+
+        print('{:>8} {:>14.1f} {:>14.1f} {:>14.3f} {:>14.3f}'.format(
+            n, block * 1e6, compiled * 1e6, tx * 1e3, template_tx * 1e3
+        ))
+
+
+if __name__ == '__main__':
+    main()
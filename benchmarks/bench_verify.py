@@ -0,0 +1,52 @@
+"""Measures auditing signed transactions with verify_transactions, against
+the cost of signing them, in the calling thread and on a thread pool.
+
+Run from the repository root: python -m benchmarks.bench_verify
+"""
+import os
+import timeit
+
+from benchmarks.samples import RECIPIENT, TXID
+from lit import PrivateKeyTestnet
+from lit.network.meta import Unspent
+from lit.transaction import create_p2pkh_transaction, public_key_to_scripts
+from lit.utils import bytes_to_hex
+from lit.verify import verify_transactions
+
+TRANSACTIONS = 1000
+
+
+def main():
+    private_key = PrivateKeyTestnet()
+    scripts = [bytes_to_hex(script) for script in public_key_to_scripts(private_key.public_key)]
+
+    batches = [
+        ([Unspent(10000, 1, script, TXID, 3 * i + j) for j, script in enumerate(scripts)],
+         [(RECIPIENT, 20000)])
+        for i in range(TRANSACTIONS)
+    ]
+
+    def signed():
+        return [create_p2pkh_transaction(private_key, unspents, outputs, as_bytes=True)
+                for unspents, outputs in batches]
+
+    transactions = [(tx, unspents) for tx, (unspents, _) in zip(signed(), batches)]
+    assert all(verify_transactions(transactions))
+
+    sign = min(timeit.repeat(signed, number=1, repeat=3))
+
+    print('{} transactions of {} inputs, {} CPUs'.format(TRANSACTIONS, len(scripts), os.cpu_count()))
+    print('{:>16} {:>10} {:>10}'.format('', 'time (s)', 'us/tx'))
+    print('{:>16} {:>10.3f} {:>10.1f}'.format('sign', sign, sign / TRANSACTIONS * 1e6))
+
+    for workers in (None, 2, 4):
+        verify = min(timeit.repeat(
+            lambda: list(verify_transactions(transactions, workers=workers)), number=1, repeat=3
+        ))
+        print('{:>16} {:>10.3f} {:>10.1f}'.format(
+            'verify ({})'.format(workers or 1), verify, verify / TRANSACTIONS * 1e6
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+"""Sample values shared by the benchmarks."""
+RECIPIENT = 'n2eMqTT929pb1RDNuqEnxdaLau1rxy3efi'
+RECIPIENT_SCRIPT = '76a914e7c1345fc8f87c68170b3aa798a956c2fe6a9eff88ac'
+RECIPIENTS = [RECIPIENT, 'mtrNwJxS1VyHYn3qBY1Qfsm3K3kh1mGRMS']
+TXID = 'f3ad23dac2a3546167b27a43ac3e370236caf93f75bfcf27c625ec839d397888'
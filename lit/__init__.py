@@ -1,4 +1,4 @@
-from lit.format import verify_sig
+from lit.format import is_valid_address, set_address_cache_size, verify_sig
 from lit.network.fees import set_fee_cache_time
 from lit.network.rates import SUPPORTED_CURRENCIES, set_rate_cache_time
 from lit.network.services import set_service_timeout
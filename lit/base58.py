@@ -1,28 +1,126 @@
+import threading
 from collections import deque
 
+from hashlib import sha256
+
 from lit.crypto import double_sha256_checksum
 from lit.utils import int_to_unknown_bytes
 
 BASE58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
 BASE58_ALPHABET_LIST = list(BASE58_ALPHABET)
 BASE58_ALPHABET_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+# Every pair of digits, so split pieces are converted two digits per step.
+BASE58_PAIRS = [high + low for high in BASE58_ALPHABET for low in BASE58_ALPHABET]
+
+# Converting one digit at a time costs a pass over the whole number per
+# digit, which is quadratic. Payloads larger than these are instead split in
+# halves by powers of 58 until the pieces are LEAF_DIGITS digits long.
+LARGE_BYTES = 64
+LARGE_CHARS = 256
+LEAF_DIGITS = 32
+
+# 58 ** (LEAF_DIGITS * 2 ** i) at index i, extended as larger numbers come.
+_POWERS = [58 ** LEAF_DIGITS]
+_POWERS_LOCK = threading.Lock()
+
+
+def _power(level):
+    if level >= len(_POWERS):
+        with _POWERS_LOCK:
+            while level >= len(_POWERS):
+                _POWERS.append(_POWERS[-1] * _POWERS[-1])
+
+    return _POWERS[level]
+
+
+def _encode_split(num, level, append, pairs):
+    # Appends exactly LEAF_DIGITS * 2 ** level digits, padded with zeros.
+    if level == 0:
+        digits = []
+        for _ in range(LEAF_DIGITS // 2):
+            num, rem = divmod(num, 58 * 58)
+            digits.append(pairs[rem])
+        append(''.join(reversed(digits)))
+        return
+
+    high, low = divmod(num, _POWERS[level - 1])
+    _encode_split(high, level - 1, append, pairs)
+    _encode_split(low, level - 1, append, pairs)
+
+
+def b58encode_large(num):
+    """Encodes a non-negative integer without leading zero digits by
+    splitting it in halves by precomputed powers of 58.
+
+    :param num: The number.
+    :type num: ``int``
+    :rtype: ``str``
+    """
+    level = 0
+    while _power(level) <= num:
+        level += 1
+
+    chunks = []
+    _encode_split(num, level, chunks.append, BASE58_PAIRS)
+
+    return ''.join(chunks).lstrip(BASE58_ALPHABET[0])
+
+
+def _decode_split(string, level, alphabet_index):
+    # Decodes at most LEAF_DIGITS * 2 ** level characters.
+    if level == 0:
+        num = 0
+        for char in string:
+            num = num * 58 + alphabet_index[char]
+        return num
+
+    size = LEAF_DIGITS << (level - 1)
+
+    if len(string) <= size:
+        return _decode_split(string, level - 1, alphabet_index)
+
+    return (_decode_split(string[:-size], level - 1, alphabet_index) * _POWERS[level - 1] +
+            _decode_split(string[-size:], level - 1, alphabet_index))
+
+
+def b58decode_large(string):
+    """Decodes a base58 string to an integer by joining halves of it with
+    multiplications by precomputed powers of 58.
+
+    :param string: The base58 string.
+    :type string: ``str``
+    :raises KeyError: If the string has an invalid character.
+    :rtype: ``int``
+    """
+    level = 0
+    while LEAF_DIGITS << level < len(string):
+        level += 1
+
+    if level:
+        _power(level - 1)
+
+    return _decode_split(string, level, BASE58_ALPHABET_INDEX)
 
 
 def b58encode(bytestr):
 
-    alphabet = BASE58_ALPHABET_LIST
+    if len(bytestr) > LARGE_BYTES:
+        encoded = b58encode_large(int.from_bytes(bytestr, 'big'))
 
-    encoded = deque()
-    append = encoded.appendleft
-    _divmod = divmod
+    else:
+        alphabet = BASE58_ALPHABET_LIST
 
-    num = int.from_bytes(bytestr, 'big')
+        encoded = deque()
+        append = encoded.appendleft
+        _divmod = divmod
 
-    while num > 0:
-        num, rem = _divmod(num, 58)
-        append(alphabet[rem])
+        num = int.from_bytes(bytestr, 'big')
 
-    encoded = ''.join(encoded)
+        while num > 0:
+            num, rem = _divmod(num, 58)
+            append(alphabet[rem])
+
+        encoded = ''.join(encoded)
 
     pad = 0
     for byte in bytestr:
@@ -45,12 +143,17 @@ def b58decode(string):
     num = 0
 
     try:
-        for char in string:
-            num *= 58
-            num += alphabet_index[char]
-    except KeyError:
+        if len(string) > LARGE_CHARS:
+            num = b58decode_large(string)
+
+        else:
+            for char in string:
+                num *= 58
+                num += alphabet_index[char]
+
+    except KeyError as e:
         raise ValueError('"{}" is an invalid base58 encoded '
-                         'character.'.format(char)) from None
+                         'character.'.format(e.args[0])) from None
 
     bytestr = int_to_unknown_bytes(num)
 
@@ -76,3 +179,99 @@ def b58decode_check(string):
                          'checksum {}.'.format(decoded_checksum, string, hash_checksum))
 
     return shortened
+
+
+def b58encode_check_many(payloads):
+    """Encodes many payloads with checksums, such as the version byte and
+    hash of every address in a batch, converting two digits per step.
+
+    :param payloads: The payloads to encode.
+    :type payloads: iterable of ``bytes``
+    :returns: The ``(encoded, error)`` of each payload in order, where
+              ``encoded`` is ``None`` if it could not be encoded and
+              ``error`` is the exception raised for it.
+    :rtype: generator of ``tuple``
+    """
+    pairs = BASE58_PAIRS
+    _sha256 = sha256
+    _divmod = divmod
+    from_bytes = int.from_bytes
+
+    for payload in payloads:
+        try:
+            bytestr = payload + _sha256(_sha256(payload).digest()).digest()[:4]
+        except TypeError as e:
+            yield None, e
+            continue
+
+        if len(bytestr) > LARGE_BYTES:
+            yield b58encode(bytestr), None
+            continue
+
+        num = from_bytes(bytestr, 'big')
+        digits = []
+        append = digits.append
+
+        while num > 0:
+            num, rem = _divmod(num, 58 * 58)
+            append(pairs[rem])
+
+        digits.reverse()
+        pad = len(bytestr) - len(bytestr.lstrip(b'\x00'))
+
+        yield '1' * pad + ''.join(digits).lstrip('1'), None
+
+
+def b58decode_check_many(strings, length=None):
+    """Decodes many base58check strings, such as every address of a payout
+    file, converting two digits per step and never raising for bad input.
+
+    :param strings: The strings to decode.
+    :type strings: iterable of ``str``
+    :param length: The number of bytes every payload, without its checksum,
+                   must have, e.g. 21 for addresses. By default any length
+                   is accepted.
+    :type length: ``int``
+    :returns: The ``(payload, error)`` of each string in order, where
+              ``payload`` is ``None`` if the string could not be decoded and
+              ``error`` is the exception raised for it, a ``ValueError`` for
+              bad characters, checksums or lengths.
+    :rtype: generator of ``tuple``
+    """
+    alphabet_index = BASE58_ALPHABET_INDEX
+    _sha256 = sha256
+
+    for string in strings:
+        try:
+            if len(string) > LARGE_CHARS:
+                num = b58decode_large(string)
+
+            else:
+                num = 0
+                for char in string:
+                    num = num * 58 + alphabet_index[char]
+
+        except KeyError:
+            invalid = next(char for char in string if char not in alphabet_index)
+            yield None, ValueError('"{}" is an invalid base58 encoded '
+                                   'character.'.format(invalid))
+            continue
+        except TypeError as e:
+            yield None, e
+            continue
+
+        # The checksum is the low 4 bytes of the number itself.
+        num, checksum = num >> 32, num & 0xffffffff
+        pad = len(string) - len(string.lstrip('1'))
+        shortened = b'\x00' * pad + (int_to_unknown_bytes(num) if num else b'')
+        hash_checksum = _sha256(_sha256(shortened).digest()).digest()[:4]
+
+        if checksum != int.from_bytes(hash_checksum, 'big'):
+            yield None, ValueError('Decoded checksum {} derived from "{}" is not equal to hash '
+                                   'checksum {}.'.format(checksum.to_bytes(4, 'big'), string,
+                                                         hash_checksum))
+        elif length is not None and len(shortened) != length:
+            yield None, ValueError('Decoded payload of "{}" is {} bytes, expected '
+                                   '{}.'.format(string, len(shortened), length))
+        else:
+            yield shortened, None
@@ -0,0 +1,212 @@
+import threading
+import time
+from decimal import InvalidOperation
+
+from lit.format import is_valid_address
+from lit.network import NetworkAPI
+from lit.network.rates import currency_to_satoshi_cached
+from lit.transaction import calc_txid_bytes
+from lit.wallet import PrivateKeyTestnet
+
+
+class Payout:
+    """A payment waiting to be sent as part of a batch.
+
+    :ivar txid: The ID of the transaction that paid it, or ``None`` while
+                it is pending.
+    """
+    __slots__ = ('address', 'amount', 'currency', 'created', 'sent', 'txid')
+
+    def __init__(self, address, amount, currency, created):
+        self.address = address
+        self.amount = amount
+        self.currency = currency
+        self.created = created
+        self.sent = None
+        self.txid = None
+
+    @property
+    def latency(self):
+        """Seconds between the payout being added and broadcast, or ``None``
+        while it is pending."""
+        if self.sent is None:
+            return None
+        return self.sent - self.created
+
+    def __repr__(self):
+        return 'Payout(address={}, amount={}, currency={}, txid={})'.format(
+            repr(self.address),
+            repr(self.amount),
+            repr(self.currency),
+            repr(self.txid)
+        )
+
+
+class PayoutBatcher:
+    """Accumulates payouts and sends them together as one transaction with
+    many outputs, rather than one transaction per payout.
+
+    Adding a payout only queues it. A batch is sent by
+    :func:`~lit.batching.PayoutBatcher.flush_due` once it holds
+    ``max_outputs`` payouts or its oldest payout has waited ``max_delay``
+    seconds, so that should be called regularly, e.g. after adding payouts
+    and from a timer. It is safe to add payouts from several threads, and
+    adding does not wait for a batch being sent.
+
+    :param private_key: The key paying for every batch.
+    :type private_key: :class:`~lit.PrivateKey` or :class:`~lit.PrivateKeyTestnet`
+    :param max_outputs: The most payouts in one transaction.
+    :type max_outputs: ``int``
+    :param max_delay: The most seconds a payout should wait for its batch.
+    :type max_delay: ``int`` or ``float``
+    :param fee: The number of satoshi per byte to pay to miners. By default
+                the key's own default is used.
+    :type fee: ``int``
+    :param combine: Passed on to the key's ``create_transaction``.
+    :type combine: ``bool``
+    """
+
+    def __init__(self, private_key, max_outputs=100, max_delay=60, fee=None, combine=False):
+        self.private_key = private_key
+        self.max_outputs = max_outputs
+        self.max_delay = max_delay
+        self.fee = fee
+        self.combine = combine
+
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._started = time.monotonic()
+        self._sent = 0
+        self._transactions = 0
+        self._latency_total = 0
+        self._latency_max = 0
+
+    def add(self, address, amount, currency='satoshi'):
+        """Queues a payout. Nothing is sent until the batch is flushed.
+
+        :param address: The destination of the payout.
+        :type address: ``str``
+        :param amount: The amount to send, as accepted by ``send``.
+        :param currency: One of the :ref:`supported currencies`.
+        :type currency: ``str``
+        :raises ValueError: If the address is not valid for the key's network
+                            or the amount cannot be converted to satoshi.
+        :rtype: :class:`~lit.batching.Payout`
+        """
+        # A payout that cannot be sent would fail every batch it is in.
+        version = 'test' if isinstance(self.private_key, PrivateKeyTestnet) else 'main'
+        if not is_valid_address(address, version):
+            raise ValueError('{} is not a valid {}net address.'.format(repr(address), version))
+
+        try:
+            satoshi = currency_to_satoshi_cached(amount, currency)
+        except KeyError:
+            raise ValueError('{} is not a supported currency.'.format(repr(currency)))
+        except (InvalidOperation, TypeError, ValueError):
+            raise ValueError('{} is not a valid amount.'.format(repr(amount)))
+
+        if satoshi <= 0:
+            raise ValueError('Payouts must be of more than 0 satoshi.')
+
+        payout = Payout(address, amount, currency, time.monotonic())
+
+        with self._lock:
+            self._pending.append(payout)
+
+        return payout
+
+    def flush_due(self):
+        """Sends the pending batch if it holds ``max_outputs`` payouts or its
+        oldest payout has waited at least ``max_delay`` seconds.
+
+        :returns: The transaction ID, or ``None`` if nothing was sent.
+        :rtype: ``str``
+        """
+        with self._lock:
+            due = self._pending and (
+                len(self._pending) >= self.max_outputs or
+                time.monotonic() - self._pending[0].created >= self.max_delay
+            )
+
+        if due:
+            return self.flush()
+
+    def flush(self):
+        """Sends up to ``max_outputs`` pending payouts in one transaction.
+
+        If the transaction cannot be created or broadcast the payouts stay
+        pending and the error propagates. Once it is broadcast the payouts
+        are no longer pending, even if updating the key's UTXOs afterwards
+        raises, so a batch is never sent twice.
+
+        Payouts may be added while a batch is being sent; only one batch is
+        sent at a time.
+
+        :returns: The transaction ID, or ``None`` if nothing was pending.
+        :rtype: ``str``
+        """
+        with self._flush_lock:
+            # Only flushing removes payouts, so the batch stays at the head
+            # of the queue until it is sent.
+            with self._lock:
+                batch = self._pending[:self.max_outputs]
+
+            if not batch:
+                return None
+
+            tx = self.private_key.create_transaction(
+                [(payout.address, payout.amount, payout.currency) for payout in batch],
+                fee=self.fee,
+                combine=self.combine,
+                as_bytes=True
+            )
+
+            if isinstance(self.private_key, PrivateKeyTestnet):
+                NetworkAPI.broadcast_tx_testnet(tx)
+            else:
+                NetworkAPI.broadcast_tx(tx)
+
+            txid = calc_txid_bytes(tx)
+            sent = time.monotonic()
+
+            with self._lock:
+                del self._pending[:len(batch)]
+
+                for payout in batch:
+                    payout.sent = sent
+                    payout.txid = txid
+                    self._latency_total += payout.latency
+                    self._latency_max = max(self._latency_max, payout.latency)
+
+                self._sent += len(batch)
+                self._transactions += 1
+
+            self.private_key._apply_transaction(tx)
+
+            return txid
+
+    @property
+    def pending(self):
+        """:rtype: ``int``"""
+        return len(self._pending)
+
+    def metrics(self):
+        """Returns counters describing the batcher's throughput and the time
+        payouts spent waiting for their batch.
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            transactions = self._transactions
+
+            return {
+                'pending': len(self._pending),
+                'payouts': self._sent,
+                'transactions': transactions,
+                'mean_batch_size': self._sent / transactions if transactions else 0,
+                'mean_latency': self._latency_total / self._sent if self._sent else 0,
+                'max_latency': self._latency_max,
+                'payouts_per_second': self._sent / elapsed if elapsed else 0,
+            }
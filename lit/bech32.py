@@ -0,0 +1,195 @@
+BECH32_ALPHABET = 'qpzry9x8gf2tvdw0s3jn54khce6mua7l'
+BECH32_ALPHABET_INDEX = {char: index for index, char in enumerate(BECH32_ALPHABET)}
+# Maps each ASCII character to its value with bytes.translate, or to 255 if
+# it is not part of the alphabet.
+BECH32_BYTE_VALUES = bytes(BECH32_ALPHABET_INDEX.get(chr(i), 255) for i in range(256))
+# Maps the alphabet to the digits int() understands in base 32.
+BECH32_TO_BASE32 = bytes.maketrans(BECH32_ALPHABET.encode(), b'0123456789abcdefghijklmnopqrstuv')
+
+# Checksum constants of BIP173 (witness version 0) and BIP350 (the rest).
+BECH32_CONST = 1
+BECH32M_CONST = 0x2bc830a3
+
+BECH32_GENERATOR = (0x3b6a57b2, 0x26508e6d, 0x1ea119fa, 0x3d4233dd, 0x2a1462b3)
+# The generators combined for every value of the five bits shifted out of
+# the checksum, so each character costs one lookup rather than five tests.
+BECH32_TABLE = tuple(
+    (BECH32_GENERATOR[0] if top & 1 else 0) ^
+    (BECH32_GENERATOR[1] if top & 2 else 0) ^
+    (BECH32_GENERATOR[2] if top & 4 else 0) ^
+    (BECH32_GENERATOR[3] if top & 8 else 0) ^
+    (BECH32_GENERATOR[4] if top & 16 else 0)
+    for top in range(32)
+)
+
+MAX_LENGTH = 90
+CHECKSUM_LENGTH = 6
+
+# Checksum states after the expanded human-readable part, by hrp.
+_HRP_STATES = {}
+
+
+def polymod_step(chk, value):
+    return ((chk & 0x1ffffff) << 5) ^ value ^ BECH32_TABLE[chk >> 25]
+
+
+def hrp_state(hrp):
+    """Returns the checksum state after the expanded human-readable part,
+    which is the same for every address of a network.
+
+    :param hrp: The human-readable part, in lower case.
+    :type hrp: ``str``
+    :rtype: ``int``
+    """
+    chk = _HRP_STATES.get(hrp)
+
+    if chk is None:
+        chk = 1
+        for value in [ord(char) >> 5 for char in hrp] + [0] + [ord(char) & 31 for char in hrp]:
+            chk = polymod_step(chk, value)
+        _HRP_STATES[hrp] = chk
+
+    return chk
+
+
+def segwit_encode(hrp, witver, witprog):
+    """Encodes a witness program as a SegWit address, using bech32 for
+    version 0 and bech32m for later versions.
+
+    :param hrp: The human-readable part, such as ``'ltc'``.
+    :type hrp: ``str``
+    :param witver: The witness version, from 0 to 16.
+    :type witver: ``int``
+    :param witprog: The witness program.
+    :type witprog: ``bytes``
+    :raises ValueError: If the version or program length is invalid.
+    :rtype: ``str``
+    """
+    check_program(witver, len(witprog))
+
+    bits = len(witprog) * 8
+    pad = -bits % 5
+    n_values = (bits + pad) // 5
+    num = int.from_bytes(witprog, 'big') << pad
+
+    values = [witver] + [(num >> 5 * i) & 31 for i in range(n_values - 1, -1, -1)]
+
+    chk = hrp_state(hrp)
+    for value in values:
+        chk = polymod_step(chk, value)
+    for _ in range(CHECKSUM_LENGTH):
+        chk = polymod_step(chk, 0)
+
+    chk ^= BECH32_CONST if witver == 0 else BECH32M_CONST
+    values += [(chk >> 5 * i) & 31 for i in range(CHECKSUM_LENGTH - 1, -1, -1)]
+
+    return hrp + '1' + ''.join(BECH32_ALPHABET[value] for value in values)
+
+
+def segwit_decode(hrp, address):
+    """Decodes a SegWit address, verifying its checksum, case and padding.
+    Characters are mapped to values by ``bytes.translate`` and the program
+    is read by ``int`` in base 32, leaving only the checksum to a Python
+    loop.
+
+    :param hrp: The expected human-readable part, such as ``'ltc'``.
+    :type hrp: ``str``
+    :param address: The address.
+    :type address: ``str``
+    :raises ValueError: If the address is invalid or of another network.
+    :returns: The witness version and program.
+    :rtype: ``tuple`` of (``int``, ``bytes``)
+    """
+    if len(address) > MAX_LENGTH:
+        raise ValueError('"{}" is longer than {} characters.'.format(address, MAX_LENGTH))
+
+    lowered = address.lower()
+
+    if lowered != address and address.upper() != address:
+        raise ValueError('"{}" mixes upper and lower case.'.format(address))
+
+    separator = lowered.rfind('1')
+
+    if lowered[:separator] != hrp:
+        raise ValueError('"{}" does not begin with "{}1".'.format(address, hrp))
+
+    data = lowered[separator + 1:]
+
+    if len(data) <= CHECKSUM_LENGTH:
+        raise ValueError('"{}" is too short.'.format(address))
+
+    try:
+        encoded = data.encode('ascii')
+    except UnicodeEncodeError:
+        encoded = b'\xff'
+
+    values = encoded.translate(BECH32_BYTE_VALUES)
+
+    if 255 in values:
+        raise ValueError('"{}" has an invalid bech32 encoded character.'.format(address))
+
+    table = BECH32_TABLE
+    chk = hrp_state(hrp)
+
+    for value in values:
+        chk = ((chk & 0x1ffffff) << 5) ^ value ^ table[chk >> 25]
+
+    witver = values[0]
+
+    if chk != (BECH32_CONST if witver == 0 else BECH32M_CONST):
+        raise ValueError('"{}" has an invalid checksum.'.format(address))
+
+    # Every character is five bits of one big-endian number.
+    num = int(encoded.translate(BECH32_TO_BASE32), 32)
+
+    bits = (len(data) - 1 - CHECKSUM_LENGTH) * 5
+    length, pad = divmod(bits, 8)
+    program = (num >> 5 * CHECKSUM_LENGTH) & ((1 << bits) - 1)
+
+    if pad > 4 or program & ((1 << pad) - 1):
+        raise ValueError('"{}" has invalid padding.'.format(address))
+
+    check_program(witver, length)
+
+    return witver, (program >> pad).to_bytes(length, 'big')
+
+
+def segwit_decode_many(hrp, addresses):
+    """Decodes many SegWit addresses of one network, such as those of a
+    payout file, without raising for invalid ones.
+
+    :param hrp: The expected human-readable part, such as ``'ltc'``.
+    :type hrp: ``str``
+    :param addresses: The addresses.
+    :type addresses: iterable of ``str``
+    :returns: The witness version and program of each address, in order,
+              or ``None`` for each invalid address.
+    :rtype: ``list`` of ``tuple`` of (``int``, ``bytes``)
+    """
+    # Compute the hrp's checksum state once up front.
+    hrp_state(hrp)
+
+    decoded = []
+    append = decoded.append
+
+    for address in addresses:
+        if not isinstance(address, str):
+            append(None)
+            continue
+
+        try:
+            append(segwit_decode(hrp, address))
+        except ValueError:
+            append(None)
+
+    return decoded
+
+
+def check_program(witver, length):
+
+    if not 0 <= witver <= 16:
+        raise ValueError('{} is an invalid witness version.'.format(witver))
+
+    if not 2 <= length <= 40 or (witver == 0 and length not in (20, 32)):
+        raise ValueError('{} bytes is an invalid witness program length for '
+                         'version {}.'.format(length, witver))
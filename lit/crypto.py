@@ -15,7 +15,32 @@ def double_sha256_checksum(bytestr):
     return double_sha256(bytestr)[:4]
 
 
+# Copying a prepared object is cheaper than looking RIPEMD-160 up by name.
+# It is made on first use, as OpenSSL 3 without the legacy provider has no
+# RIPEMD-160 and that should only fail hashing, not importing.
+_RIPEMD160 = None
+
+
+def _ripemd160():
+    global _RIPEMD160
+    if _RIPEMD160 is None:
+        _RIPEMD160 = new('ripemd160')
+    return _RIPEMD160
+
+
 def ripemd160_sha256(bytestr):
-    return new('ripemd160', sha256(bytestr)).digest()
+    ripemd160 = (_RIPEMD160 or _ripemd160()).copy()
+    ripemd160.update(_sha256(bytestr).digest())
+    return ripemd160.digest()
+
+
+def ripemd160_sha256_many(bytestrs):
+    prototype = _ripemd160()
+    _sha = _sha256
+
+    for bytestr in bytestrs:
+        ripemd160 = prototype.copy()
+        ripemd160.update(_sha(bytestr).digest())
+        yield ripemd160.digest()
 
 hash160 = ripemd160_sha256
@@ -1,23 +1,75 @@
+import threading
+from collections import OrderedDict
+from functools import partial
+
 from coincurve import verify_signature as _vs
 
-from lit.base58 import b58decode_check, b58encode_check
-from lit.crypto import ripemd160_sha256
+from lit.base58 import BASE58_ALPHABET, b58decode_check, b58encode_check, b58encode_check_many
+from lit.bech32 import BECH32_ALPHABET, segwit_decode, segwit_encode
+from lit.crypto import ripemd160_sha256, ripemd160_sha256_many
 from lit.curve import x_to_y
+from lit.utils import map_chunks
 
 MAIN_PUBKEY_HASH = b'\x30'
 MAIN_SCRIPT_HASH = b'\x05'
+MAIN_SCRIPT_HASH_2 = b'\x32'
 MAIN_PRIVATE_KEY = b'\x80'
 MAIN_BIP32_PUBKEY = b'\x04\x88\xb2\x1e'
 MAIN_BIP32_PRIVKEY = b'\x04\x88\xad\xe4'
 TEST_PUBKEY_HASH = b'\x6f'
 TEST_SCRIPT_HASH = b'\xc4'
+TEST_SCRIPT_HASH_2 = b'\x3a'
 TEST_PRIVATE_KEY = b'\xef'
 TEST_BIP32_PUBKEY = b'\x045\x87\xcf'
 TEST_BIP32_PRIVKEY = b'\x045\x83\x94'
+MAIN_BECH32_HRP = 'ltc'
+TEST_BECH32_HRP = 'tltc'
 PUBLIC_KEY_UNCOMPRESSED = b'\x04'
 PUBLIC_KEY_COMPRESSED_EVEN_Y = b'\x02'
 PUBLIC_KEY_COMPRESSED_ODD_Y = b'\x03'
 PRIVATE_KEY_COMPRESSED_PUBKEY = b'\x01'
+DEFAULT_ADDRESS_CACHE_SIZE = 4096
+
+BASE58_ADDRESS_VERSIONS = {
+    MAIN_PUBKEY_HASH: 'main', MAIN_SCRIPT_HASH: 'main', MAIN_SCRIPT_HASH_2: 'main',
+    TEST_PUBKEY_HASH: 'test', TEST_SCRIPT_HASH: 'test', TEST_SCRIPT_HASH_2: 'test',
+}
+BASE58_CHARS = frozenset(BASE58_ALPHABET)
+BECH32_CHARS = frozenset(BECH32_ALPHABET)
+# Lengths of the data part of SegWit addresses by witness version character:
+# 'q' (version 0) for 20 or 32 byte programs, 'p' (version 1) for 32 bytes.
+BECH32_DATA_LENGTHS = {'q': (39, 59), 'p': (59,)}
+
+
+def _base58_address_prefixes():
+    # Maps the length and first character of every possible base58 address
+    # to the networks of the versions that can produce it, so malformed
+    # addresses are rejected without decoding them.
+    prefixes = {}
+
+    for version, network in BASE58_ADDRESS_VERSIONS.items():
+        # A version byte followed by a 20 byte hash and a 4 byte checksum.
+        low = int.from_bytes(version, 'big') << 192
+        high = low + (1 << 192) - 1
+
+        length = 1
+        while 58 ** length <= low:
+            length += 1
+
+        while 58 ** (length - 1) <= high:
+            unit = 58 ** (length - 1)
+            first = max(low, unit) // unit
+            last = min(high, 58 ** length - 1) // unit
+
+            for digit in range(first, last + 1):
+                prefixes.setdefault((length, BASE58_ALPHABET[digit]), set()).add(network)
+
+            length += 1
+
+    return {prefix: frozenset(networks) for prefix, networks in prefixes.items()}
+
+
+BASE58_ADDRESS_PREFIXES = _base58_address_prefixes()
 
 
 def verify_sig(signature, data, public_key):
@@ -35,23 +87,211 @@ def verify_sig(signature, data, public_key):
 
 
 def address_to_public_key_hash(address):
-    # Raise ValueError if we cannot identify the address.
-    get_version(address)
-    return b58decode_check(address)[1:]
+    kind, _, hashed = decode_address(address)
+
+    if kind != 'p2pkh':
+        raise ValueError('{} is a {} address, not a P2PKH one.'.format(address, kind))
+
+    return hashed
 
 
 def get_version(address):
-    version = b58decode_check(address)[:1]
+    kind, version, _ = decode_address(address)
+
+    if kind != 'p2pkh':
+        raise ValueError('{} is a {} address, not a P2PKH one.'.format(address, kind))
+
+    return version
+
+
+class AddressCache:
+    """A bounded, thread-safe cache of decoded addresses which discards the
+    least recently used ones when full, so paying the same addresses again
+    costs a dictionary lookup. Invalid addresses are never cached.
+
+    :param maxsize: The maximum number of addresses kept. ``0`` disables
+                    caching.
+    :type maxsize: ``int``
+    """
+
+    __slots__ = ('maxsize', 'hits', 'misses', '_entries', '_lock')
+
+    def __init__(self, maxsize=DEFAULT_ADDRESS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def decode(self, address):
+        """Decodes an address as :func:`~lit.format.decode_address` does,
+        reusing the result for addresses seen recently.
+
+        :param address: The address.
+        :type address: ``str``
+        :raises ValueError: If the address is invalid or of an unknown version.
+        :rtype: ``tuple`` of (``str``, ``str``, ``bytes``)
+        """
+        with self._lock:
+            decoded = self._entries.get(address)
+
+            if decoded is not None:
+                self._entries.move_to_end(address)
+                self.hits += 1
+                return decoded
+
+            self.misses += 1
+
+        decoded = _decode_address(address)
+
+        with self._lock:
+            self._entries[address] = decoded
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return decoded
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Returns the number of hits, misses and cached addresses.
+
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<AddressCache: {} of {} addresses>'.format(len(self), self.maxsize)
+
+
+ADDRESS_CACHE = AddressCache()
+
+
+def set_address_cache_size(size):
+    ADDRESS_CACHE.resize(size)
+
+
+def decode_address(address):
+    """Identifies the kind of output an address pays to. Results are kept in
+    :data:`~lit.format.ADDRESS_CACHE`.
+
+    :param address: A P2PKH, P2SH or native SegWit address, mainnet or
+                    testnet.
+    :type address: ``str``
+    :raises ValueError: If the address is invalid or of an unknown version.
+    :returns: The output kind (``'p2pkh'``, ``'p2sh'``, ``'p2wpkh'``,
+              ``'p2wsh'`` or ``'p2tr'``), the network (``'main'`` or
+              ``'test'``) and the hash or witness program.
+    :rtype: ``tuple`` of (``str``, ``str``, ``bytes``)
+    """
+    return ADDRESS_CACHE.decode(address)
+
+
+def _decode_address(address):
+    prefix = address[:5].lower()
+
+    if prefix.startswith(MAIN_BECH32_HRP + '1'):
+        return _decode_segwit_address(MAIN_BECH32_HRP, address, 'main')
+    elif prefix == TEST_BECH32_HRP + '1':
+        return _decode_segwit_address(TEST_BECH32_HRP, address, 'test')
+
+    decoded = b58decode_check(address)
+    version, hashed = decoded[:1], decoded[1:]
 
     if version == MAIN_PUBKEY_HASH:
-        return 'main'
+        return 'p2pkh', 'main', hashed
     elif version == TEST_PUBKEY_HASH:
-        return 'test'
+        return 'p2pkh', 'test', hashed
+    elif version in (MAIN_SCRIPT_HASH_2, MAIN_SCRIPT_HASH):
+        return 'p2sh', 'main', hashed
+    elif version in (TEST_SCRIPT_HASH_2, TEST_SCRIPT_HASH):
+        return 'p2sh', 'test', hashed
     else:
         raise ValueError('{} does not correspond to a mainnet nor '
                          'testnet address.'.format(version))
 
 
+def _decode_segwit_address(hrp, address, version):
+
+    witver, witprog = segwit_decode(hrp, address)
+
+    if witver == 0:
+        return 'p2wpkh' if len(witprog) == 20 else 'p2wsh', version, witprog
+    elif witver == 1 and len(witprog) == 32:
+        return 'p2tr', version, witprog
+    else:
+        raise ValueError('Witness version {} with a {} byte program is not '
+                         'supported.'.format(witver, len(witprog)))
+
+
+def is_valid_address(address, version=None, checksum=True):
+    """Checks whether a string is a P2PKH, P2SH or supported native SegWit
+    address. Its length, characters and leading characters are screened
+    before anything is decoded, so most malformed input costs no more than
+    a few lookups.
+
+    :param address: The string to check.
+    :type address: ``str``
+    :param version: The network the address must belong to, ``'main'`` or
+                    ``'test'``. By default either is accepted.
+    :type version: ``str``
+    :param checksum: Whether or not to also decode the address and verify
+                     its checksum. If ``False`` only the screening is done.
+    :type checksum: ``bool``
+    :rtype: ``bool``
+    """
+    if not isinstance(address, str):
+        return False
+
+    prefix = address[:5].lower()
+
+    if prefix.startswith(MAIN_BECH32_HRP + '1') or prefix == TEST_BECH32_HRP + '1':
+        network = 'main' if prefix.startswith(MAIN_BECH32_HRP) else 'test'
+        data = prefix[prefix.index('1') + 1:] + address[5:].lower()
+
+        if (version is not None and network != version or
+                address != address.lower() and address != address.upper() or
+                len(data) not in BECH32_DATA_LENGTHS.get(data[:1], ()) or
+                not BECH32_CHARS.issuperset(data)):
+            return False
+
+    else:
+        networks = BASE58_ADDRESS_PREFIXES.get((len(address), address[:1]))
+
+        if (networks is None or version is not None and version not in networks or
+                not BASE58_CHARS.issuperset(address)):
+            return False
+
+    if not checksum:
+        return True
+
+    try:
+        _, network, _ = decode_address(address)
+    except ValueError:
+        return False
+
+    return version is None or network == version
+
+
 def bytes_to_wif(private_key, version='main', compressed=False):
 
     if version == 'test':
@@ -120,6 +360,109 @@ def public_key_to_address(public_key, version='main'):
     return b58encode_check(version + ripemd160_sha256(public_key))
 
 
+def _checked_public_keys(public_keys):
+    for public_key in public_keys:
+        length = len(public_key)
+
+        if length not in (33, 65):
+            raise ValueError('{} is an invalid length for a public key.'.format(length))
+
+        yield public_key
+
+
+def _stream_addresses(version, public_keys):
+    hashes = ripemd160_sha256_many(_checked_public_keys(public_keys))
+    payloads = (version + hashed for hashed in hashes)
+
+    for address, _ in b58encode_check_many(payloads):
+        yield address
+
+
+def _public_keys_to_addresses(version, public_keys):
+    return list(_stream_addresses(version, public_keys))
+
+
+def public_keys_to_addresses(public_keys, version='main', workers=None, chunksize=4096):
+    """Derives the P2PKH address of many public keys, such as watch-only
+    addresses generated in bulk, as :func:`~lit.format.public_key_to_address`
+    would. Keys are consumed and addresses produced as they go, so neither
+    has to fit in memory at once.
+
+    :param public_keys: The public keys.
+    :type public_keys: iterable of ``bytes``
+    :param version: ``'main'`` or ``'test'``.
+    :type version: ``str``
+    :param workers: The number of processes to use. By default every key is
+                    processed in the calling process.
+    :type workers: ``int``
+    :param chunksize: The number of keys handed to a process at a time.
+    :type chunksize: ``int``
+    :raises ValueError: If a public key has an invalid length.
+    :returns: The address of each public key, in order.
+    :rtype: generator of ``str``
+    """
+    if version == 'test':
+        version = TEST_PUBKEY_HASH
+    else:
+        version = MAIN_PUBKEY_HASH
+
+    if not workers or workers < 2:
+        yield from _stream_addresses(version, public_keys)
+        return
+
+    yield from map_chunks(partial(_public_keys_to_addresses, version), public_keys,
+                          workers, chunksize)
+
+
+def public_key_to_segwit_address(public_key, version='main'):
+    """Returns the P2SH address of a P2WPKH output for ``public_key``, which
+    wallets without native SegWit support can pay to.
+
+    :param public_key: A compressed public key.
+    :type public_key: ``bytes``
+    :param version: ``'main'`` or ``'test'``.
+    :type version: ``str``
+    :raises ValueError: If the public key is not compressed.
+    :rtype: ``str``
+    """
+    if version == 'test':
+        version = TEST_SCRIPT_HASH_2
+    else:
+        version = MAIN_SCRIPT_HASH_2
+
+    length = len(public_key)
+
+    if length != 33:
+        raise ValueError('{} is an invalid length for a SegWit public key.'.format(length))
+
+    redeem_script = b'\x00\x14' + ripemd160_sha256(public_key)
+
+    return b58encode_check(version + ripemd160_sha256(redeem_script))
+
+
+def public_key_to_bech32_address(public_key, version='main'):
+    """Returns the native SegWit (P2WPKH) address of ``public_key``.
+
+    :param public_key: A compressed public key.
+    :type public_key: ``bytes``
+    :param version: ``'main'`` or ``'test'``.
+    :type version: ``str``
+    :raises ValueError: If the public key is not compressed.
+    :rtype: ``str``
+    """
+    if version == 'test':
+        hrp = TEST_BECH32_HRP
+    else:
+        hrp = MAIN_BECH32_HRP
+
+    length = len(public_key)
+
+    if length != 33:
+        raise ValueError('{} is an invalid length for a SegWit public key.'.format(length))
+
+    return segwit_encode(hrp, 0, ripemd160_sha256(public_key))
+
+
 def public_key_to_coords(public_key):
 
     length = len(public_key)
@@ -0,0 +1,388 @@
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+
+from lit.network.meta import Unspent
+from lit.selection import UnspentIndex
+from lit.transaction import deserialize, sanitize_tx_data
+from lit.utils import bytes_to_hex
+
+
+class UnspentLedger:
+    """Keeps a key's list of UTXOs current between fetches from the network.
+
+    Applying a broadcast transaction removes the UTXOs it spends and adds
+    the outputs paying back to the key as unconfirmed UTXOs, so that the
+    next transaction can be built straight away. Until the network catches
+    up, syncing keeps hiding UTXOs spent locally and keeps the locally
+    created ones.
+
+    It also keeps the key's UTXOs as an :class:`~lit.selection.UnspentIndex`
+    for coin selection, updated along with them rather than rebuilt for
+    every transaction.
+
+    :param expiry: The least number of seconds a locally spent UTXO is
+                   remembered, even while the network does not report it.
+    :type expiry: ``int``
+    """
+    __slots__ = ('expiry', '_created', '_index', '_indexed', '_inputs', '_spent')
+
+    def __init__(self, expiry=3600):
+        self.expiry = expiry
+        self._created = {}
+        self._index = None
+        self._indexed = []
+        self._inputs = {}
+        self._spent = {}
+
+    def index(self, unspents):
+        """Returns the key's UTXOs as an index to select coins from. The
+        index is reused while the UTXOs only change through this ledger,
+        and is rebuilt if they were changed any other way.
+
+        :param unspents: The key's UTXOs.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :rtype: :class:`~lit.selection.UnspentIndex`
+        """
+        if not self._in_sync(unspents):
+            self._index = UnspentIndex(unspents)
+            self._indexed = list(unspents)
+
+        return self._index
+
+    def _in_sync(self, unspents):
+        # The elements are usually the very same objects, which compare fast.
+        return self._index is not None and self._indexed == unspents
+
+    def _update_index(self, unspents, in_sync, removed, added):
+        if not in_sync:
+            self._index = None
+            return
+
+        for unspent in removed:
+            self._index.remove(unspent)
+        for unspent in added:
+            self._index.add(unspent)
+
+        self._indexed = list(unspents)
+
+    def apply(self, unspents, tx, scripts):
+        """Records a transaction that has just been broadcast.
+
+        :param unspents: The key's UTXOs, which are updated in place.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param tx: The raw transaction.
+        :type tx: ``bytes``
+        :param scripts: The scriptPubKeys of the key's own outputs.
+        :type scripts: ``tuple`` of ``bytes``
+        :returns: The UTXOs the transaction created for the key.
+        :rtype: ``list`` of :class:`~lit.network.meta.Unspent`
+        """
+        parsed = deserialize(tx)
+        txid = parsed.txid
+
+        spent = {
+            (bytes_to_hex(bytes(txin.txid)[::-1]), int.from_bytes(txin.txindex, 'little'))
+            for txin in parsed.inputs
+        }
+
+        now = time.monotonic()
+        for outpoint in spent:
+            self._spent[outpoint] = now
+            self._created.pop(outpoint, None)
+
+        in_sync = self._in_sync(unspents)
+        removed = []
+
+        for unspent in unspents:
+            outpoint = (unspent.txid, unspent.txindex)
+            if outpoint in spent:
+                self._inputs[outpoint] = unspent
+                removed.append(unspent)
+
+        created = [
+            Unspent(int.from_bytes(txout.amount, 'little'), 0, bytes_to_hex(txout.script),
+                    txid, index)
+            for index, txout in enumerate(parsed.outputs)
+            if txout.script in scripts
+        ]
+
+        for unspent in created:
+            self._created[(txid, unspent.txindex)] = unspent
+
+        unspents[:] = [
+            unspent for unspent in unspents
+            if (unspent.txid, unspent.txindex) not in spent
+        ] + created
+
+        self._update_index(unspents, in_sync, removed, created)
+
+        return created
+
+    def replace(self, unspents, replaced, tx, scripts):
+        """Records a transaction that has just been broadcast to replace
+        another, such as one paying a higher fee. The outputs created for the
+        key by the replaced transaction are dropped.
+
+        :param unspents: The key's UTXOs, which are updated in place.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param replaced: The raw transaction being replaced.
+        :type replaced: ``bytes``
+        :param tx: The raw replacement transaction.
+        :type tx: ``bytes``
+        :param scripts: The scriptPubKeys of the key's own outputs.
+        :type scripts: ``tuple`` of ``bytes``
+        :returns: The UTXOs the replacement created for the key.
+        :rtype: ``list`` of :class:`~lit.network.meta.Unspent`
+        """
+        replaced_txid = deserialize(replaced).txid
+
+        for outpoint in [outpoint for outpoint in self._created if outpoint[0] == replaced_txid]:
+            del self._created[outpoint]
+
+        in_sync = self._in_sync(unspents)
+        dropped = [unspent for unspent in unspents if unspent.txid == replaced_txid]
+
+        unspents[:] = [unspent for unspent in unspents if unspent.txid != replaced_txid]
+        self._update_index(unspents, in_sync, dropped, ())
+
+        return self.apply(unspents, tx, scripts)
+
+    def spent(self):
+        """The UTXOs spent locally that are still remembered, such as those
+        needed to replace a transaction that has not confirmed yet.
+
+        :rtype: ``list`` of :class:`~lit.network.meta.Unspent`
+        """
+        return list(self._inputs.values())
+
+    def sync(self, unspents, fetched, kept_scripts=()):
+        """Replaces the key's UTXOs with ones fetched from the network, minus
+        those spent locally and plus those created locally that the network
+        does not know about yet.
+
+        :param unspents: The key's UTXOs, which are updated in place.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param fetched: UTXOs as returned by :class:`~lit.network.NetworkAPI`.
+        :type fetched: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param kept_scripts: The scriptPubKeys, as hex, of addresses that could
+                             not be fetched. The key's UTXOs paying to them are
+                             kept as they are rather than dropped.
+        :type kept_scripts: ``set`` of ``str``
+        :rtype: ``list`` of :class:`~lit.network.meta.Unspent`
+        """
+        if kept_scripts:
+            fetched = list(fetched) + [
+                unspent for unspent in unspents
+                if unspent.script in kept_scripts and
+                (unspent.txid, unspent.txindex) not in self._created
+            ]
+
+        in_sync = self._in_sync(unspents)
+        reported = {(unspent.txid, unspent.txindex) for unspent in fetched}
+
+        # Once the network stops reporting a spent output it knows it is
+        # spent, but it may not have seen the output itself yet if both were
+        # created locally, hence the expiry.
+        expired = time.monotonic() - self.expiry
+        self._spent = {
+            outpoint: spent for outpoint, spent in self._spent.items()
+            if outpoint in reported or spent > expired
+        }
+
+        self._inputs = {
+            outpoint: unspent for outpoint, unspent in self._inputs.items()
+            if outpoint in self._spent
+        }
+
+        for outpoint in reported & self._created.keys():
+            del self._created[outpoint]
+
+        previous = {(unspent.txid, unspent.txindex): unspent for unspent in unspents} if in_sync else {}
+
+        unspents[:] = [
+            unspent for unspent in fetched
+            if (unspent.txid, unspent.txindex) not in self._spent
+        ] + list(self._created.values())
+
+        removed, added = [], []
+        if in_sync:
+            current = {(unspent.txid, unspent.txindex) for unspent in unspents}
+            removed = [unspent for outpoint, unspent in previous.items() if outpoint not in current]
+            added = [unspent for unspent in unspents if (unspent.txid, unspent.txindex) not in previous]
+
+            # Rebuilding is cheaper than many insertions into a large index.
+            in_sync = len(removed) + len(added) <= len(unspents) // 8 + 16
+
+        self._update_index(unspents, in_sync, removed, added)
+
+        return unspents
+
+
+class Reservation:
+    """UTXOs leased for one transaction along with its outputs, as returned
+    by :func:`~lit.transaction.sanitize_tx_data`. Used as a context manager,
+    the leases are released if the block raises and otherwise kept until
+    they expire, so that UTXOs the network still reports after being spent
+    are not handed out again.
+    """
+    __slots__ = ('unspents', 'outputs', 'owner', '_store')
+
+    def __init__(self, store, owner, unspents, outputs):
+        self._store = store
+        self.owner = owner
+        self.unspents = unspents
+        self.outputs = outputs
+
+    def release(self):
+        self._store.release(self.unspents, self.owner)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.release()
+
+
+class LeaseStore:
+    """Leases UTXOs to concurrent senders in this process so that no two of
+    them spend the same ones. Use :class:`~lit.ledger.SQLiteLeaseStore` to
+    share leases between processes.
+
+    :param ttl: The number of seconds a lease lasts unless released.
+    :type ttl: ``int``
+    """
+    MAX_ATTEMPTS = 5
+
+    def __init__(self, ttl=600):
+        self.ttl = ttl
+        self._leases = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, unspents, owner):
+        """Atomically leases all of ``unspents`` to ``owner``, or none of them
+        if any is already leased.
+
+        :rtype: ``bool``
+        """
+        now = time.time()
+        outpoints = [(unspent.txid, unspent.txindex) for unspent in unspents]
+
+        with self._lock:
+            leases = self._leases
+
+            for outpoint in outpoints:
+                lease = leases.get(outpoint)
+                if lease is not None and lease[1] > now:
+                    return False
+
+            for outpoint in outpoints:
+                leases[outpoint] = (owner, now + self.ttl)
+
+        return True
+
+    def release(self, unspents, owner):
+        with self._lock:
+            for unspent in unspents:
+                outpoint = (unspent.txid, unspent.txindex)
+                if self._leases.get(outpoint, (None,))[0] == owner:
+                    del self._leases[outpoint]
+
+    def leased(self):
+        """Returns the outpoints currently leased, dropping expired leases.
+
+        :rtype: ``set`` of ``tuple``
+        """
+        now = time.time()
+
+        with self._lock:
+            self._leases = {
+                outpoint: lease for outpoint, lease in self._leases.items() if lease[1] > now
+            }
+            return set(self._leases)
+
+    def reserve(self, unspents, outputs, fee, leftover, combine=False, message=None,
+                compressed=True):
+        """Selects UTXOs with :func:`~lit.transaction.sanitize_tx_data` from
+        those not leased to anyone else and leases them.
+
+        :raises InsufficientFunds: If the UTXOs not leased to others cannot
+                                   pay for the outputs.
+        :raises RuntimeError: If other senders kept leasing the selected UTXOs
+                              first.
+        :rtype: :class:`~lit.ledger.Reservation`
+        """
+        owner = uuid.uuid4().hex
+
+        for _ in range(self.MAX_ATTEMPTS):
+            leased = self.leased()
+            available = [
+                unspent for unspent in unspents
+                if (unspent.txid, unspent.txindex) not in leased
+            ]
+
+            selected, tx_outputs = sanitize_tx_data(
+                available, outputs, fee, leftover, combine=combine, message=message,
+                compressed=compressed
+            )
+
+            if self.acquire(selected, owner):
+                return Reservation(self, owner, selected, tx_outputs)
+
+        raise RuntimeError('Could not lease unspents after {} '
+                           'attempts.'.format(self.MAX_ATTEMPTS))
+
+
+class SQLiteLeaseStore(LeaseStore):
+    """A :class:`~lit.ledger.LeaseStore` kept in an SQLite database, so that
+    worker processes sending from the same key can share leases.
+
+    :param path: The database file. It is created if missing.
+    :type path: ``str``
+    :param ttl: The number of seconds a lease lasts unless released.
+    :type ttl: ``int``
+    """
+
+    def __init__(self, path, ttl=600):
+        super().__init__(ttl=ttl)
+        self.path = path
+
+        with closing(self._connect()) as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS leases ('
+                         'txid TEXT NOT NULL, txindex INTEGER NOT NULL, '
+                         'owner TEXT NOT NULL, expires REAL NOT NULL, '
+                         'PRIMARY KEY (txid, txindex))')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def acquire(self, unspents, owner):
+        now = time.time()
+        rows = [(unspent.txid, unspent.txindex, owner, now + self.ttl) for unspent in unspents]
+
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('DELETE FROM leases WHERE expires <= ?', (now,))
+                conn.executemany('INSERT INTO leases VALUES (?, ?, ?, ?)', rows)
+            except sqlite3.IntegrityError:
+                conn.execute('ROLLBACK')
+                return False
+            conn.execute('COMMIT')
+
+        return True
+
+    def release(self, unspents, owner):
+        with closing(self._connect()) as conn:
+            conn.executemany(
+                'DELETE FROM leases WHERE txid = ? AND txindex = ? AND owner = ?',
+                [(unspent.txid, unspent.txindex, owner) for unspent in unspents]
+            )
+
+    def leased(self):
+        with closing(self._connect()) as conn:
+            return set(conn.execute('SELECT txid, txindex FROM leases WHERE expires > ?',
+                                    (time.time(),)))
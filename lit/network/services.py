@@ -2,6 +2,7 @@ import requests
 
 from lit.network import currency_to_satoshi
 from lit.network.meta import Unspent
+from lit.utils import bytes_to_hex
 
 DEFAULT_TIMEOUT = 10
 
@@ -500,10 +501,13 @@ class NetworkAPI:
     def broadcast_tx(cls, tx_hex):  # pragma: no cover
         """Broadcasts a transaction to the blockchain.
 
-        :param tx_hex: A signed transaction in hex form.
-        :type tx_hex: ``str``
+        :param tx_hex: A signed transaction in hex form or as raw bytes.
+        :type tx_hex: ``str`` or ``bytes``
         :raises ConnectionError: If all API services fail.
         """
+        if isinstance(tx_hex, (bytes, bytearray)):
+            tx_hex = bytes_to_hex(tx_hex)
+
         success = None
 
         for api_call in cls.BROADCAST_TX_MAIN:
@@ -525,10 +529,13 @@ class NetworkAPI:
     def broadcast_tx_testnet(cls, tx_hex):  # pragma: no cover
         """Broadcasts a transaction to the test network's blockchain.
 
-        :param tx_hex: A signed transaction in hex form.
-        :type tx_hex: ``str``
+        :param tx_hex: A signed transaction in hex form or as raw bytes.
+        :type tx_hex: ``str`` or ``bytes``
         :raises ConnectionError: If all API services fail.
         """
+        if isinstance(tx_hex, (bytes, bytearray)):
+            tx_hex = bytes_to_hex(tx_hex)
+
         success = None
 
         for api_call in cls.BROADCAST_TX_TEST:
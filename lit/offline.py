@@ -0,0 +1,230 @@
+from io import BytesIO
+from struct import Struct, error as struct_error
+
+from lit.network.meta import Unspent
+from lit.transaction import create_p2pkh_transaction
+from lit.utils import int_to_varint, read_varint
+
+# Prepared transactions are stored as a header followed by any number of
+# length-prefixed records, so a file of them can be written and read one
+# transaction at a time:
+#
+#   header  magic (4) | format version (1)
+#   record  varint length | varint n_unspents | unspent ... |
+#           varint n_outputs | output ...
+#   unspent txid (32) | txindex (uint32) | amount (uint64) |
+#           confirmations (uint32) | varint script length | script
+#   output  amount (uint64) | varint destination length | destination
+#
+# Integers are little-endian. An output's destination is its address as
+# ASCII, or the raw message chunk when its amount is 0.
+PREPARED_MAGIC = b'lit\xff'
+PREPARED_VERSION = 1
+PREPARED_HEADER = PREPARED_MAGIC + PREPARED_VERSION.to_bytes(1, byteorder='little')
+
+# The fixed-size fields are packed and unpacked in one call each.
+UNSPENT_FIELDS = Struct('<32sIQI')
+AMOUNT_FIELD = Struct('<Q')
+
+
+def encode_prepared(unspents, outputs):
+    """Encodes the data needed to sign one transaction as a single record,
+    without the header.
+
+    :param unspents: The UTXOs to spend.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    :param outputs: The ``(destination, satoshi)`` outputs, as returned by
+                    :func:`~lit.transaction.sanitize_tx_data`.
+    :type outputs: ``list`` of ``tuple``
+    :rtype: ``bytes``
+    """
+    parts = [int_to_varint(len(unspents))]
+    append = parts.append
+
+    for unspent in unspents:
+        script = bytes.fromhex(unspent.script)
+        append(UNSPENT_FIELDS.pack(
+            bytes.fromhex(unspent.txid), unspent.txindex, unspent.amount, unspent.confirmations
+        ))
+        append(int_to_varint(len(script)))
+        append(script)
+
+    append(int_to_varint(len(outputs)))
+
+    for dest, amount in outputs:
+        if amount:
+            dest = dest.encode('ascii')
+        append(AMOUNT_FIELD.pack(amount))
+        append(int_to_varint(len(dest)))
+        append(dest)
+
+    return b''.join(parts)
+
+
+def decode_prepared(record):
+    """Decodes a record written by :func:`~lit.offline.encode_prepared`.
+
+    :param record: The record, without its length prefix.
+    :type record: ``bytes``
+    :raises ValueError: If the record is truncated or malformed.
+    :returns: The UTXOs and outputs.
+    :rtype: ``tuple`` of (``list`` of :class:`~lit.network.meta.Unspent`, ``list`` of ``tuple``)
+    """
+    unpack_unspent = UNSPENT_FIELDS.unpack_from
+    unpack_amount = AMOUNT_FIELD.unpack_from
+
+    try:
+        n_unspents, offset = read_varint(record)
+        unspents = []
+
+        for _ in range(n_unspents):
+            txid, txindex, amount, confirmations = unpack_unspent(record, offset)
+            script_len, offset = read_varint(record, offset + UNSPENT_FIELDS.size)
+            script = record[offset:offset + script_len]
+            offset += script_len
+
+            unspents.append(Unspent(amount, confirmations, script.hex(), txid.hex(), txindex))
+
+        n_outputs, offset = read_varint(record, offset)
+        outputs = []
+
+        for _ in range(n_outputs):
+            amount, = unpack_amount(record, offset)
+            dest_len, offset = read_varint(record, offset + AMOUNT_FIELD.size)
+            dest = record[offset:offset + dest_len]
+            offset += dest_len
+
+            outputs.append((dest.decode('ascii') if amount else dest, amount))
+
+    except struct_error:
+        raise ValueError('Prepared transaction record is truncated.') from None
+
+    if offset != len(record):
+        raise ValueError('Prepared transaction record is {} bytes but {} were '
+                         'read.'.format(len(record), offset))
+
+    return unspents, outputs
+
+
+def check_header(header):
+
+    if header[:len(PREPARED_MAGIC)] != PREPARED_MAGIC:
+        raise ValueError('Data is not a prepared transaction container.')
+
+    if len(header) < len(PREPARED_HEADER):
+        raise ValueError('Prepared transaction header is truncated.')
+
+    if header[len(PREPARED_MAGIC)] != PREPARED_VERSION:
+        raise ValueError('Prepared transaction format version {} is not '
+                         'supported.'.format(header[len(PREPARED_MAGIC)]))
+
+
+def write_prepared(stream, transactions):
+    """Writes prepared transactions to a binary stream, such as a file
+    opened with ``'wb'``, one at a time.
+
+    :param stream: The stream to write to.
+    :param transactions: The ``(unspents, outputs)`` of each transaction.
+    :type transactions: iterable of ``tuple``
+    :returns: The number of transactions written.
+    :rtype: ``int``
+    """
+    stream.write(PREPARED_HEADER)
+    count = 0
+
+    for unspents, outputs in transactions:
+        record = encode_prepared(unspents, outputs)
+        stream.write(int_to_varint(len(record)))
+        stream.write(record)
+        count += 1
+
+    return count
+
+
+def read_prepared(stream):
+    """Reads prepared transactions from a binary stream, such as a file
+    opened with ``'rb'``, one at a time.
+
+    :param stream: The stream to read from.
+    :raises ValueError: If the stream is not a supported container or is
+                        truncated.
+    :returns: The ``(unspents, outputs)`` of each transaction, in order.
+    :rtype: generator of ``tuple``
+    """
+    check_header(stream.read(len(PREPARED_HEADER)))
+
+    while True:
+        prefix = stream.read(1)
+
+        if not prefix:
+            return
+
+        size = prefix[0]
+
+        if size >= 0xfd:
+            width = 2 if size == 0xfd else 4 if size == 0xfe else 8
+            length = stream.read(width)
+
+            if len(length) != width:
+                raise ValueError('Prepared transaction record is truncated.')
+
+            size = int.from_bytes(length, 'little')
+
+        record = stream.read(size)
+
+        if len(record) != size:
+            raise ValueError('Prepared transaction record is truncated.')
+
+        yield decode_prepared(record)
+
+
+def prepared_to_bytes(unspents, outputs):
+    """Encodes one prepared transaction as a complete container.
+
+    :param unspents: The UTXOs to spend.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    :param outputs: The ``(destination, satoshi)`` outputs.
+    :type outputs: ``list`` of ``tuple``
+    :rtype: ``bytes``
+    """
+    record = encode_prepared(unspents, outputs)
+    return PREPARED_HEADER + int_to_varint(len(record)) + record
+
+
+def prepared_from_bytes(data):
+    """Decodes a container holding exactly one prepared transaction.
+
+    :param data: The output of :func:`~lit.offline.prepared_to_bytes`.
+    :type data: ``bytes``
+    :raises ValueError: If the data is invalid or does not hold exactly one
+                        transaction.
+    :rtype: ``tuple`` of (``list`` of :class:`~lit.network.meta.Unspent`, ``list`` of ``tuple``)
+    """
+    transactions = list(read_prepared(BytesIO(data)))
+
+    if len(transactions) != 1:
+        raise ValueError('Expected 1 prepared transaction but found '
+                         '{}.'.format(len(transactions)))
+
+    return transactions[0]
+
+
+def sign_prepared(private_key, stream, workers=None, as_bytes=False):
+    """Signs every transaction of a prepared transaction stream, reading and
+    signing one at a time so files of any size can be processed.
+
+    :param private_key: The key owning every UTXO.
+    :type private_key: :class:`~lit.PrivateKey` or :class:`~lit.PrivateKeyTestnet`
+    :param stream: A stream written by :func:`~lit.offline.write_prepared`.
+    :param workers: The number of threads used to sign the inputs of each
+                    transaction.
+    :type workers: ``int``
+    :param as_bytes: Whether or not to return bytes instead of hex.
+    :type as_bytes: ``bool``
+    :raises ValueError: If the stream is not a supported container.
+    :returns: The signed transactions, in order.
+    :rtype: generator of ``str`` or ``bytes``
+    """
+    for unspents, outputs in read_prepared(stream):
+        yield create_p2pkh_transaction(private_key, unspents, outputs, workers=workers,
+                                       as_bytes=as_bytes)
@@ -0,0 +1,203 @@
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from operator import attrgetter
+
+from lit.exceptions import InsufficientFunds
+
+# Bitcoin Core allows 100,000 tries, but in Python that costs tens of
+# milliseconds per selection while rarely finding a better match.
+BNB_MAX_TRIES = 5000
+# Fewer than 253 candidates also keeps the input count of changeless
+# selections within a single byte.
+BNB_MAX_CANDIDATES = 252
+
+
+class UnspentIndex:
+    """Unspent transaction outputs kept sorted by amount, so that repeated
+    coin selections over a large wallet are found by bisection rather than
+    by sorting and walking every UTXO.
+
+    :param unspents: The UTXOs to index.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    """
+    __slots__ = ('_amounts', '_scripts', '_total', '_unspents')
+
+    def __init__(self, unspents=()):
+        self._unspents = sorted(unspents, key=attrgetter('amount'))
+        self._amounts = [unspent.amount for unspent in self._unspents]
+        self._total = sum(self._amounts)
+        # How many UTXOs pay to each script. A wallet has very few.
+        self._scripts = Counter(unspent.script for unspent in self._unspents)
+
+    @property
+    def total(self):
+        """The sum of all indexed amounts.
+
+        :rtype: ``int``
+        """
+        return self._total
+
+    @property
+    def scripts(self):
+        """The distinct scriptPubKeys of the indexed UTXOs, which determine
+        the kinds of inputs spending them takes.
+
+        :rtype: ``set``-like of ``str``
+        """
+        return self._scripts.keys()
+
+    def add(self, unspent):
+        index = bisect_right(self._amounts, unspent.amount)
+        self._amounts.insert(index, unspent.amount)
+        self._unspents.insert(index, unspent)
+        self._total += unspent.amount
+        self._scripts[unspent.script] += 1
+
+    def remove(self, unspent):
+        """:raises ValueError: If ``unspent`` is not in the index."""
+        amounts = self._amounts
+        index = bisect_left(amounts, unspent.amount)
+
+        while index < len(amounts) and amounts[index] == unspent.amount:
+            if self._unspents[index] == unspent:
+                del amounts[index]
+                del self._unspents[index]
+                self._total -= unspent.amount
+
+                self._scripts[unspent.script] -= 1
+                if not self._scripts[unspent.script]:
+                    del self._scripts[unspent.script]
+                return
+            index += 1
+
+        raise ValueError('{} is not in the index.'.format(unspent))
+
+    def select(self, target, input_cost=0, change_cost=0):
+        """Selects UTXOs that pay for ``target`` plus the cost of spending
+        each selected UTXO, preferring selections with as few inputs as
+        possible.
+
+        First a branch-and-bound search over the UTXOs just below the target
+        looks for a selection that overshoots it by no more than
+        ``change_cost`` so that no change output is needed. Failing that, the
+        smallest single UTXO that covers the target and a change output is
+        used, and as a last resort the largest UTXOs are accumulated until
+        they do.
+
+        :param target: The amount to pay for, excluding the cost of inputs.
+        :type target: ``int``
+        :param input_cost: The fee needed to spend one UTXO.
+        :type input_cost: ``int``
+        :param change_cost: The fee needed to add a change output.
+        :type change_cost: ``int``
+        :raises InsufficientFunds: If all UTXOs together cannot pay for
+                                   ``target``.
+        :returns: The selected UTXOs and whether or not the selection is
+                  changeless.
+        :rtype: ``tuple`` of (``list`` of :class:`~lit.network.meta.Unspent`, ``bool``)
+        """
+        amounts = self._amounts
+        unspents = self._unspents
+
+        # Effective values are amounts minus input_cost, so the amount order
+        # is also the effective value order.
+        lower = bisect_right(amounts, input_cost)
+        upper = bisect_right(amounts, target + change_cost + input_cost)
+
+        candidates = [amount - input_cost for amount in
+                      reversed(amounts[max(lower, upper - BNB_MAX_CANDIDATES):upper])]
+        selection = branch_and_bound(candidates, target, change_cost)
+
+        if selection is not None:
+            return [unspents[upper - 1 - i] for i in selection], True
+
+        needed = target + change_cost
+
+        index = bisect_left(amounts, needed + input_cost)
+        if index < len(amounts):
+            return [unspents[index]], False
+
+        selected = []
+        total = 0
+
+        for index in range(len(amounts) - 1, lower - 1, -1):
+            selected.append(unspents[index])
+            total += amounts[index] - input_cost
+
+            if total >= needed:
+                return selected, False
+
+        raise InsufficientFunds('Balance {} is less than {} (including '
+                                'fee).'.format(self._total, needed + input_cost * len(selected)))
+
+    def __contains__(self, unspent):
+        index = bisect_left(self._amounts, unspent.amount)
+        return unspent in self._unspents[index:bisect_right(self._amounts, unspent.amount)]
+
+    def __iter__(self):
+        return iter(self._unspents)
+
+    def __len__(self):
+        return len(self._unspents)
+
+
+def branch_and_bound(values, target, window):
+    """Depth-first search for a subset of ``values`` whose sum lies within
+    ``[target, target + window]``, as done by Bitcoin Core. Among the subsets
+    found before the search gives up, the one with the least excess wins.
+
+    :param values: Positive values sorted in descending order.
+    :type values: ``list`` of ``int``
+    :returns: The indices of the selected values, or ``None``.
+    :rtype: ``list`` of ``int``
+    """
+    available = sum(values)
+
+    if available < target:
+        return None
+
+    best = None
+    best_excess = window + 1
+
+    current = []
+    value = 0
+    index = 0
+
+    for _ in range(BNB_MAX_TRIES):
+        backtrack = False
+
+        if value + available < target or value > target + window:
+            backtrack = True
+        elif value >= target:
+            excess = value - target
+            if excess < best_excess:
+                best, best_excess = current.copy(), excess
+                if excess == 0:
+                    break
+            backtrack = True
+
+        if backtrack:
+            if not current:
+                break
+
+            # Restore the values skipped since the last inclusion, then try
+            # the branch that omits it.
+            index -= 1
+            while index > current[-1]:
+                available += values[index]
+                index -= 1
+
+            value -= values[index]
+            current.pop()
+
+        else:
+            available -= values[index]
+
+            # Omitting a value then including an equal one finds nothing new.
+            if not current or current[-1] == index - 1 or values[index] != values[index - 1]:
+                current.append(index)
+                value += values[index]
+
+        index += 1
+
+    return best
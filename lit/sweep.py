@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from lit.network import NetworkAPI, get_fee_cached
+from lit.transaction import (
+    MAX_STANDARD_TX_SIZE, ConsolidationPlan, calc_txid_bytes,
+    create_multikey_transaction, plan_consolidation
+)
+from lit.wallet import PrivateKeyTestnet
+
+
+def fetch_groups(keys, workers=8):
+    """Fetches the UTXOs of many keys concurrently, as each fetch mostly
+    waits on the network.
+
+    :param keys: The keys to fetch UTXOs for.
+    :type keys: ``list`` of :class:`~lit.PrivateKey` or :class:`~lit.PrivateKeyTestnet`
+    :param workers: The most fetches in flight at once.
+    :type workers: ``int``
+    :returns: The ``(key, unspents)`` of each key with any UTXOs, in the
+              order of ``keys``.
+    :rtype: ``list`` of ``tuple``
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        fetched = list(executor.map(lambda key: key.get_unspents(), keys))
+
+    return [(key, unspents) for key, unspents in zip(keys, fetched) if unspents]
+
+
+def plan_sweep(groups, leftover, fee, max_size=MAX_STANDARD_TX_SIZE):
+    """Splits sweeping the UTXOs of many keys into as few transactions as fit
+    within ``max_size`` bytes each, as done for a single key by
+    :func:`~lit.transaction.plan_consolidation`.
+
+    :param groups: The ``(key, unspents)`` of each key.
+    :type groups: ``list`` of ``tuple``
+    :param leftover: The address receiving the swept funds.
+    :type leftover: ``str``
+    :param fee: The number of satoshi per byte to pay to miners.
+    :type fee: ``int``
+    :param max_size: The largest transaction virtual size allowed, in bytes.
+    :type max_size: ``int``
+    :raises ValueError: If there is nothing worth sweeping.
+    :raises InsufficientFunds: If a transaction cannot pay for its own fee.
+    :returns: A plan whose batches are ``(groups, outputs)``, ready to be
+              passed to :func:`~lit.transaction.create_multikey_transaction`.
+    :rtype: :class:`~lit.transaction.ConsolidationPlan`
+    """
+    owners = {}
+    unspents = []
+
+    for key, key_unspents in groups:
+        for unspent in key_unspents:
+            owners[(unspent.txid, unspent.txindex)] = key
+            unspents.append(unspent)
+
+    # Uncompressed keys have the larger inputs.
+    compressed = all(key.is_compressed() for key, _ in groups)
+    plan = plan_consolidation(unspents, leftover, fee, max_size=max_size, compressed=compressed)
+
+    batches = []
+    for batch, outputs in plan.batches:
+        batch_groups = []
+
+        for unspent in batch:
+            key = owners[(unspent.txid, unspent.txindex)]
+
+            if batch_groups and batch_groups[-1][0] is key:
+                batch_groups[-1][1].append(unspent)
+            else:
+                batch_groups.append((key, [unspent]))
+
+        batches.append((batch_groups, outputs))
+
+    return ConsolidationPlan(batches, plan.fee, plan.size)
+
+
+def sweep(keys, leftover, fee=None, max_size=MAX_STANDARD_TX_SIZE, groups=None, workers=8):
+    """Moves the funds of many keys, such as deposit addresses, to
+    ``leftover`` in as few transactions as possible and attempts to broadcast
+    them on the blockchain. Each key's UTXOs are updated as in
+    :func:`~lit.PrivateKey.send`.
+
+    :param keys: The keys to sweep. They must all be mainnet or all testnet.
+                 Unused if ``groups`` is given.
+    :type keys: ``list`` of :class:`~lit.PrivateKey` or :class:`~lit.PrivateKeyTestnet`
+    :param leftover: The address receiving the swept funds.
+    :type leftover: ``str``
+    :param fee: The number of satoshi per byte to pay to miners. By default
+                Lit will poll `<https://bitcoinfees.earn.com>`_ and use a fee
+                that will allow your transactions to be confirmed as soon as
+                possible.
+    :type fee: ``int``
+    :param max_size: The largest virtual size of each transaction in bytes.
+    :type max_size: ``int``
+    :param groups: The ``(key, unspents)`` to sweep. By default the UTXOs of
+                   ``keys`` are fetched concurrently.
+    :type groups: ``list`` of ``tuple``
+    :param workers: The number of threads used to fetch UTXOs and to sign
+                    each transaction.
+    :type workers: ``int``
+    :raises ValueError: If there is nothing worth sweeping.
+    :returns: The transaction IDs, in the order they were broadcast.
+    :rtype: ``list`` of ``str``
+    """
+    if groups is None:
+        groups = fetch_groups(keys, workers=workers)
+
+    if not groups:
+        raise ValueError('There are no UTXOs to sweep.')
+
+    # The network is that of the keys actually spent from.
+    testnet = isinstance(groups[0][0], PrivateKeyTestnet)
+
+    plan = plan_sweep(groups, leftover, fee or get_fee_cached(), max_size=max_size)
+    txids = []
+
+    for batch_groups, outputs in plan.batches:
+        tx = create_multikey_transaction(batch_groups, outputs, workers=workers, as_bytes=True)
+
+        if testnet:
+            NetworkAPI.broadcast_tx_testnet(tx)
+        else:
+            NetworkAPI.broadcast_tx(tx)
+
+        for key in {id(key): key for key, _ in batch_groups}.values():
+            key._apply_transaction(tx)
+
+        txids.append(calc_txid_bytes(tx))
+
+    return txids
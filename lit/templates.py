@@ -0,0 +1,141 @@
+from lit.network import get_fee_cached
+from lit.transaction import (
+    OP_RETURN, RBF_SEQUENCE, SEQUENCE, address_to_scriptpubkey, sanitize_tx_data,
+    sign_transaction_parts
+)
+from lit.utils import int_to_varint
+
+
+class PayoutTemplate:
+    """Outputs paying a fixed list of destinations, compiled once so that
+    transactions paying them new amounts skip decoding addresses and
+    building scriptPubKeys.
+
+    Each destination's script is serialized along with its length up front,
+    so an output block is just each amount followed by a cached script.
+    Destinations not in the list, such as a key's own address receiving
+    change, are compiled the first time they are used and cached as well. A
+    template can be shared by several threads.
+
+    :param destinations: The addresses paid, in order.
+    :type destinations: ``list`` of ``str``
+    :param leftover: The destination that will receive any change. By
+                     default the change goes to the paying key's address.
+    :type leftover: ``str``
+    :raises ValueError: If an address is invalid.
+    """
+    __slots__ = ('destinations', 'leftover', '_scripts')
+
+    def __init__(self, destinations, leftover=None):
+        self.destinations = tuple(destinations)
+        self.leftover = leftover
+        self._scripts = {}
+
+        for dest in self.destinations + ((leftover,) if leftover else ()):
+            self._compile(dest)
+
+    def _compile(self, dest):
+        script = self._scripts.get(dest)
+
+        if script is None:
+            script = address_to_scriptpubkey(dest)
+            script = int_to_varint(len(script)) + script
+            # Threads racing here at worst compile the same script twice.
+            self._scripts[dest] = script
+
+        return script
+
+    def outputs(self, amounts):
+        """Pairs each destination with its amount.
+
+        :param amounts: The number of satoshi paid to each destination, in
+                        order.
+        :type amounts: ``list`` of ``int``
+        :raises ValueError: If there is not one amount per destination.
+        :rtype: ``list`` of ``tuple``
+        """
+        if len(amounts) != len(self.destinations):
+            raise ValueError('Expected {} amounts but got {}.'.format(
+                len(self.destinations), len(amounts)
+            ))
+
+        return list(zip(self.destinations, amounts))
+
+    def output_block(self, outputs):
+        """Serializes outputs from the cached scripts. The result equals
+        that of :func:`~lit.transaction.construct_output_block`, including
+        for zero-amount outputs storing a message, which are not cached.
+
+        :param outputs: The ``(destination, satoshi)`` outputs.
+        :type outputs: ``list`` of ``tuple``
+        :rtype: ``bytes``
+        """
+        scripts = self._scripts
+        compile_script = self._compile
+        block = []
+        append = block.append
+
+        for dest, amount in outputs:
+            if amount:
+                append(amount.to_bytes(8, byteorder='little'))
+                append(scripts.get(dest) or compile_script(dest))
+            else:
+                script = OP_RETURN + len(dest).to_bytes(1, byteorder='little') + dest
+                append(b'\x00' * 8)
+                append(int_to_varint(len(script)))
+                append(script)
+
+        return b''.join(block)
+
+    def create_transaction(self, private_key, unspents, amounts, fee=None, combine=True,
+                           workers=None, as_bytes=False, replaceable=False):
+        """Creates a signed transaction paying ``amounts`` to the template's
+        destinations. UTXOs are selected and the fee calculated as by
+        :func:`~lit.PrivateKey.create_transaction`.
+
+        :param private_key: The key owning every UTXO.
+        :type private_key: :class:`~lit.PrivateKey` or :class:`~lit.PrivateKeyTestnet`
+        :param unspents: The UTXOs to choose from.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param amounts: The number of satoshi paid to each destination, in
+                        order.
+        :type amounts: ``list`` of ``int``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Lit will poll `<https://bitcoinfees.earn.com>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param combine: Whether or not Lit should use all available UTXOs.
+        :type combine: ``bool``
+        :param workers: The number of threads used to sign inputs.
+        :type workers: ``int``
+        :param as_bytes: Whether or not to return bytes instead of hex.
+        :type as_bytes: ``bool``
+        :param replaceable: Whether or not to signal that the transaction may
+                            be replaced by one paying a higher fee (BIP125).
+        :type replaceable: ``bool``
+        :raises ValueError: If there is not one amount per destination.
+        :raises InsufficientFunds: If the UTXOs cannot pay for the outputs.
+        :rtype: ``str`` or ``bytes``
+        """
+        unspents, outputs = sanitize_tx_data(
+            unspents,
+            [(dest, amount, 'satoshi') for dest, amount in self.outputs(amounts)],
+            fee or get_fee_cached(),
+            self.leftover or private_key.address,
+            combine=combine,
+            compressed=private_key.is_compressed()
+        )
+
+        return sign_transaction_parts(
+            [(private_key, unspents)], len(outputs), self.output_block(outputs), workers,
+            as_bytes, RBF_SEQUENCE if replaceable else SEQUENCE
+        )
+
+    def __len__(self):
+        return len(self.destinations)
+
+    def __repr__(self):
+        return 'PayoutTemplate(destinations={}, leftover={})'.format(
+            len(self.destinations), repr(self.leftover)
+        )
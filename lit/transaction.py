@@ -1,23 +1,32 @@
+import os
 from collections import namedtuple
-from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256 as _sha256
 
-from lit.crypto import double_sha256, sha256
+from lit.crypto import double_sha256, ripemd160_sha256
 from lit.exceptions import InsufficientFunds
-from lit.format import address_to_public_key_hash
+from lit.format import decode_address
+from lit.network.meta import Unspent
 from lit.network.rates import currency_to_satoshi_cached
-from lit.utils import (
-    bytes_to_hex, chunk_data, hex_to_bytes, int_to_unknown_bytes
-)
+from lit.selection import UnspentIndex
+from lit.utils import bytes_to_hex, chunk_data, hex_to_bytes, int_to_varint, read_varint
 
 VERSION_1 = 0x01.to_bytes(4, byteorder='little')
 SEQUENCE = 0xffffffff.to_bytes(4, byteorder='little')
+# Any input with a sequence below 0xfffffffe lets the transaction be
+# replaced by one paying a higher fee (BIP125).
+RBF_SEQUENCE = 0xfffffffd.to_bytes(4, byteorder='little')
 LOCK_TIME = 0x00.to_bytes(4, byteorder='little')
 HASH_TYPE = 0x01.to_bytes(4, byteorder='little')
+# Marker and flag preceding the inputs of transactions with witness data.
+SEGWIT_MARKER = b'\x00\x01'
 
 OP_0 = b'\x00'
+OP_1 = b'\x51'
 OP_CHECKLOCKTIMEVERIFY = b'\xb1'
 OP_CHECKSIG = b'\xac'
 OP_DUP = b'v'
+OP_EQUAL = b'\x87'
 OP_EQUALVERIFY = b'\x88'
 OP_HASH160 = b'\xa9'
 OP_PUSH_20 = b'\x14'
@@ -25,23 +34,73 @@ OP_RETURN = b'\x6a'
 
 MESSAGE_LIMIT = 40
 
+# A DER signature with a low S value is at most 71 bytes, plus the hash type.
+MAX_SIGNATURE_SIZE = 72
+# Outpoint, script length, signature push, public key push and sequence.
+P2PKH_INPUT_SIZE_COMPRESSED = 32 + 4 + 1 + 1 + MAX_SIGNATURE_SIZE + 1 + 33 + 4
+P2PKH_INPUT_SIZE_UNCOMPRESSED = 32 + 4 + 1 + 1 + MAX_SIGNATURE_SIZE + 1 + 65 + 4
+P2PKH_OUTPUT_SIZE = 8 + 1 + 25
+P2SH_OUTPUT_SIZE = 8 + 1 + 23
+P2SH_ADDRESS_PREFIXES = ('M', '3', 'Q', '2')
+BECH32_ADDRESS_PREFIXES = ('ltc1', 'tltc')
+
+# Non-witness bytes weigh four times as much as witness bytes, and the
+# virtual size used for fees is the weight divided by four.
+WITNESS_SCALE_FACTOR = 4
+# Outpoint, empty script and sequence, then a witness of the signature and
+# public key.
+P2WPKH_INPUT_WEIGHT = (32 + 4 + 1 + 4) * 4 + 1 + 1 + MAX_SIGNATURE_SIZE + 1 + 33
+# As above, with a script pushing the P2WPKH redeem script.
+NESTED_P2WPKH_INPUT_WEIGHT = (32 + 4 + 1 + 23 + 4) * 4 + 1 + 1 + MAX_SIGNATURE_SIZE + 1 + 33
+
+# Transactions larger than this are not relayed by default.
+MAX_STANDARD_TX_SIZE = 100000
+# The satoshi per byte a replacement must pay on top of the fee of the
+# transaction it replaces.
+INCREMENTAL_RELAY_FEE = 1
+# The least satoshi per byte a transaction must pay to be relayed.
+MIN_RELAY_FEE = 1
+
 
 class TxIn:
-    __slots__ = ('script', 'script_len', 'txid', 'txindex')
+    __slots__ = ('script', 'script_len', 'txid', 'txindex', 'sequence', 'witness')
 
-    def __init__(self, script, script_len, txid, txindex):
+    def __init__(self, script, script_len, txid, txindex, sequence=SEQUENCE, witness=b''):
         self.script = script
         self.script_len = script_len
         self.txid = txid
         self.txindex = txindex
+        self.sequence = sequence
+        self.witness = witness
 
     def __eq__(self, other):
         return (self.script == other.script and
                 self.script_len == other.script_len and
                 self.txid == other.txid and
-                self.txindex == other.txindex)
+                self.txindex == other.txindex and
+                self.sequence == other.sequence and
+                self.witness == other.witness)
 
     def __repr__(self):
+        if self.witness:
+            return 'TxIn({}, {}, {}, {}, {}, {})'.format(
+                repr(self.script),
+                repr(self.script_len),
+                repr(self.txid),
+                repr(self.txindex),
+                repr(self.sequence),
+                repr(self.witness)
+            )
+
+        if self.sequence != SEQUENCE:
+            return 'TxIn({}, {}, {}, {}, {})'.format(
+                repr(self.script),
+                repr(self.script_len),
+                repr(self.txid),
+                repr(self.txindex),
+                repr(self.sequence)
+            )
+
         return 'TxIn({}, {}, {}, {})'.format(
             repr(self.script),
             repr(self.script_len),
@@ -50,11 +109,616 @@ class TxIn:
         )
 
 
+class TxOut:
+    __slots__ = ('amount', 'script_len', 'script')
+
+    def __init__(self, amount, script_len, script):
+        self.amount = amount
+        self.script_len = script_len
+        self.script = script
+
+    def __eq__(self, other):
+        return (self.amount == other.amount and
+                self.script_len == other.script_len and
+                self.script == other.script)
+
+    def __repr__(self):
+        return 'TxOut({}, {}, {})'.format(
+            repr(self.amount),
+            repr(self.script_len),
+            repr(self.script)
+        )
+
+
+class TxObj:
+    """A transaction parsed from its raw serialization.
+
+    Nothing is copied: every field of the inputs and outputs is a
+    ``memoryview`` slice of the original bytes, and the inputs and outputs
+    are only located the first time they are accessed. Numeric fields such as
+    :attr:`~lit.transaction.TxOut.amount` stay in their serialized
+    little-endian form until decoded with ``int.from_bytes``. Each input's
+    :attr:`~lit.transaction.TxIn.witness` is the serialized witness,
+    including its item count, or empty if the transaction has none.
+
+    :param tx: A raw transaction.
+    :type tx: ``bytes``
+    """
+    __slots__ = ('_raw', '_inputs', '_outputs', '_outputs_end')
+
+    def __init__(self, tx):
+        self._raw = memoryview(tx)
+        self._inputs = None
+        self._outputs = None
+        self._outputs_end = None
+
+    @property
+    def version(self):
+        """:rtype: ``int``"""
+        return int.from_bytes(self._raw[:4], byteorder='little')
+
+    @property
+    def locktime(self):
+        """:rtype: ``int``"""
+        return int.from_bytes(self._raw[-4:], byteorder='little')
+
+    @property
+    def segwit(self):
+        """Whether or not the transaction is serialized with witness data.
+
+        :rtype: ``bool``
+        """
+        # A transaction without witness data never has zero inputs.
+        return len(self._raw) > 5 and self._raw[4] == 0
+
+    @property
+    def inputs(self):
+        """:rtype: ``list`` of :class:`~lit.transaction.TxIn`"""
+        if self._inputs is None:
+            self._parse()
+        return self._inputs
+
+    @property
+    def outputs(self):
+        """:rtype: ``list`` of :class:`~lit.transaction.TxOut`"""
+        if self._outputs is None:
+            self._parse()
+        return self._outputs
+
+    @property
+    def replaceable(self):
+        """Whether or not the transaction signals that it may be replaced by
+        one paying a higher fee (BIP125).
+
+        :rtype: ``bool``
+        """
+        return any(
+            int.from_bytes(txin.sequence, 'little') < 0xfffffffe for txin in self.inputs
+        )
+
+    @property
+    def txid(self):
+        """The transaction ID, hashed directly from the raw bytes. Witness
+        data is not part of it.
+
+        :rtype: ``str``
+        """
+        if not self.segwit:
+            return calc_txid_bytes(self._raw)
+
+        if self._outputs_end is None:
+            self._parse()
+
+        raw = self._raw
+        hashed = _sha256(raw[:4])
+        hashed.update(raw[len(SEGWIT_MARKER) + 4:self._outputs_end])
+        hashed.update(raw[-4:])
+
+        return bytes_to_hex(_sha256(hashed.digest()).digest()[::-1])
+
+    @property
+    def weight(self):
+        """The size of the transaction with non-witness bytes counted four
+        times.
+
+        :rtype: ``int``
+        """
+        if not self.segwit:
+            return len(self._raw) * WITNESS_SCALE_FACTOR
+
+        if self._outputs_end is None:
+            self._parse()
+
+        witness_size = len(SEGWIT_MARKER) + len(self._raw) - 4 - self._outputs_end
+
+        return (len(self._raw) - witness_size) * (WITNESS_SCALE_FACTOR - 1) + len(self._raw)
+
+    @property
+    def vsize(self):
+        """The virtual size in bytes that fees are paid for.
+
+        :rtype: ``int``
+        """
+        return -(-self.weight // WITNESS_SCALE_FACTOR)
+
+    def _parse(self):
+        raw = self._raw
+        end = len(raw)
+        segwit = self.segwit
+
+        n_in, offset = read_varint(raw, 4 + len(SEGWIT_MARKER) if segwit else 4)
+
+        inputs = []
+        for _ in range(n_in):
+            txid = raw[offset:offset + 32]
+            txindex = raw[offset + 32:offset + 36]
+
+            script_start = offset + 36
+            script_len, offset = read_varint(raw, script_start)
+            script_len_bytes = raw[script_start:offset]
+
+            script = raw[offset:offset + script_len]
+            offset += script_len
+            sequence = raw[offset:offset + 4]
+            offset += 4
+
+            inputs.append(TxIn(script, script_len_bytes, txid, txindex, sequence))
+
+        n_out, offset = read_varint(raw, offset)
+
+        outputs = []
+        for _ in range(n_out):
+            amount = raw[offset:offset + 8]
+
+            script_start = offset + 8
+            script_len, offset = read_varint(raw, script_start)
+            script_len_bytes = raw[script_start:offset]
+
+            script = raw[offset:offset + script_len]
+            offset += script_len
+
+            outputs.append(TxOut(amount, script_len_bytes, script))
+
+        outputs_end = offset
+
+        if segwit:
+            for txin in inputs:
+                witness_start = offset
+                n_items, offset = read_varint(raw, offset)
+
+                for _ in range(n_items):
+                    item_len, offset = read_varint(raw, offset)
+                    offset += item_len
+
+                txin.witness = raw[witness_start:offset]
+
+        if offset + 4 != end:
+            raise ValueError('Transaction is malformed: expected {} bytes but got '
+                             '{}.'.format(offset + 4, end))
+
+        self._inputs = inputs
+        self._outputs = outputs
+        self._outputs_end = outputs_end
+
+    def to_bytes(self):
+        """:rtype: ``bytes``"""
+        return self._raw.tobytes()
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __repr__(self):
+        return 'TxObj({})'.format(self.txid)
+
+
+def deserialize(tx):
+    """Parses a raw transaction without copying any of its data.
+
+    :param tx: A raw transaction, or one in hex form.
+    :type tx: ``bytes`` or ``str``
+    :raises ValueError: If the transaction is truncated or has trailing data.
+    :rtype: :class:`~lit.transaction.TxObj`
+    """
+    if isinstance(tx, str):
+        tx = hex_to_bytes(tx)
+
+    return TxObj(tx)
+
+
 Output = namedtuple('Output', ('address', 'amount', 'currency'))
 
 
+class ConsolidationPlan:
+    """A consolidation of many UTXOs split into several transactions.
+
+    :ivar batches: The ``(unspents, outputs)`` of each transaction, ready to
+                   be passed to :func:`~lit.transaction.create_p2pkh_transaction`.
+    :ivar fee: The total fee of all transactions in satoshi.
+    :ivar size: The total maximum size of all transactions in bytes.
+    """
+    __slots__ = ('batches', 'fee', 'size')
+
+    def __init__(self, batches, fee, size):
+        self.batches = batches
+        self.fee = fee
+        self.size = size
+
+    def __len__(self):
+        return len(self.batches)
+
+    def __repr__(self):
+        return 'ConsolidationPlan(transactions={}, fee={}, size={})'.format(
+            len(self.batches), self.fee, self.size
+        )
+
+
+class TxWriter:
+    """Serializes transaction fields into a single ``bytearray``. Appending
+    to a ``bytearray`` grows it in place, unlike ``bytes`` concatenation which
+    copies everything written so far on every append.
+    """
+    __slots__ = ('_buffer',)
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+
+    def write_varint(self, num):
+        self._buffer += int_to_varint(num)
+
+    def write_uint32(self, num):
+        self._buffer += num.to_bytes(4, byteorder='little')
+
+    def write_uint64(self, num):
+        self._buffer += num.to_bytes(8, byteorder='little')
+
+    def getvalue(self):
+        return bytes(self._buffer)
+
+    def __len__(self):
+        return len(self._buffer)
+
+
+class LegacySighash:
+    """Computes the legacy (pre-SegWit) signature hash of each input of a
+    transaction.
+
+    Everything but the scriptCode of the input being signed is identical
+    across preimages, so the blanked inputs are serialized a single time and
+    every digest resumes from the hash state of the inputs preceding it.
+
+    :param inputs: The transaction's inputs.
+    :type inputs: ``list`` of :class:`~lit.transaction.TxIn`
+    :param output_block: The serialized outputs, as returned by
+                         :func:`~lit.transaction.construct_output_block`.
+    :type output_block: ``bytes``
+    :param output_count: The number of outputs in ``output_block``.
+    :type output_count: ``int``
+    """
+    __slots__ = ('_blanks', '_head', '_inputs', '_offsets', '_tail')
+
+    def __init__(self, inputs, output_block, output_count, version=VERSION_1,
+                 lock_time=LOCK_TIME, hash_type=HASH_TYPE):
+        self._inputs = inputs
+
+        blanks = []
+        offsets = [0]
+        offset = 0
+
+        for txin in inputs:
+            blank = b''.join((txin.txid, txin.txindex, OP_0, txin.sequence))
+            offset += len(blank)
+            blanks.append(blank)
+            offsets.append(offset)
+
+        self._blanks = memoryview(b''.join(blanks))
+        self._offsets = offsets
+        self._head = version + int_to_varint(len(inputs))
+        self._tail = int_to_varint(output_count) + output_block + lock_time + hash_type
+
+    def _signed_input(self, index, script_code):
+        txin = self._inputs[index]
+
+        if script_code is None:
+            script_code = txin.script
+
+        return b''.join((
+            txin.txid,
+            txin.txindex,
+            int_to_varint(len(script_code)),
+            script_code,
+            txin.sequence
+        ))
+
+    def digest(self, index, script_code=None):
+        """Returns the signature hash of a single input.
+
+        :param index: The position of the input being signed.
+        :type index: ``int``
+        :param script_code: The script to place in the signed input. By
+                            default the input's own ``script`` is used.
+        :type script_code: ``bytes``
+        :rtype: ``bytes``
+        """
+        offsets = self._offsets
+
+        hashed = _sha256(self._head)
+        hashed.update(self._blanks[:offsets[index]])
+        hashed.update(self._signed_input(index, script_code))
+        hashed.update(self._blanks[offsets[index + 1]:])
+        hashed.update(self._tail)
+
+        return hashed.digest()
+
+    def digests(self):
+        """Yields the signature hash of every input, in order, using each
+        input's own ``script`` as its scriptCode.
+
+        :rtype: ``generator`` of ``bytes``
+        """
+        blanks = self._blanks
+        offsets = self._offsets
+        tail = self._tail
+
+        preceding = _sha256(self._head)
+
+        for index in range(len(self._inputs)):
+            hashed = preceding.copy()
+            hashed.update(self._signed_input(index, None))
+            hashed.update(blanks[offsets[index + 1]:])
+            hashed.update(tail)
+
+            yield hashed.digest()
+
+            preceding.update(blanks[offsets[index]:offsets[index + 1]])
+
+
+class SegwitSighash:
+    """Computes the BIP143 signature hash of SegWit inputs of a transaction.
+
+    The hashes of all outpoints, all sequences and all outputs are shared by
+    every input, so they are computed once when the engine is created and
+    each digest only hashes a preimage of constant size.
+
+    :param inputs: The transaction's inputs.
+    :type inputs: ``list`` of :class:`~lit.transaction.TxIn`
+    :param output_block: The serialized outputs, as returned by
+                         :func:`~lit.transaction.construct_output_block`.
+    :type output_block: ``bytes``
+    """
+    __slots__ = ('_hash_outputs', '_hash_prevouts', '_hash_sequence', '_hash_type',
+                 '_inputs', '_lock_time', '_version')
+
+    def __init__(self, inputs, output_block, version=VERSION_1, lock_time=LOCK_TIME,
+                 hash_type=HASH_TYPE):
+        self._inputs = inputs
+        self._version = version
+        self._lock_time = lock_time
+        self._hash_type = hash_type
+
+        self._hash_prevouts = double_sha256(b''.join(
+            field for txin in inputs for field in (txin.txid, txin.txindex)
+        ))
+        self._hash_sequence = double_sha256(b''.join(txin.sequence for txin in inputs))
+        self._hash_outputs = double_sha256(output_block)
+
+    def digest(self, index, script_code, amount):
+        """Returns the signature hash of a single input.
+
+        :param index: The position of the input being signed.
+        :type index: ``int``
+        :param script_code: The scriptCode of the input, which for P2WPKH is
+                            the P2PKH script of the public key hash.
+        :type script_code: ``bytes``
+        :param amount: The value of the output being spent in satoshi.
+        :type amount: ``int``
+        :rtype: ``bytes``
+        """
+        txin = self._inputs[index]
+
+        return _sha256(b''.join((
+            self._version,
+            self._hash_prevouts,
+            self._hash_sequence,
+            txin.txid,
+            txin.txindex,
+            int_to_varint(len(script_code)),
+            script_code,
+            amount.to_bytes(8, byteorder='little'),
+            txin.sequence,
+            self._hash_outputs,
+            self._lock_time,
+            self._hash_type
+        ))).digest()
+
+
+def address_to_scriptpubkey(address):
+    kind, _, hashed = decode_address(address)
+
+    if kind == 'p2sh':
+        return OP_HASH160 + OP_PUSH_20 + hashed + OP_EQUAL
+    elif kind in ('p2wpkh', 'p2wsh'):
+        return OP_0 + len(hashed).to_bytes(1, byteorder='little') + hashed
+    elif kind == 'p2tr':
+        return OP_1 + len(hashed).to_bytes(1, byteorder='little') + hashed
+
+    return (OP_DUP + OP_HASH160 + OP_PUSH_20 +
+            hashed +
+            OP_EQUALVERIFY + OP_CHECKSIG)
+
+
+def public_key_to_scripts(public_key):
+    """Returns the scriptPubKeys a public key can receive to.
+
+    :param public_key: The public key.
+    :type public_key: ``bytes``
+    :returns: The P2PKH script, then, if the public key is compressed, the
+              P2WPKH script and the P2SH script wrapping it.
+    :rtype: ``tuple`` of ``bytes``
+    """
+    public_key_hash = ripemd160_sha256(public_key)
+    p2pkh = (OP_DUP + OP_HASH160 + OP_PUSH_20 +
+             public_key_hash +
+             OP_EQUALVERIFY + OP_CHECKSIG)
+
+    if len(public_key) != 33:
+        return (p2pkh,)
+
+    p2wpkh = OP_0 + OP_PUSH_20 + public_key_hash
+
+    return p2pkh, p2wpkh, OP_HASH160 + OP_PUSH_20 + ripemd160_sha256(p2wpkh) + OP_EQUAL
+
+
+def get_script_kind(script):
+    """Returns the kind of input needed to spend a UTXO.
+
+    :param script: The scriptPubKey of the UTXO in hex.
+    :type script: ``str``
+    :returns: ``'p2wpkh'``, ``'p2sh'`` (assumed to wrap P2WPKH) or, for any
+              other script, ``'p2pkh'``.
+    :rtype: ``str``
+    """
+    if len(script) == 44 and script.startswith('0014'):
+        return 'p2wpkh'
+    elif len(script) == 46 and script.startswith('a914') and script.endswith('87'):
+        return 'p2sh'
+    return 'p2pkh'
+
+
+def calc_input_weight(kind, compressed=True):
+    """Returns the weight of a signed input, assuming the longest possible
+    signature.
+
+    :param kind: As returned by :func:`~lit.transaction.get_script_kind`.
+    :type kind: ``str``
+    :param compressed: Whether or not P2PKH inputs are spent with a
+                       compressed public key.
+    :type compressed: ``bool``
+    :rtype: ``int``
+    """
+    if kind == 'p2wpkh':
+        return P2WPKH_INPUT_WEIGHT
+    elif kind == 'p2sh':
+        return NESTED_P2WPKH_INPUT_WEIGHT
+    elif compressed:
+        return P2PKH_INPUT_SIZE_COMPRESSED * WITNESS_SCALE_FACTOR
+    return P2PKH_INPUT_SIZE_UNCOMPRESSED * WITNESS_SCALE_FACTOR
+
+
+def calc_txid_bytes(tx):
+    # Witness data is not part of the txid.
+    if len(tx) > 5 and tx[4] == 0:
+        return TxObj(tx).txid
+    return bytes_to_hex(double_sha256(tx)[::-1])
+
+
 def calc_txid(tx_hex):
-    return bytes_to_hex(double_sha256(hex_to_bytes(tx_hex))[::-1])
+    return calc_txid_bytes(hex_to_bytes(tx_hex))
+
+
+def calc_output_size(address):
+    """Returns the serialized size of an output paying to ``address``,
+    judged from its form alone so that no address is decoded.
+
+    :rtype: ``int``
+    """
+    if address[:4].lower() in BECH32_ADDRESS_PREFIXES:
+        # Witness version, program and checksum follow the last "1", five
+        # bits per character.
+        data_len = len(address) - address.rfind('1') - 1
+        return 8 + 1 + 2 + (data_len - 7) * 5 // 8
+
+    # The version byte of a P2SH address fixes its first character.
+    if address[:1] in P2SH_ADDRESS_PREFIXES:
+        return P2SH_OUTPUT_SIZE
+
+    return P2PKH_OUTPUT_SIZE
+
+
+def calc_output_block_size(outputs):
+    """Returns the exact serialized size of ``outputs`` as returned by
+    :func:`~lit.transaction.sanitize_tx_data`, including their count.
+
+    :rtype: ``int``
+    """
+    size = len(int_to_varint(len(outputs)))
+
+    for dest, amount in outputs:
+        if amount:
+            size += calc_output_size(dest)
+        else:
+            script_len = len(dest) + 2
+            size += 8 + len(int_to_varint(script_len)) + script_len
+
+    return size
+
+
+def calc_tx_size(n_in, output_block_size, compressed=True):
+    """Returns the serialized size of a signed P2PKH transaction, assuming
+    every signature is as long as possible so that a fee based on it is
+    never too low. Signatures are occasionally a byte or two shorter.
+
+    :param n_in: The number of inputs.
+    :type n_in: ``int``
+    :param output_block_size: The result of
+                              :func:`~lit.transaction.calc_output_block_size`.
+    :type output_block_size: ``int``
+    :param compressed: Whether or not the inputs are spent with a compressed
+                       public key.
+    :type compressed: ``bool``
+    :rtype: ``int``
+    """
+    input_size = P2PKH_INPUT_SIZE_COMPRESSED if compressed else P2PKH_INPUT_SIZE_UNCOMPRESSED
+
+    return (
+        len(VERSION_1)
+        + len(int_to_varint(n_in))
+        + n_in * input_size
+        + output_block_size
+        + len(LOCK_TIME)
+    )
+
+
+def calc_tx_vsize(unspents, output_block_size, compressed=True):
+    """Returns the virtual size of a signed transaction spending
+    ``unspents``, which for P2PKH inputs only is its size as returned by
+    :func:`~lit.transaction.calc_tx_size`.
+
+    :param unspents: The UTXOs being spent.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    :param output_block_size: The result of
+                              :func:`~lit.transaction.calc_output_block_size`.
+    :type output_block_size: ``int``
+    :param compressed: Whether or not P2PKH inputs are spent with a
+                       compressed public key.
+    :type compressed: ``bool``
+    :rtype: ``int``
+    """
+    weight = calc_tx_size(0, output_block_size) * WITNESS_SCALE_FACTOR
+    weight += (len(int_to_varint(len(unspents))) - 1) * WITNESS_SCALE_FACTOR
+
+    # A wallet's UTXOs share very few scripts.
+    kinds = {}
+    legacy = 0
+
+    for unspent in unspents:
+        script = unspent.script
+
+        if script not in kinds:
+            kind = get_script_kind(script)
+            kinds[script] = calc_input_weight(kind, compressed), kind == 'p2pkh'
+
+        input_weight, is_legacy = kinds[script]
+        weight += input_weight
+        legacy += is_legacy
+
+    # Legacy inputs of a SegWit transaction have an empty witness.
+    if legacy < len(unspents):
+        weight += len(SEGWIT_MARKER) + legacy
+
+    return -(-weight // WITNESS_SCALE_FACTOR)
 
 
 def estimate_tx_fee(n_in, n_out, satoshis, compressed):
@@ -62,17 +726,29 @@ def estimate_tx_fee(n_in, n_out, satoshis, compressed):
     if not satoshis:
         return 0
 
-    estimated_size = (
-        n_in * (148 if compressed else 180)
-        + len(int_to_unknown_bytes(n_in, byteorder='little'))
-        + n_out * 34
-        + len(int_to_unknown_bytes(n_out, byteorder='little'))
-        + 8
+    estimated_size = calc_tx_size(
+        n_in,
+        len(int_to_varint(n_out)) + n_out * P2PKH_OUTPUT_SIZE,
+        compressed
     )
 
     return estimated_size * satoshis
 
 
+def _heaviest_input(scripts, compressed):
+    # Returns the virtual size of the heaviest kind of input spending UTXOs
+    # with the distinct scripts given, and whether or not spending them takes
+    # a SegWit transaction.
+    kinds = {get_script_kind(script) for script in scripts}
+    segwit = bool(kinds - {'p2pkh'})
+
+    input_weight = max(
+        calc_input_weight(kind, compressed) + (segwit and kind == 'p2pkh') for kind in kinds
+    )
+
+    return -(-input_weight // WITNESS_SCALE_FACTOR), segwit
+
+
 def sanitize_tx_data(unspents, outputs, fee, leftover, combine=True, message=None, compressed=True):
 
     outputs = outputs.copy()
@@ -93,32 +769,42 @@ def sanitize_tx_data(unspents, outputs, fee, leftover, combine=True, message=Non
         for message in message_chunks:
             messages.append((message, 0))
 
-    # Include return address in fee estimate.
-    fee = estimate_tx_fee(len(unspents), len(outputs) + len(messages) + 1, fee, compressed)
-    total_out = sum(out[1] for out in outputs) + fee
+    total_amount = sum(out[1] for out in outputs)
 
-    total_in = 0
+    outputs_size = calc_output_block_size(outputs + messages)
+    change_size = calc_output_block_size(outputs + messages + [(leftover, 1)])
 
     if combine:
-        unspents = unspents.copy()
-        total_in += sum(unspent.amount for unspent in unspents)
+        unspents = list(unspents)
+        total_in = sum(unspent.amount for unspent in unspents)
+        changeless = False
+
+        # Include return address in fee estimate.
+        fee = calc_tx_vsize(unspents, change_size, compressed) * fee
 
     else:
-        unspents = sorted(unspents, key=lambda x: x.amount)
+        if not isinstance(unspents, UnspentIndex):
+            unspents = UnspentIndex(unspents)
 
-        index = 0
+        # Selection assumes every input is of the heaviest kind in the pool,
+        # so the exact fee below never exceeds the one selected for.
+        input_size, segwit = _heaviest_input(unspents.scripts, compressed)
 
-        for index, unspent in enumerate(unspents):
-            total_in += unspent.amount
+        base_fee = (calc_tx_size(0, outputs_size) + segwit) * fee
+        input_fee = input_size * fee
+        change_fee = (change_size - outputs_size) * fee
 
-            if total_in >= total_out:
-                break
+        unspents, changeless = unspents.select(total_amount + base_fee, input_fee, change_fee)
+        total_in = sum(unspent.amount for unspent in unspents)
 
-        unspents[:] = unspents[:index + 1]
+        fee = calc_tx_vsize(
+            unspents, outputs_size if changeless else change_size, compressed
+        ) * fee
 
+    total_out = total_amount + fee
     remaining = total_in - total_out
 
-    if remaining > 0:
+    if remaining > 0 and not changeless:
         outputs.append((leftover, remaining))
     elif remaining < 0:
         raise InsufficientFunds('Balance {} is less than {} (including '
@@ -129,20 +815,159 @@ def sanitize_tx_data(unspents, outputs, fee, leftover, combine=True, message=Non
     return unspents, outputs
 
 
-def construct_output_block(outputs):
+def plan_consolidation(unspents, leftover, fee, max_size=MAX_STANDARD_TX_SIZE, compressed=True):
+    """Splits the consolidation of ``unspents`` into as few transactions as
+    possible that each stay within ``max_size`` bytes. UTXOs worth less than
+    the fee needed to spend them are left out.
+
+    :param unspents: The UTXOs to consolidate.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    :param leftover: The address receiving the consolidated funds.
+    :type leftover: ``str``
+    :param fee: The number of satoshi per byte to pay to miners.
+    :type fee: ``int``
+    :param max_size: The largest transaction virtual size allowed, in bytes.
+    :type max_size: ``int``
+    :param compressed: Whether or not the UTXOs belong to a compressed
+                       public key.
+    :type compressed: ``bool``
+    :raises ValueError: If not even one input fits within ``max_size``.
+    :raises InsufficientFunds: If a transaction cannot pay for its own fee.
+    :rtype: :class:`~lit.transaction.ConsolidationPlan`
+    """
+    if not unspents:
+        raise ValueError('Transactions must have at least one unspent.')
+
+    output_size = calc_output_block_size([(leftover, 1)])
+    input_size, segwit = _heaviest_input({unspent.script for unspent in unspents}, compressed)
+    base_size = calc_tx_size(0, output_size) + segwit
 
-    output_block = b''
+    unspents = [unspent for unspent in unspents if unspent.amount > input_size * fee]
+
+    if not unspents:
+        raise ValueError('Transactions must have at least one unspent.')
+
+    # Account for the input count's varint growing past one byte.
+    max_inputs = max(0, (max_size - base_size) // input_size)
+    while max_inputs and (base_size + max_inputs * input_size +
+                          len(int_to_varint(max_inputs)) - 1) > max_size:
+        max_inputs -= 1
+
+    if not max_inputs:
+        raise ValueError('No transaction fits within {} bytes.'.format(max_size))
+
+    # Spread the inputs evenly rather than leaving a small final transaction.
+    n_tx = -(-len(unspents) // max_inputs)
+    per_tx, extra = divmod(len(unspents), n_tx)
+
+    batches = []
+    total_fee = 0
+    total_size = 0
+    start = 0
+
+    for i in range(n_tx):
+        end = start + per_tx + (i < extra)
+        batch = unspents[start:end]
+        start = end
+
+        size = calc_tx_vsize(batch, output_size, compressed)
+        total_in = sum(unspent.amount for unspent in batch)
+        remaining = total_in - size * fee
+
+        if remaining <= 0:
+            raise InsufficientFunds('Balance {} is less than {} (including '
+                                    'fee).'.format(total_in, size * fee))
+
+        batches.append((batch, [(leftover, remaining)]))
+        total_fee += size * fee
+        total_size += size
+
+    return ConsolidationPlan(batches, total_fee, total_size)
+
+
+def calc_cpfp_fee(parents, child_size, fee):
+    """Calculates the fee a child must pay so that it and its unconfirmed
+    parents together pay ``fee`` satoshi per byte, as miners consider them
+    as one package. The child always pays at least :data:`MIN_RELAY_FEE` per
+    byte of its own.
+
+    :param parents: The ``(vsize, fee)`` of each parent.
+    :type parents: ``list`` of ``tuple``
+    :param child_size: The virtual size of the child in bytes.
+    :type child_size: ``int``
+    :param fee: The number of satoshi per byte the package should pay.
+    :type fee: ``int``
+    :rtype: ``int``
+    """
+    package_size = child_size + sum(size for size, _ in parents)
+    parents_fee = sum(parent_fee for _, parent_fee in parents)
+
+    return max(package_size * fee - parents_fee, child_size * MIN_RELAY_FEE)
+
+
+def plan_cpfp(parents, scripts, leftover, fee, compressed=True):
+    """Plans a single child transaction that spends every output paid to
+    ``scripts`` by a queue of unconfirmed parents, paying enough that the
+    parents and the child together pay ``fee`` satoshi per byte. Parent
+    sizes are read exactly from their serialization.
+
+    :param parents: The ``(tx, fee)`` of each parent, where ``tx`` is raw or
+                    in hex form and ``fee`` is the fee it pays in satoshi.
+    :type parents: iterable of ``tuple``
+    :param scripts: The scriptPubKeys of the spending key's outputs, as
+                    returned by :func:`~lit.transaction.public_key_to_scripts`.
+    :type scripts: ``tuple`` of ``bytes``
+    :param leftover: The address receiving the child's output.
+    :type leftover: ``str``
+    :param fee: The number of satoshi per byte the package should pay.
+    :type fee: ``int``
+    :param compressed: Whether or not the key is compressed.
+    :type compressed: ``bool``
+    :raises ValueError: If a parent pays nothing to ``scripts``.
+    :raises InsufficientFunds: If the outputs cannot pay for the child's fee.
+    :returns: The UTXOs and outputs of the child, as returned by
+              :func:`~lit.transaction.sanitize_tx_data`.
+    :rtype: ``tuple``
+    """
+    unspents = []
+    packages = []
+
+    for tx, parent_fee in parents:
+        parsed = deserialize(tx)
+        txid = parsed.txid
+
+        owned = [
+            Unspent(int.from_bytes(txout.amount, 'little'), 0, bytes_to_hex(txout.script),
+                    txid, index)
+            for index, txout in enumerate(parsed.outputs)
+            if txout.script in scripts
+        ]
+
+        if not owned:
+            raise ValueError('Transaction {} pays nothing to this key.'.format(txid))
+
+        unspents.extend(owned)
+        packages.append((parsed.vsize, parent_fee))
+
+    # The child has one output, so its size is known before it is built.
+    child_size = calc_tx_vsize(unspents, calc_output_block_size([(leftover, 1)]), compressed)
+    child_fee = calc_cpfp_fee(packages, child_size, fee)
+
+    return sanitize_tx_data(
+        unspents, [], -(-child_fee // child_size), leftover, combine=True, compressed=compressed
+    )
+
+
+def write_output_block(writer, outputs):
 
     for data in outputs:
         dest, amount = data
 
         # Real recipient
         if amount:
-            script = (OP_DUP + OP_HASH160 + OP_PUSH_20 +
-                      address_to_public_key_hash(dest) +
-                      OP_EQUALVERIFY + OP_CHECKSIG)
+            script = address_to_scriptpubkey(dest)
 
-            output_block += amount.to_bytes(8, byteorder='little')
+            writer.write_uint64(amount)
 
         # Blockchain storage
         else:
@@ -150,91 +975,350 @@ def construct_output_block(outputs):
                       len(dest).to_bytes(1, byteorder='little') +
                       dest)
 
-            output_block += b'\x00\x00\x00\x00\x00\x00\x00\x00'
+            writer.write(b'\x00\x00\x00\x00\x00\x00\x00\x00')
 
-        output_block += int_to_unknown_bytes(len(script), byteorder='little')
-        output_block += script
+        writer.write_varint(len(script))
+        writer.write(script)
 
-    return output_block
+
+def write_input_block(writer, inputs):
+
+    for txin in inputs:
+        writer.write(txin.txid)
+        writer.write(txin.txindex)
+        writer.write(txin.script_len)
+        writer.write(txin.script)
+        writer.write(txin.sequence)
+
+
+def construct_output_block(outputs):
+
+    writer = TxWriter()
+    write_output_block(writer, outputs)
+
+    return writer.getvalue()
 
 
 def construct_input_block(inputs):
 
-    input_block = b''
-    sequence = SEQUENCE
+    writer = TxWriter()
+    write_input_block(writer, inputs)
 
-    for txin in inputs:
-        input_block += (
-            txin.txid +
-            txin.txindex +
-            txin.script_len +
-            txin.script +
-            sequence
-        )
+    return writer.getvalue()
 
-    return input_block
 
+def sign_digests(private_key, digests, workers=None):
+    """Signs signature hashes, optionally spreading the work over a pool of
+    threads. Signatures are always returned in the order of ``digests``.
 
-def create_p2pkh_transaction(private_key, unspents, outputs):
+    :param private_key: The key to sign with, or a list with the key to
+                        sign each digest with.
+    :type private_key: :class:`~lit.wallet.BaseKey` or ``list``
+    :param digests: The signature hashes to sign.
+    :type digests: ``list`` of ``bytes``
+    :param workers: The number of threads to use. By default every digest is
+                    signed in the calling thread.
+    :type workers: ``int``
+    :rtype: ``list`` of ``bytes``
+    """
+    if isinstance(private_key, list):
+        signers = [key.sign for key in private_key]
+    else:
+        signers = [private_key.sign] * len(digests)
+
+    if not workers or workers < 2 or len(digests) < 2:
+        return [sign(digest) for sign, digest in zip(signers, digests)]
+
+    # Contiguous chunks keep the per-task overhead of the pool negligible.
+    pairs = list(zip(signers, digests))
+    size = -(-len(pairs) // workers)
+    chunks = [pairs[i:i + size] for i in range(0, len(pairs), size)]
+
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        signed = executor.map(lambda chunk: [sign(digest) for sign, digest in chunk], chunks)
+        return [signature for chunk in signed for signature in chunk]
+
+
+def create_p2pkh_transaction(private_key, unspents, outputs, workers=None, as_bytes=False,
+                             replaceable=False):
+    """Creates a signed transaction spending UTXOs of ``private_key``. P2PKH
+    UTXOs are signed with the legacy signature hash, and P2WPKH UTXOs, bare
+    or wrapped in P2SH, with the BIP143 one. The transaction is serialized
+    with witness data if any UTXO is SegWit.
+
+    :param private_key: The key owning every UTXO.
+    :type private_key: :class:`~lit.wallet.BaseKey`
+    :param unspents: The UTXOs to spend. Their ``script`` decides how each
+                     is spent, and SegWit UTXOs must have their ``amount``.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    :param outputs: The ``(destination, satoshi)`` outputs, as returned by
+                    :func:`~lit.transaction.sanitize_tx_data`.
+    :type outputs: ``list`` of ``tuple``
+    :param workers: The number of threads used to sign inputs.
+    :type workers: ``int``
+    :param as_bytes: Whether or not to return bytes instead of hex.
+    :type as_bytes: ``bool``
+    :param replaceable: Whether or not to signal that the transaction may be
+                        replaced by one paying a higher fee (BIP125).
+    :type replaceable: ``bool``
+    :raises ValueError: If a SegWit UTXO does not belong to the key.
+    :rtype: ``str`` or ``bytes``
+    """
+    return create_multikey_transaction([(private_key, unspents)], outputs, workers, as_bytes,
+                                       replaceable)
+
+
+def create_multikey_transaction(groups, outputs, workers=None, as_bytes=False,
+                                replaceable=False):
+    """Creates a signed transaction spending UTXOs of several keys, signing
+    each input with the key owning it. Inputs are spent as described in
+    :func:`~lit.transaction.create_p2pkh_transaction`.
+
+    :param groups: The ``(private_key, unspents)`` of each key.
+    :type groups: ``list`` of ``tuple``
+    :param outputs: The ``(destination, satoshi)`` outputs, as returned by
+                    :func:`~lit.transaction.sanitize_tx_data`.
+    :type outputs: ``list`` of ``tuple``
+    :param workers: The number of threads used to sign inputs.
+    :type workers: ``int``
+    :param as_bytes: Whether or not to return bytes instead of hex.
+    :type as_bytes: ``bool``
+    :param replaceable: Whether or not to signal that the transaction may be
+                        replaced by one paying a higher fee (BIP125).
+    :type replaceable: ``bool``
+    :raises ValueError: If a SegWit UTXO does not belong to its key.
+    :rtype: ``str`` or ``bytes``
+    """
+    return sign_transaction_parts(
+        groups, len(outputs), construct_output_block(outputs), workers, as_bytes,
+        RBF_SEQUENCE if replaceable else SEQUENCE
+    )
 
-    public_key = private_key.public_key
-    public_key_len = len(public_key).to_bytes(1, byteorder='little')
 
+def sign_transaction_parts(groups, n_outputs, output_block, workers=None, as_bytes=False,
+                           sequence=SEQUENCE):
+    """Signs a transaction whose outputs are already serialized, as done by
+    :func:`~lit.transaction.create_multikey_transaction`.
+
+    :param groups: The ``(private_key, unspents)`` of each key.
+    :type groups: ``list`` of ``tuple``
+    :param n_outputs: The number of outputs.
+    :type n_outputs: ``int``
+    :param output_block: The serialized outputs, without their count.
+    :type output_block: ``bytes``
+    :param workers: The number of threads used to sign inputs.
+    :type workers: ``int``
+    :param as_bytes: Whether or not to return bytes instead of hex.
+    :type as_bytes: ``bool``
+    :param sequence: The sequence of every input.
+    :type sequence: ``bytes``
+    :raises ValueError: If a SegWit UTXO does not belong to its key.
+    :rtype: ``str`` or ``bytes``
+    """
     version = VERSION_1
     lock_time = LOCK_TIME
-    sequence = SEQUENCE
-    hash_type = HASH_TYPE
-    input_count = int_to_unknown_bytes(len(unspents), byteorder='little')
-    output_count = int_to_unknown_bytes(len(outputs), byteorder='little')
-    output_block = construct_output_block(outputs)
+    output_count = int_to_varint(n_outputs)
 
     # Optimize for speed, not memory, by pre-computing values.
     inputs = []
-    for unspent in unspents:
-        script = hex_to_bytes(unspent.script)
-        script_len = int_to_unknown_bytes(len(script), byteorder='little')
-        txid = hex_to_bytes(unspent.txid)[::-1]
-        txindex = unspent.txindex.to_bytes(4, byteorder='little')
-
-        inputs.append(TxIn(script, script_len, txid, txindex))
-
-    for i, txin in enumerate(inputs):
-
-        hashed = sha256(
-            version +
-            input_count +
-            b''.join(ti.txid + ti.txindex + OP_0 + sequence
-                     for ti in islice(inputs, i)) +
-            txin.txid +
-            txin.txindex +
-            txin.script_len +
-            txin.script +
-            sequence +
-            b''.join(ti.txid + ti.txindex + OP_0 + sequence
-                     for ti in islice(inputs, i + 1, None)) +
-            output_count +
-            output_block +
-            lock_time +
-            hash_type
-        )
+    kinds = []
+    keys = []
+    amounts = []
+    key_data = {}
+
+    for private_key, unspents in groups:
+        public_key = private_key.public_key
+
+        if public_key not in key_data:
+            key_data[public_key] = (
+                len(public_key).to_bytes(1, byteorder='little') + public_key,
+                public_key_to_scripts(public_key)
+            )
+
+        scripts = key_data[public_key][1]
+
+        for unspent in unspents:
+            script = hex_to_bytes(unspent.script)
+            script_len = int_to_varint(len(script))
+            txid = hex_to_bytes(unspent.txid)[::-1]
+            txindex = unspent.txindex.to_bytes(4, byteorder='little')
+            kind = get_script_kind(unspent.script)
+
+            if kind != 'p2pkh' and script not in scripts[1:]:
+                raise ValueError('Unspent {}:{} cannot be spent by this key.'.format(
+                    unspent.txid, unspent.txindex
+                ))
+
+            inputs.append(TxIn(script, script_len, txid, txindex, sequence))
+            kinds.append(kind)
+            keys.append(private_key)
+            amounts.append(unspent.amount)
+
+    input_count = int_to_varint(len(inputs))
+    segwit = any(kind != 'p2pkh' for kind in kinds)
+
+    if not segwit:
+        sighash = LegacySighash(inputs, output_block, n_outputs, version, lock_time)
+        digests = list(sighash.digests())
+    else:
+        legacy = LegacySighash(inputs, output_block, n_outputs, version, lock_time)
+        bip143 = SegwitSighash(inputs, output_block, version, lock_time)
 
-        signature = private_key.sign(hashed) + b'\x01'
+        digests = [
+            legacy.digest(i) if kind == 'p2pkh' else
+            bip143.digest(i, key_data[key.public_key][1][0], amount)
+            for i, (kind, key, amount) in enumerate(zip(kinds, keys, amounts))
+        ]
 
-        script_sig = (
-            len(signature).to_bytes(1, byteorder='little') +
-            signature +
-            public_key_len +
-            public_key
-        )
+    signatures = sign_digests(keys, digests, workers)
+
+    for txin, kind, key, signature in zip(inputs, kinds, keys, signatures):
+
+        public_key_push, scripts = key_data[key.public_key]
+
+        signature += b'\x01'
+        signature_push = len(signature).to_bytes(1, byteorder='little') + signature
+
+        if kind == 'p2pkh':
+            script_sig = signature_push + public_key_push
+            txin.witness = OP_0
+        else:
+            script_sig = b''
+            if kind == 'p2sh':
+                script_sig = len(scripts[1]).to_bytes(1, byteorder='little') + scripts[1]
+            txin.witness = b'\x02' + signature_push + public_key_push
 
         txin.script = script_sig
-        txin.script_len = int_to_unknown_bytes(len(script_sig), byteorder='little')
-
-    return bytes_to_hex(
-        version +
-        input_count +
-        construct_input_block(inputs) +
-        output_count +
-        output_block +
-        lock_time
+        txin.script_len = int_to_varint(len(script_sig))
+
+    writer = TxWriter()
+    writer.write(version)
+    if segwit:
+        writer.write(SEGWIT_MARKER)
+    writer.write(input_count)
+    write_input_block(writer, inputs)
+    writer.write(output_count)
+    writer.write(output_block)
+    if segwit:
+        for txin in inputs:
+            writer.write(txin.witness)
+    writer.write(lock_time)
+
+    if as_bytes:
+        return writer.getvalue()
+
+    return bytes_to_hex(writer.getvalue())
+
+
+def bump_fee(private_key, tx, unspents, fee, workers=None, as_bytes=False):
+    """Creates a replacement for a transaction of ``private_key`` paying
+    ``fee`` satoshi per byte, taking the extra fee from its change output.
+    The inputs and every other output are reused as parsed, so no address
+    is decoded again and nothing but the signatures is recomputed. The
+    replacement signals replaceability too, so it can be bumped again.
+
+    :param private_key: The key owning every input and the change output.
+    :type private_key: :class:`~lit.wallet.BaseKey`
+    :param tx: The transaction to replace, raw or in hex form. It must
+               signal replaceability.
+    :type tx: ``bytes`` or ``str``
+    :param unspents: The UTXOs spent by ``tx``, which supply the amounts its
+                     serialization lacks. Other UTXOs are ignored.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    :param fee: The number of satoshi per byte to pay to miners. The fee is
+                raised further if needed to pay at least the fee of ``tx``
+                plus :data:`INCREMENTAL_RELAY_FEE` per byte, as relays
+                require.
+    :type fee: ``int``
+    :param workers: The number of threads used to sign inputs.
+    :type workers: ``int``
+    :param as_bytes: Whether or not to return bytes instead of hex.
+    :type as_bytes: ``bool``
+    :raises ValueError: If ``tx`` does not signal replaceability, has no
+                        change output or spends a UTXO not in ``unspents``.
+    :raises InsufficientFunds: If the change cannot cover the higher fee.
+    :rtype: ``str`` or ``bytes``
+    """
+    parsed = deserialize(tx)
+
+    if not parsed.replaceable:
+        raise ValueError('Transaction {} does not signal replaceability.'.format(parsed.txid))
+
+    by_outpoint = {(unspent.txid, unspent.txindex): unspent for unspent in unspents}
+    spent = []
+
+    for txin in parsed.inputs:
+        outpoint = (bytes_to_hex(bytes(txin.txid)[::-1]), int.from_bytes(txin.txindex, 'little'))
+
+        try:
+            spent.append(by_outpoint[outpoint])
+        except KeyError:
+            raise ValueError('Unspent {}:{} spent by the transaction was not '
+                             'given.'.format(*outpoint)) from None
+
+    scripts = public_key_to_scripts(private_key.public_key)
+    outputs = parsed.outputs
+    amounts = [int.from_bytes(txout.amount, 'little') for txout in outputs]
+
+    # The last output paying back to the key is the change.
+    change_index = None
+    for index, txout in enumerate(outputs):
+        if txout.script in scripts:
+            change_index = index
+
+    if change_index is None:
+        raise ValueError('Transaction {} has no change output to take the fee '
+                         'from.'.format(parsed.txid))
+
+    old_fee = sum(unspent.amount for unspent in spent) - sum(amounts)
+
+    # Only the change amount differs, so the size is known up front.
+    output_block_size = len(int_to_varint(len(outputs))) + sum(
+        8 + len(txout.script_len) + len(txout.script) for txout in outputs
+    )
+    size = calc_tx_vsize(spent, output_block_size, private_key.is_compressed())
+    new_fee = max(size * fee, old_fee + size * INCREMENTAL_RELAY_FEE)
+    change = amounts[change_index] - (new_fee - old_fee)
+
+    if change <= 0:
+        raise InsufficientFunds('Change {} is less than the {} needed to raise the '
+                                'fee.'.format(amounts[change_index], new_fee - old_fee))
+
+    writer = TxWriter()
+    for index, txout in enumerate(outputs):
+        if index == change_index:
+            writer.write_uint64(change)
+        else:
+            writer.write(txout.amount)
+        writer.write(txout.script_len)
+        writer.write(txout.script)
+
+    return sign_transaction_parts(
+        [(private_key, spent)], len(outputs), writer.getvalue(), workers, as_bytes, RBF_SEQUENCE
     )
+
+
+def create_consolidation(private_key, plan, workers=None):
+    """Signs every transaction of a consolidation plan, several at a time.
+
+    :param private_key: The key owning the consolidated UTXOs.
+    :type private_key: :class:`~lit.wallet.BaseKey`
+    :param plan: The result of :func:`~lit.transaction.plan_consolidation`.
+    :type plan: :class:`~lit.transaction.ConsolidationPlan`
+    :param workers: The number of threads to use. By default one per CPU,
+                    and never more than there are transactions.
+    :type workers: ``int``
+    :returns: The signed transactions as hex, in the order of the plan.
+    :rtype: ``list`` of ``str``
+    """
+    workers = min(len(plan), workers or os.cpu_count() or 1)
+
+    if workers < 2:
+        return [create_p2pkh_transaction(private_key, unspents, outputs)
+                for unspents, outputs in plan.batches]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda batch: create_p2pkh_transaction(private_key, *batch),
+            plan.batches
+        ))
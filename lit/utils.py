@@ -1,5 +1,8 @@
 import decimal
 from binascii import hexlify
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
 
 class Decimal(decimal.Decimal):
@@ -11,11 +14,80 @@ def chunk_data(data, size):
     return (data[i:i + size] for i in range(0, len(data), size))
 
 
+def map_chunks(func, items, workers, chunksize, initializer=None, initargs=(),
+               executor_class=ProcessPoolExecutor):
+    """Applies ``func`` to lists of up to ``chunksize`` items on a pool of
+    workers and yields each result in order. Items are read as they are
+    needed, with at most two chunks per worker in flight, so a stream of
+    any length uses bounded memory.
+
+    :param func: A function taking a list of items and returning a list of
+                 results. It must be picklable for a pool of processes.
+    :param items: The items.
+    :type items: iterable
+    :param workers: The number of workers.
+    :type workers: ``int``
+    :param chunksize: The number of items handed to a worker at a time.
+    :type chunksize: ``int``
+    :param initializer: Called with ``initargs`` once in each worker.
+    :param executor_class: The kind of pool, processes by default.
+    :type executor_class: :class:`~concurrent.futures.Executor` subclass
+    :rtype: generator
+    """
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunksize)), [])
+
+    with executor_class(max_workers=workers, initializer=initializer,
+                        initargs=initargs) as executor:
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+
+            if len(pending) > 2 * workers:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
 def int_to_unknown_bytes(num, byteorder='big'):
     """Converts an int to the least number of bytes as possible."""
     return num.to_bytes((num.bit_length() + 7) // 8 or 1, byteorder)
 
 
+def int_to_varint(num):
+    """Converts an int to a variable length integer as used for counts and
+    script lengths in transactions."""
+    if num < 0xfd:
+        return num.to_bytes(1, 'little')
+    elif num <= 0xffff:
+        return b'\xfd' + num.to_bytes(2, 'little')
+    elif num <= 0xffffffff:
+        return b'\xfe' + num.to_bytes(4, 'little')
+    return b'\xff' + num.to_bytes(8, 'little')
+
+
+def read_varint(data, offset=0):
+    """Reads a variable length integer from ``data`` at ``offset`` and
+    returns it along with the offset of the first byte after it."""
+    try:
+        prefix = data[offset]
+    except IndexError:
+        raise ValueError('Unexpected end of data at offset {}.'.format(offset)) from None
+
+    if prefix < 0xfd:
+        return prefix, offset + 1
+
+    size = 2 if prefix == 0xfd else 4 if prefix == 0xfe else 8
+    start, end = offset + 1, offset + 1 + size
+
+    if end > len(data):
+        raise ValueError('Unexpected end of data at offset {}.'.format(offset))
+
+    return int.from_bytes(data[start:end], 'little'), end
+
+
 def bytes_to_hex(bytestr, upper=False):
     hexed = hexlify(bytestr).decode()
     return hexed.upper() if upper else hexed
@@ -0,0 +1,197 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from lit.format import verify_sig
+from lit.transaction import (
+    LegacySighash, SegwitSighash, deserialize, get_script_kind, public_key_to_scripts
+)
+from lit.utils import bytes_to_hex, hex_to_bytes, map_chunks, read_varint
+
+# The only signature hash type lit signs with.
+SIGHASH_ALL = 0x01
+
+OP_PUSHDATA1 = 0x4c
+
+
+def read_pushes(script):
+    """Splits a script made only of data pushes, such as the scriptSig of a
+    P2PKH input, into the data pushed.
+
+    :param script: The script.
+    :type script: ``bytes``
+    :returns: The data pushed, or ``None`` if the script does anything but
+              push data.
+    :rtype: ``list`` of ``bytes``
+    """
+    pushes = []
+    offset = 0
+
+    while offset < len(script):
+        opcode = script[offset]
+        offset += 1
+
+        if opcode == OP_PUSHDATA1 and offset < len(script):
+            opcode = script[offset]
+            offset += 1
+        elif not 0 < opcode < OP_PUSHDATA1:
+            return None
+
+        if offset + opcode > len(script):
+            return None
+
+        pushes.append(bytes(script[offset:offset + opcode]))
+        offset += opcode
+
+    return pushes
+
+
+def read_witness(witness):
+    """Splits the serialized witness of an input into its items.
+
+    :param witness: The witness, starting with its item count.
+    :type witness: ``bytes``
+    :rtype: ``list`` of ``bytes``
+    """
+    n_items, offset = read_varint(witness)
+    items = []
+
+    for _ in range(n_items):
+        item_len, offset = read_varint(witness, offset)
+        items.append(bytes(witness[offset:offset + item_len]))
+        offset += item_len
+
+    return items
+
+
+def verify_inputs(tx, unspents):
+    """Checks the signature of every input of a transaction spending P2PKH,
+    P2WPKH or P2SH-P2WPKH outputs, as signed by lit. Each input's signature
+    hash is recomputed from the output it spends, and its public key must
+    match that output's script.
+
+    :param tx: The signed transaction, raw or in hex form.
+    :type tx: ``bytes`` or ``str``
+    :param unspents: The outputs spent by ``tx``, supplying each input's
+                     script and amount. Other UTXOs are ignored.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    :raises ValueError: If an input spends a UTXO not in ``unspents``.
+    :returns: Whether or not each input is validly signed, in order.
+    :rtype: ``list`` of ``bool``
+    """
+    parsed = deserialize(tx)
+    raw = parsed.to_bytes()
+    inputs = parsed.inputs
+    outputs = parsed.outputs
+
+    by_outpoint = {(unspent.txid, unspent.txindex): unspent for unspent in unspents}
+    spent = []
+
+    for txin in inputs:
+        outpoint = (bytes_to_hex(bytes(txin.txid)[::-1]), int.from_bytes(txin.txindex, 'little'))
+
+        try:
+            spent.append(by_outpoint[outpoint])
+        except KeyError:
+            raise ValueError('Unspent {}:{} spent by the transaction was not '
+                             'given.'.format(*outpoint)) from None
+
+    version = raw[:4]
+    lock_time = raw[-4:]
+    output_block = b''.join(
+        field for txout in outputs for field in (txout.amount, txout.script_len, txout.script)
+    )
+
+    legacy = LegacySighash(inputs, output_block, len(outputs), version, lock_time)
+    bip143 = None
+
+    # Inputs usually share a few public keys.
+    key_scripts = {}
+    results = []
+
+    for index, (txin, unspent) in enumerate(zip(inputs, spent)):
+        script = hex_to_bytes(unspent.script)
+        kind = get_script_kind(unspent.script)
+
+        if kind == 'p2pkh':
+            pushes = read_pushes(txin.script)
+        else:
+            pushes = read_witness(txin.witness) if txin.witness else None
+
+        if not pushes or len(pushes) != 2 or not pushes[0] or pushes[0][-1] != SIGHASH_ALL:
+            results.append(False)
+            continue
+
+        signature, public_key = pushes[0][:-1], pushes[1]
+        scripts = key_scripts.get(public_key)
+        if scripts is None:
+            scripts = key_scripts[public_key] = public_key_to_scripts(public_key)
+
+        if kind == 'p2pkh':
+            valid = script == scripts[0]
+            if valid:
+                digest = legacy.digest(index, script)
+        else:
+            if len(scripts) == 1:
+                valid = False
+            elif kind == 'p2wpkh':
+                valid = script == scripts[1] and not txin.script
+            else:
+                valid = script == scripts[2] and read_pushes(txin.script) == [scripts[1]]
+
+            if valid:
+                if bip143 is None:
+                    bip143 = SegwitSighash(inputs, output_block, version, lock_time)
+                digest = bip143.digest(index, scripts[0], unspent.amount)
+
+        if valid:
+            try:
+                valid = verify_sig(signature, digest, public_key)
+            # Raised for malformed signatures and public keys.
+            except ValueError:
+                valid = False
+
+        results.append(valid)
+
+    return results
+
+
+def verify_transaction(tx, unspents):
+    """Checks the signature of every input of a transaction, as described
+    in :func:`~lit.verify.verify_inputs`.
+
+    :param tx: The signed transaction, raw or in hex form.
+    :type tx: ``bytes`` or ``str``
+    :param unspents: The outputs spent by ``tx``.
+    :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+    :raises ValueError: If an input spends a UTXO not in ``unspents``.
+    :returns: ``True`` if every input is validly signed, ``False`` otherwise.
+    :rtype: ``bool``
+    """
+    return all(verify_inputs(tx, unspents))
+
+
+def verify_transactions(transactions, workers=None):
+    """Checks many transactions on a pool of threads, such as every
+    transaction signers produce before it is broadcast, so auditing can run
+    alongside sending.
+
+    :param transactions: The ``(tx, unspents)`` of each transaction.
+    :type transactions: iterable of ``tuple``
+    :param workers: The number of threads to use. By default every
+                    transaction is checked in the calling thread.
+    :type workers: ``int``
+    :raises ValueError: If an input spends a UTXO not given with it.
+    :returns: Whether or not each transaction is validly signed, in order.
+    :rtype: generator of ``bool``
+    """
+    if not workers or workers < 2:
+        for tx, unspents in transactions:
+            yield verify_transaction(tx, unspents)
+        return
+
+    # Transactions are read as threads free up rather than all at once.
+    yield from map_chunks(_verify_transactions, transactions, workers, 1,
+                          executor_class=ThreadPoolExecutor)
+
+
+def _verify_transactions(transactions):
+    return [verify_transaction(tx, unspents) for tx, unspents in transactions]
@@ -1,13 +1,23 @@
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 from lit.crypto import ECPrivateKey
 from lit.curve import Point
 from lit.format import (
-    bytes_to_wif, public_key_to_address, public_key_to_coords, wif_to_bytes
+    bytes_to_wif, public_key_to_address, public_key_to_bech32_address,
+    public_key_to_coords, public_key_to_segwit_address, wif_to_bytes
 )
+from lit.ledger import UnspentLedger
 from lit.network import NetworkAPI, get_fee_cached, satoshi_to_currency_cached
 from lit.network.meta import Unspent
-from lit.transaction import calc_txid, create_p2pkh_transaction, sanitize_tx_data
+from lit.offline import prepared_from_bytes, prepared_to_bytes
+from lit.transaction import (
+    MAX_STANDARD_TX_SIZE, bump_fee, calc_txid_bytes, create_consolidation,
+    create_p2pkh_transaction, plan_consolidation, plan_cpfp, public_key_to_scripts,
+    sanitize_tx_data
+)
+from lit.utils import bytes_to_hex, hex_to_bytes, map_chunks
 
 
 def wif_to_key(wif):
@@ -25,6 +35,43 @@ def wif_to_key(wif):
             return PrivateKeyTestnet(wif)
 
 
+def _fetch_unspents(key, get_unspent):
+    # Returns the UTXOs of every address of the key, fetched concurrently,
+    # and the scripts of SegWit addresses the API could not look up. Only
+    # a failure for the legacy address is fatal, as it was before SegWit.
+    if not key.is_compressed():
+        return get_unspent(key.address), set()
+
+    addresses = (key.address, key.bech32_address, key.segwit_address)
+
+    with ThreadPoolExecutor(max_workers=len(addresses)) as executor:
+        futures = [executor.submit(get_unspent, address) for address in addresses]
+
+    fetched = futures[0].result()
+    failed = set()
+
+    for future, script in zip(futures[1:], public_key_to_scripts(key.public_key)[1:]):
+        try:
+            fetched += future.result()
+        except ConnectionError:
+            failed.add(bytes_to_hex(script))
+
+    return fetched, failed
+
+
+# The key of a signing pool process, set once when the process starts.
+_signing_key = None
+
+
+def _init_signer(wif):
+    global _signing_key
+    _signing_key = wif_to_key(wif)
+
+
+def _sign_prepared(transactions):
+    return [_signing_key.sign_transaction(tx_data) for tx_data in transactions]
+
+
 class BaseKey:
     """This class represents a point on the elliptic curve secp256k1 and
     provides all necessary cryptographic functionality. You shouldn't use
@@ -136,11 +183,15 @@ class PrivateKey(BaseKey):
         super().__init__(wif=wif)
 
         self._address = None
+        self._segwit_address = None
+        self._bech32_address = None
 
         self.balance = 0
         self.unspents = []
         self.transactions = []
 
+        self._ledger = UnspentLedger()
+
     @property
     def address(self):
         """The public address you share with others to receive funds."""
@@ -148,6 +199,24 @@ class PrivateKey(BaseKey):
             self._address = public_key_to_address(self._public_key, version='main')
         return self._address
 
+    @property
+    def segwit_address(self):
+        """The P2SH-wrapped SegWit address you share with others to receive
+        funds that are cheaper to spend, or ``None`` if the public key is
+        not compressed."""
+        if self._segwit_address is None and self.is_compressed():
+            self._segwit_address = public_key_to_segwit_address(self._public_key, version='main')
+        return self._segwit_address
+
+    @property
+    def bech32_address(self):
+        """The native SegWit address you share with others to receive funds
+        that are cheapest to spend, or ``None`` if the public key is not
+        compressed."""
+        if self._bech32_address is None and self.is_compressed():
+            self._bech32_address = public_key_to_bech32_address(self._public_key, version='main')
+        return self._bech32_address
+
     def to_wif(self):
         return bytes_to_wif(
             self._pk.secret,
@@ -177,11 +246,18 @@ class PrivateKey(BaseKey):
         return self.balance_as(currency)
 
     def get_unspents(self):
-        """Fetches all available unspent transaction outputs.
+        """Fetches all available unspent transaction outputs of
+        :attr:`address`, :attr:`segwit_address` and :attr:`bech32_address`,
+        all at once. If an API cannot look up the SegWit addresses, the UTXOs
+        already known for them are kept.
 
+        :raises ConnectionError: If the UTXOs of :attr:`address` cannot be
+                                 fetched.
         :rtype: ``list`` of :class:`~lit.network.meta.Unspent`
         """
-        self.unspents[:] = NetworkAPI.get_unspent(self.address)
+        fetched, failed = _fetch_unspents(self, NetworkAPI.get_unspent)
+
+        self._ledger.sync(self.unspents, fetched, failed)
         self.balance = sum(unspent.amount for unspent in self.unspents)
         return self.unspents
 
@@ -193,9 +269,18 @@ class PrivateKey(BaseKey):
         self.transactions[:] = NetworkAPI.get_transactions(self.address)
         return self.transactions
 
+    def _apply_transaction(self, tx):
+        # Spend the inputs and add our change locally so that the next
+        # transaction can be built without fetching unspents again.
+        self._ledger.apply(self.unspents, tx, public_key_to_scripts(self._public_key))
+        self.balance = sum(unspent.amount for unspent in self.unspents)
+
     def create_transaction(self, outputs, fee=None, leftover=None, combine=True,
-                           message=None, unspents=None):  # pragma: no cover
-        """Creates a signed P2PKH transaction.
+                           message=None, unspents=None, workers=None, as_bytes=False,
+                           replaceable=False):  # pragma: no cover
+        """Creates a signed transaction. UTXOs of :attr:`segwit_address` and
+        :attr:`bech32_address` are spent as SegWit inputs, which lowers the
+        fee.
 
         :param outputs: A sequence of outputs you wish to send in the form
                         ``(destination, amount, currency)``. The amount can
@@ -223,10 +308,26 @@ class PrivateKey(BaseKey):
         :param unspents: The UTXOs to use as the inputs. By default Bit will
                          communicate with the blockchain itself.
         :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
-        :returns: The signed transaction as hex.
-        :rtype: ``str``
+        :param workers: The number of threads used to sign inputs. By default
+                        all inputs are signed in the calling thread.
+        :type workers: ``int``
+        :param as_bytes: Whether or not to return the raw transaction bytes
+                         instead of hex.
+        :type as_bytes: ``bool``
+        :param replaceable: Whether or not to signal that the transaction may
+                            be replaced by one paying a higher fee (BIP125),
+                            so that its fee can be bumped later.
+        :type replaceable: ``bool``
+        :returns: The signed transaction as hex, or as bytes if ``as_bytes``
+                  is set.
+        :rtype: ``str`` or ``bytes``
         """
 
+        if not unspents and not combine:
+            # Input order only matters when combining, so otherwise select
+            # from the index the ledger keeps instead of building one per call.
+            unspents = self._ledger.index(self.unspents)
+
         unspents, outputs = sanitize_tx_data(
             unspents or self.unspents,
             outputs,
@@ -237,14 +338,19 @@ class PrivateKey(BaseKey):
             compressed=self.is_compressed()
         )
 
-        return create_p2pkh_transaction(self, unspents, outputs)
+        return create_p2pkh_transaction(self, unspents, outputs, workers=workers,
+                                        as_bytes=as_bytes, replaceable=replaceable)
 
-    def send(self, outputs, fee=None, leftover=None, combine=True,
-             message=None, unspents=None):  # pragma: no cover
+    def send(self, outputs, fee=None, leftover=None, combine=None,
+             message=None, unspents=None, workers=None, leases=None, replaceable=False):  # pragma: no cover
         """Creates a signed P2PKH transaction and attempts to broadcast it on
         the blockchain. This accepts the same arguments as
         :func:`~lit.PrivateKey.create_transaction`.
 
+        The UTXOs it spends are removed from ``unspents`` and any change is
+        added to it as unconfirmed right away, so further transactions can
+        be sent without fetching unspents again.
+
         :param outputs: A sequence of outputs you wish to send in the form
                         ``(destination, amount, currency)``. The amount can
                         be either an int, float, or string as long as it is
@@ -262,7 +368,8 @@ class PrivateKey(BaseKey):
         :type leftover: ``str``
         :param combine: Whether or not Bit should use all available UTXOs to
                         make future transactions smaller and therefore reduce
-                        fees. By default Bit will consolidate UTXOs.
+                        fees. By default Bit will consolidate UTXOs, unless
+                        ``leases`` is given.
         :type combine: ``bool``
         :param message: A message to include in the transaction. This will be
                         stored in the blockchain forever. Due to size limits,
@@ -271,21 +378,177 @@ class PrivateKey(BaseKey):
         :param unspents: The UTXOs to use as the inputs. By default Bit will
                          communicate with the blockchain itself.
         :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param workers: The number of threads used to sign inputs. By default
+                        all inputs are signed in the calling thread.
+        :type workers: ``int``
+        :param leases: Shared with other senders using the same key, so that
+                       each is given different UTXOs. The leases are released
+                       if the transaction cannot be created or broadcast.
+                       UTXOs are not combined by default then, as every
+                       sender would try to lease all of them.
+        :type leases: :class:`~lit.ledger.LeaseStore`
+        :param replaceable: Whether or not to signal that the transaction may
+                            be replaced by one paying a higher fee (BIP125).
+        :type replaceable: ``bool``
         :returns: The transaction ID.
         :rtype: ``str``
         """
 
-        tx_hex = self.create_transaction(
-            outputs, fee=fee, leftover=leftover, combine=combine, message=message, unspents=unspents
+        if combine is None:
+            combine = leases is None
+
+        if leases is None:
+            tx = self.create_transaction(
+                outputs, fee=fee, leftover=leftover, combine=combine, message=message,
+                unspents=unspents, workers=workers, as_bytes=True, replaceable=replaceable
+            )
+
+            NetworkAPI.broadcast_tx(tx)
+
+        else:
+            with leases.reserve(
+                unspents or self.unspents,
+                outputs,
+                fee or get_fee_cached(),
+                leftover or self.address,
+                combine=combine,
+                message=message,
+                compressed=self.is_compressed()
+            ) as reservation:
+                tx = create_p2pkh_transaction(
+                    self, reservation.unspents, reservation.outputs, workers=workers, as_bytes=True,
+                    replaceable=replaceable
+                )
+
+                NetworkAPI.broadcast_tx(tx)
+
+        self._apply_transaction(tx)
+
+        return calc_txid_bytes(tx)
+
+    def bump_fee(self, tx, fee=None, unspents=None, workers=None):  # pragma: no cover
+        """Replaces a transaction sent with ``replaceable=True`` that has not
+        confirmed with one paying a higher fee, taken from its change, and
+        attempts to broadcast it on the blockchain. The replacement is built
+        by :func:`~lit.transaction.bump_fee` and can be bumped again.
+
+        :param tx: The transaction to replace, raw or in hex form.
+        :type tx: ``bytes`` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Lit will poll `<https://bitcoinfees.earn.com>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param unspents: The UTXOs spent by ``tx``. By default those this key
+                         spent locally are used.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param workers: The number of threads used to sign inputs.
+        :type workers: ``int``
+        :returns: The ID of the replacement transaction.
+        :rtype: ``str``
+        """
+        if isinstance(tx, str):
+            tx = hex_to_bytes(tx)
+
+        replacement = bump_fee(
+            self, tx, unspents or self._ledger.spent(), fee or get_fee_cached(),
+            workers=workers, as_bytes=True
+        )
+
+        NetworkAPI.broadcast_tx(replacement)
+
+        self._ledger.replace(self.unspents, tx, replacement, public_key_to_scripts(self._public_key))
+        self.balance = sum(unspent.amount for unspent in self.unspents)
+
+        return calc_txid_bytes(replacement)
+
+    def cpfp(self, parents, fee=None, leftover=None, workers=None):  # pragma: no cover
+        """Accelerates unconfirmed transactions paying this key by spending
+        their outputs in one child paying a high fee (child pays for parent),
+        and attempts to broadcast it on the blockchain. The child is planned
+        by :func:`~lit.transaction.plan_cpfp`.
+
+        :param parents: The ``(tx, fee)`` of each stuck transaction, where
+                        ``tx`` is raw or in hex form and ``fee`` is the fee
+                        it pays in satoshi.
+        :type parents: iterable of ``tuple``
+        :param fee: The number of satoshi per byte the parents and the child
+                    should pay together. By default Lit will poll
+                    `<https://bitcoinfees.earn.com>`_ and use a fee that will
+                    allow the transactions to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination of the child's output. By default
+                         it pays back to :attr:`address`.
+        :type leftover: ``str``
+        :param workers: The number of threads used to sign inputs.
+        :type workers: ``int``
+        :returns: The ID of the child transaction.
+        :rtype: ``str``
+        """
+        unspents, outputs = plan_cpfp(
+            parents,
+            public_key_to_scripts(self._public_key),
+            leftover or self.address,
+            fee or get_fee_cached(),
+            compressed=self.is_compressed()
+        )
+
+        tx = create_p2pkh_transaction(self, unspents, outputs, workers=workers, as_bytes=True)
+
+        NetworkAPI.broadcast_tx(tx)
+
+        self._apply_transaction(tx)
+
+        return calc_txid_bytes(tx)
+
+    def consolidate(self, fee=None, leftover=None, max_size=MAX_STANDARD_TX_SIZE,
+                    unspents=None, workers=None):  # pragma: no cover
+        """Consolidates UTXOs into as few transactions as fit within
+        ``max_size`` bytes each, signs them concurrently and attempts to
+        broadcast them on the blockchain. UTXOs worth less than the fee
+        needed to spend them are left untouched.
+
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Lit will poll `<https://bitcoinfees.earn.com>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the consolidated
+                         funds. By default Lit will send them to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param max_size: The largest size of each transaction in bytes.
+        :type max_size: ``int``
+        :param unspents: The UTXOs to consolidate. By default Lit will
+                         communicate with the blockchain itself.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param workers: The number of threads used to sign transactions.
+        :type workers: ``int``
+        :returns: The transaction IDs, in the order they were broadcast.
+        :rtype: ``list`` of ``str``
+        """
+        plan = plan_consolidation(
+            unspents or self.unspents,
+            leftover or self.address,
+            fee or get_fee_cached(),
+            max_size=max_size,
+            compressed=self.is_compressed()
         )
 
-        NetworkAPI.broadcast_tx(tx_hex)
+        txids = []
 
-        return calc_txid(tx_hex)
+        for tx_hex in create_consolidation(self, plan, workers=workers):
+            tx = hex_to_bytes(tx_hex)
+            NetworkAPI.broadcast_tx(tx)
+            self._apply_transaction(tx)
+            txids.append(calc_txid_bytes(tx))
+
+        return txids
 
     @classmethod
     def prepare_transaction(cls, address, outputs, compressed=True, fee=None, leftover=None,
-                            combine=True, message=None, unspents=None):  # pragma: no cover
+                            combine=True, message=None, unspents=None, as_bytes=False):  # pragma: no cover
         """Prepares a P2PKH transaction for offline signing.
 
         :param address: The address the funds will be sent from.
@@ -319,8 +582,12 @@ class PrivateKey(BaseKey):
         :param unspents: The UTXOs to use as the inputs. By default Bit will
                          communicate with the blockchain itself.
         :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
-        :returns: JSON storing data required to create an offline transaction.
-        :rtype: ``str``
+        :param as_bytes: Whether or not to return the compact binary format of
+                         :mod:`lit.offline` instead of JSON.
+        :type as_bytes: ``bool``
+        :returns: JSON, or bytes if ``as_bytes`` is set, storing data required
+                  to create an offline transaction.
+        :rtype: ``str`` or ``bytes``
         """
         unspents, outputs = sanitize_tx_data(
             unspents or NetworkAPI.get_unspent(address),
@@ -332,6 +599,9 @@ class PrivateKey(BaseKey):
             compressed=compressed
         )
 
+        if as_bytes:
+            return prepared_to_bytes(unspents, outputs)
+
         data = {
             'unspents': [unspent.to_dict() for unspent in unspents],
             'outputs': outputs
@@ -344,17 +614,47 @@ class PrivateKey(BaseKey):
         transaction data.
 
         :param tx_data: Output of :func:`~bit.PrivateKey.prepare_transaction`.
-        :type tx_data: ``str``
+        :type tx_data: ``str`` or ``bytes``
         :returns: The signed transaction as hex.
         :rtype: ``str``
         """
-        data = json.loads(tx_data)
+        if isinstance(tx_data, (bytes, bytearray)):
+            unspents, outputs = prepared_from_bytes(tx_data)
+        else:
+            data = json.loads(tx_data)
 
-        unspents = [Unspent.from_dict(unspent) for unspent in data['unspents']]
-        outputs = data['outputs']
+            unspents = [Unspent.from_dict(unspent) for unspent in data['unspents']]
+            outputs = data['outputs']
 
         return create_p2pkh_transaction(self, unspents, outputs)
 
+    def sign_transactions(self, transactions, workers=None, chunksize=16):  # pragma: no cover
+        """Signs many prepared transactions across a pool of processes, each
+        as :func:`~lit.PrivateKey.sign_transaction` would. Parsing, signing and
+        serializing all happen in the pool.
+
+        :param transactions: Outputs of :func:`~lit.PrivateKey.prepare_transaction`.
+        :type transactions: iterable of ``str`` or ``bytes``
+        :param workers: The number of processes. By default one per CPU. With
+                        ``1`` every transaction is signed in the calling
+                        process.
+        :type workers: ``int``
+        :param chunksize: The number of transactions handed to a process at a
+                          time. Transactions are read as they are needed.
+        :type chunksize: ``int``
+        :returns: The signed transactions as hex, in the order given.
+        :rtype: generator of ``str``
+        """
+        if workers == 1:
+            for tx_data in transactions:
+                yield self.sign_transaction(tx_data)
+            return
+
+        # Only the WIF is sent to the pool, once per process, as keys
+        # themselves do not pickle.
+        yield from map_chunks(_sign_prepared, transactions, workers or os.cpu_count() or 1,
+                              chunksize, initializer=_init_signer, initargs=(self.to_wif(),))
+
     @classmethod
     def from_hex(cls, hexed):
         """
@@ -420,11 +720,15 @@ class PrivateKeyTestnet(BaseKey):
         super().__init__(wif=wif)
 
         self._address = None
+        self._segwit_address = None
+        self._bech32_address = None
 
         self.balance = 0
         self.unspents = []
         self.transactions = []
 
+        self._ledger = UnspentLedger()
+
     @property
     def address(self):
         """The public address you share with others to receive funds."""
@@ -432,6 +736,24 @@ class PrivateKeyTestnet(BaseKey):
             self._address = public_key_to_address(self._public_key, version='test')
         return self._address
 
+    @property
+    def segwit_address(self):
+        """The P2SH-wrapped SegWit address you share with others to receive
+        funds that are cheaper to spend, or ``None`` if the public key is
+        not compressed."""
+        if self._segwit_address is None and self.is_compressed():
+            self._segwit_address = public_key_to_segwit_address(self._public_key, version='test')
+        return self._segwit_address
+
+    @property
+    def bech32_address(self):
+        """The native SegWit address you share with others to receive funds
+        that are cheapest to spend, or ``None`` if the public key is not
+        compressed."""
+        if self._bech32_address is None and self.is_compressed():
+            self._bech32_address = public_key_to_bech32_address(self._public_key, version='test')
+        return self._bech32_address
+
     def to_wif(self):
         return bytes_to_wif(
             self._pk.secret,
@@ -457,11 +779,18 @@ class PrivateKeyTestnet(BaseKey):
         return self.balance
 
     def get_unspents(self):
-        """Fetches all available unspent transaction outputs.
+        """Fetches all available unspent transaction outputs of
+        :attr:`address`, :attr:`segwit_address` and :attr:`bech32_address`,
+        all at once. If an API cannot look up the SegWit addresses, the UTXOs
+        already known for them are kept.
 
+        :raises ConnectionError: If the UTXOs of :attr:`address` cannot be
+                                 fetched.
         :rtype: ``list`` of :class:`~lit.network.meta.Unspent`
         """
-        self.unspents[:] = NetworkAPI.get_unspent_testnet(self.address)
+        fetched, failed = _fetch_unspents(self, NetworkAPI.get_unspent_testnet)
+
+        self._ledger.sync(self.unspents, fetched, failed)
         self.balance = sum(unspent.amount for unspent in self.unspents)
         return self.unspents
 
@@ -473,9 +802,18 @@ class PrivateKeyTestnet(BaseKey):
         self.transactions[:] = NetworkAPI.get_transactions_testnet(self.address)
         return self.transactions
 
+    def _apply_transaction(self, tx):
+        # Spend the inputs and add our change locally so that the next
+        # transaction can be built without fetching unspents again.
+        self._ledger.apply(self.unspents, tx, public_key_to_scripts(self._public_key))
+        self.balance = sum(unspent.amount for unspent in self.unspents)
+
     def create_transaction(self, outputs, fee=None, leftover=None, combine=True,
-                           message=None, unspents=None):
-        """Creates a signed P2PKH transaction.
+                           message=None, unspents=None, workers=None, as_bytes=False,
+                           replaceable=False):
+        """Creates a signed transaction. UTXOs of :attr:`segwit_address` and
+        :attr:`bech32_address` are spent as SegWit inputs, which lowers the
+        fee.
 
         :param outputs: A sequence of outputs you wish to send in the form
                         ``(destination, amount, currency)``. The amount can
@@ -503,10 +841,26 @@ class PrivateKeyTestnet(BaseKey):
         :param unspents: The UTXOs to use as the inputs. By default Lit will
                          communicate with the testnet blockchain itself.
         :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
-        :returns: The signed transaction as hex.
-        :rtype: ``str``
+        :param workers: The number of threads used to sign inputs. By default
+                        all inputs are signed in the calling thread.
+        :type workers: ``int``
+        :param as_bytes: Whether or not to return the raw transaction bytes
+                         instead of hex.
+        :type as_bytes: ``bool``
+        :param replaceable: Whether or not to signal that the transaction may
+                            be replaced by one paying a higher fee (BIP125),
+                            so that its fee can be bumped later.
+        :type replaceable: ``bool``
+        :returns: The signed transaction as hex, or as bytes if ``as_bytes``
+                  is set.
+        :rtype: ``str`` or ``bytes``
         """
 
+        if not unspents and not combine:
+            # Input order only matters when combining, so otherwise select
+            # from the index the ledger keeps instead of building one per call.
+            unspents = self._ledger.index(self.unspents)
+
         unspents, outputs = sanitize_tx_data(
             unspents or self.unspents,
             outputs,
@@ -517,14 +871,19 @@ class PrivateKeyTestnet(BaseKey):
             compressed=self.is_compressed()
         )
 
-        return create_p2pkh_transaction(self, unspents, outputs)
+        return create_p2pkh_transaction(self, unspents, outputs, workers=workers,
+                                        as_bytes=as_bytes, replaceable=replaceable)
 
-    def send(self, outputs, fee=None, leftover=None, combine=True,
-             message=None, unspents=None):
+    def send(self, outputs, fee=None, leftover=None, combine=None,
+             message=None, unspents=None, workers=None, leases=None, replaceable=False):
         """Creates a signed P2PKH transaction and attempts to broadcast it on
         the testnet blockchain. This accepts the same arguments as
         :func:`~lit.PrivateKeyTestnet.create_transaction`.
 
+        The UTXOs it spends are removed from ``unspents`` and any change is
+        added to it as unconfirmed right away, so further transactions can
+        be sent without fetching unspents again.
+
         :param outputs: A sequence of outputs you wish to send in the form
                         ``(destination, amount, currency)``. The amount can
                         be either an int, float, or string as long as it is
@@ -542,7 +901,8 @@ class PrivateKeyTestnet(BaseKey):
         :type leftover: ``str``
         :param combine: Whether or not Lit should use all available UTXOs to
                         make future transactions smaller and therefore reduce
-                        fees. By default Lit will consolidate UTXOs.
+                        fees. By default Lit will consolidate UTXOs, unless
+                        ``leases`` is given.
         :type combine: ``bool``
         :param message: A message to include in the transaction. This will be
                         stored in the blockchain forever. Due to size limits,
@@ -551,21 +911,177 @@ class PrivateKeyTestnet(BaseKey):
         :param unspents: The UTXOs to use as the inputs. By default Lit will
                          communicate with the testnet blockchain itself.
         :type unspents: ``list`` of :class:`~bit.network.meta.Unspent`
+        :param workers: The number of threads used to sign inputs. By default
+                        all inputs are signed in the calling thread.
+        :type workers: ``int``
+        :param leases: Shared with other senders using the same key, so that
+                       each is given different UTXOs. The leases are released
+                       if the transaction cannot be created or broadcast.
+                       UTXOs are not combined by default then, as every
+                       sender would try to lease all of them.
+        :type leases: :class:`~lit.ledger.LeaseStore`
+        :param replaceable: Whether or not to signal that the transaction may
+                            be replaced by one paying a higher fee (BIP125).
+        :type replaceable: ``bool``
         :returns: The transaction ID.
         :rtype: ``str``
         """
 
-        tx_hex = self.create_transaction(
-            outputs, fee=fee, leftover=leftover, combine=combine, message=message, unspents=unspents
+        if combine is None:
+            combine = leases is None
+
+        if leases is None:
+            tx = self.create_transaction(
+                outputs, fee=fee, leftover=leftover, combine=combine, message=message,
+                unspents=unspents, workers=workers, as_bytes=True, replaceable=replaceable
+            )
+
+            NetworkAPI.broadcast_tx_testnet(tx)
+
+        else:
+            with leases.reserve(
+                unspents or self.unspents,
+                outputs,
+                fee or get_fee_cached(),
+                leftover or self.address,
+                combine=combine,
+                message=message,
+                compressed=self.is_compressed()
+            ) as reservation:
+                tx = create_p2pkh_transaction(
+                    self, reservation.unspents, reservation.outputs, workers=workers, as_bytes=True,
+                    replaceable=replaceable
+                )
+
+                NetworkAPI.broadcast_tx_testnet(tx)
+
+        self._apply_transaction(tx)
+
+        return calc_txid_bytes(tx)
+
+    def bump_fee(self, tx, fee=None, unspents=None, workers=None):
+        """Replaces a transaction sent with ``replaceable=True`` that has not
+        confirmed with one paying a higher fee, taken from its change, and
+        attempts to broadcast it on the blockchain. The replacement is built
+        by :func:`~lit.transaction.bump_fee` and can be bumped again.
+
+        :param tx: The transaction to replace, raw or in hex form.
+        :type tx: ``bytes`` or ``str``
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Lit will poll `<https://bitcoinfees.earn.com>`_ and use a fee
+                    that will allow your transaction to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param unspents: The UTXOs spent by ``tx``. By default those this key
+                         spent locally are used.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param workers: The number of threads used to sign inputs.
+        :type workers: ``int``
+        :returns: The ID of the replacement transaction.
+        :rtype: ``str``
+        """
+        if isinstance(tx, str):
+            tx = hex_to_bytes(tx)
+
+        replacement = bump_fee(
+            self, tx, unspents or self._ledger.spent(), fee or get_fee_cached(),
+            workers=workers, as_bytes=True
+        )
+
+        NetworkAPI.broadcast_tx_testnet(replacement)
+
+        self._ledger.replace(self.unspents, tx, replacement, public_key_to_scripts(self._public_key))
+        self.balance = sum(unspent.amount for unspent in self.unspents)
+
+        return calc_txid_bytes(replacement)
+
+    def cpfp(self, parents, fee=None, leftover=None, workers=None):
+        """Accelerates unconfirmed transactions paying this key by spending
+        their outputs in one child paying a high fee (child pays for parent),
+        and attempts to broadcast it on the blockchain. The child is planned
+        by :func:`~lit.transaction.plan_cpfp`.
+
+        :param parents: The ``(tx, fee)`` of each stuck transaction, where
+                        ``tx`` is raw or in hex form and ``fee`` is the fee
+                        it pays in satoshi.
+        :type parents: iterable of ``tuple``
+        :param fee: The number of satoshi per byte the parents and the child
+                    should pay together. By default Lit will poll
+                    `<https://bitcoinfees.earn.com>`_ and use a fee that will
+                    allow the transactions to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination of the child's output. By default
+                         it pays back to :attr:`address`.
+        :type leftover: ``str``
+        :param workers: The number of threads used to sign inputs.
+        :type workers: ``int``
+        :returns: The ID of the child transaction.
+        :rtype: ``str``
+        """
+        unspents, outputs = plan_cpfp(
+            parents,
+            public_key_to_scripts(self._public_key),
+            leftover or self.address,
+            fee or get_fee_cached(),
+            compressed=self.is_compressed()
+        )
+
+        tx = create_p2pkh_transaction(self, unspents, outputs, workers=workers, as_bytes=True)
+
+        NetworkAPI.broadcast_tx_testnet(tx)
+
+        self._apply_transaction(tx)
+
+        return calc_txid_bytes(tx)
+
+    def consolidate(self, fee=None, leftover=None, max_size=MAX_STANDARD_TX_SIZE,
+                    unspents=None, workers=None):
+        """Consolidates UTXOs into as few transactions as fit within
+        ``max_size`` bytes each, signs them concurrently and attempts to
+        broadcast them on the testnet blockchain. UTXOs worth less than the fee
+        needed to spend them are left untouched.
+
+        :param fee: The number of satoshi per byte to pay to miners. By default
+                    Lit will poll `<https://bitcoinfees.earn.com>`_ and use a fee
+                    that will allow your transactions to be confirmed as soon as
+                    possible.
+        :type fee: ``int``
+        :param leftover: The destination that will receive the consolidated
+                         funds. By default Lit will send them to the same
+                         address you sent from.
+        :type leftover: ``str``
+        :param max_size: The largest size of each transaction in bytes.
+        :type max_size: ``int``
+        :param unspents: The UTXOs to consolidate. By default Lit will
+                         communicate with the testnet blockchain itself.
+        :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
+        :param workers: The number of threads used to sign transactions.
+        :type workers: ``int``
+        :returns: The transaction IDs, in the order they were broadcast.
+        :rtype: ``list`` of ``str``
+        """
+        plan = plan_consolidation(
+            unspents or self.unspents,
+            leftover or self.address,
+            fee or get_fee_cached(),
+            max_size=max_size,
+            compressed=self.is_compressed()
         )
 
-        NetworkAPI.broadcast_tx_testnet(tx_hex)
+        txids = []
 
-        return calc_txid(tx_hex)
+        for tx_hex in create_consolidation(self, plan, workers=workers):
+            tx = hex_to_bytes(tx_hex)
+            NetworkAPI.broadcast_tx_testnet(tx)
+            self._apply_transaction(tx)
+            txids.append(calc_txid_bytes(tx))
+
+        return txids
 
     @classmethod
     def prepare_transaction(cls, address, outputs, compressed=True, fee=None, leftover=None,
-                            combine=True, message=None, unspents=None):
+                            combine=True, message=None, unspents=None, as_bytes=False):
         """Prepares a P2PKH transaction for offline signing.
 
         :param address: The address the funds will be sent from.
@@ -599,8 +1115,12 @@ class PrivateKeyTestnet(BaseKey):
         :param unspents: The UTXOs to use as the inputs. By default Lit will
                          communicate with the blockchain itself.
         :type unspents: ``list`` of :class:`~lit.network.meta.Unspent`
-        :returns: JSON storing data required to create an offline transaction.
-        :rtype: ``str``
+        :param as_bytes: Whether or not to return the compact binary format of
+                         :mod:`lit.offline` instead of JSON.
+        :type as_bytes: ``bool``
+        :returns: JSON, or bytes if ``as_bytes`` is set, storing data required
+                  to create an offline transaction.
+        :rtype: ``str`` or ``bytes``
         """
         unspents, outputs = sanitize_tx_data(
             unspents or NetworkAPI.get_unspent_testnet(address),
@@ -612,6 +1132,9 @@ class PrivateKeyTestnet(BaseKey):
             compressed=compressed
         )
 
+        if as_bytes:
+            return prepared_to_bytes(unspents, outputs)
+
         data = {
             'unspents': [unspent.to_dict() for unspent in unspents],
             'outputs': outputs
@@ -624,17 +1147,47 @@ class PrivateKeyTestnet(BaseKey):
         transaction data.
 
         :param tx_data: Output of :func:`~lit.PrivateKeyTestnet.prepare_transaction`.
-        :type tx_data: ``str``
+        :type tx_data: ``str`` or ``bytes``
         :returns: The signed transaction as hex.
         :rtype: ``str``
         """
-        data = json.loads(tx_data)
+        if isinstance(tx_data, (bytes, bytearray)):
+            unspents, outputs = prepared_from_bytes(tx_data)
+        else:
+            data = json.loads(tx_data)
 
-        unspents = [Unspent.from_dict(unspent) for unspent in data['unspents']]
-        outputs = data['outputs']
+            unspents = [Unspent.from_dict(unspent) for unspent in data['unspents']]
+            outputs = data['outputs']
 
         return create_p2pkh_transaction(self, unspents, outputs)
 
+    def sign_transactions(self, transactions, workers=None, chunksize=16):
+        """Signs many prepared transactions across a pool of processes, each
+        as :func:`~lit.PrivateKeyTestnet.sign_transaction` would. Parsing, signing and
+        serializing all happen in the pool.
+
+        :param transactions: Outputs of :func:`~lit.PrivateKeyTestnet.prepare_transaction`.
+        :type transactions: iterable of ``str`` or ``bytes``
+        :param workers: The number of processes. By default one per CPU. With
+                        ``1`` every transaction is signed in the calling
+                        process.
+        :type workers: ``int``
+        :param chunksize: The number of transactions handed to a process at a
+                          time. Transactions are read as they are needed.
+        :type chunksize: ``int``
+        :returns: The signed transactions as hex, in the order given.
+        :rtype: generator of ``str``
+        """
+        if workers == 1:
+            for tx_data in transactions:
+                yield self.sign_transaction(tx_data)
+            return
+
+        # Only the WIF is sent to the pool, once per process, as keys
+        # themselves do not pickle.
+        yield from map_chunks(_sign_prepared, transactions, workers or os.cpu_count() or 1,
+                              chunksize, initializer=_init_signer, initargs=(self.to_wif(),))
+
     @classmethod
     def from_hex(cls, hexed):
         """
@@ -1,3 +1,7 @@
+from lit.network.meta import Unspent
+from lit.transaction import public_key_to_scripts
+from lit.utils import bytes_to_hex
+
 BINARY_ADDRESS = b'\x00\x92F\x1b\xdeb\x83\xb4a\xec\xe7\xdd\xf4\xdb\xf1\xe0\xa4\x8b\xd1\x13\xd8&E\xb4\xbf'
 LITECOIN_ADDRESS = '1ELReFsTCUY2mfaDTy32qxYiT49z786eFg'
 LITECOIN_ADDRESS_COMPRESSED = '1ExJJsNLQDNVVM1s1sdyt1o5P3GC5r32UG'
@@ -28,7 +32,23 @@ PUBLIC_KEY_UNCOMPRESSED = (b"\x04=\\(u\xc9\xbd\x11hu\xa7\x1a]\xb6L\xff\xcb\x139k
                            b"LQ[r\xeb\x10\xf1\xfd\x8f?\x03\xb4/J+%[\xfc\x9a\xa9\xe3")
 PUBLIC_KEY_X = 27753912938952041417634381842191885283234814940840273460372041880794577257268
 PUBLIC_KEY_Y = 53663045980837260634637807506183816949039230809110041985901491152185762425315
+RECIPIENT = 'n2eMqTT929pb1RDNuqEnxdaLau1rxy3efi'
+RECIPIENT_SCRIPT = '76a914e7c1345fc8f87c68170b3aa798a956c2fe6a9eff88ac'
+TXID = 'f3ad23dac2a3546167b27a43ac3e370236caf93f75bfcf27c625ec839d397888'
 WALLET_FORMAT_COMPRESSED_MAIN = 'L3jsepcttyuJK3HKezD4qqRKGtwc8d2d1Nw6vsoPDX9cMcUxqqMv'
 WALLET_FORMAT_COMPRESSED_TEST = 'cU6s7jckL3bZUUkb3Q2CD9vNu8F1o58K5R5a3JFtidoccMbhEGKZ'
 WALLET_FORMAT_MAIN = '5KHxtARu5yr1JECrYGEA2YpCPdh1i9ciEgQayAF8kcqApkGzT9s'
 WALLET_FORMAT_TEST = '934bTuFSgCv9GHi9Ac84u9NA3J3isK9uadGY3nbe6MaDbnQdcbn'
+
+
+def make_unspents(script, count, amount=10000, start=0):
+    """Returns ``count`` UTXOs of ``amount`` paying to ``script``, the outputs
+    ``start`` onwards of :data:`TXID`."""
+    return [Unspent(amount, 1, script, TXID, start + i) for i in range(count)]
+
+
+def make_key_unspents(private_key, start=0):
+    """Returns one UTXO for each of the key's scriptPubKeys, of 10000, 20000
+    and 30000 satoshi."""
+    scripts = [bytes_to_hex(script) for script in public_key_to_scripts(private_key.public_key)]
+    return [Unspent(10000 * (i + 1), 1, script, TXID, start + i) for i, script in enumerate(scripts)]
@@ -1,6 +1,11 @@
+import os
+
 import pytest
 
-from lit.base58 import b58decode, b58decode_check, b58encode, b58encode_check
+from lit.base58 import (
+    BASE58_ALPHABET, b58decode, b58decode_check, b58decode_check_many, b58decode_large,
+    b58encode, b58encode_check, b58encode_check_many, b58encode_large
+)
 from lit.format import MAIN_PUBKEY_HASH
 from .samples import BINARY_ADDRESS, LITECOIN_ADDRESS, PUBKEY_HASH
 
@@ -23,6 +28,50 @@ class TestB58Decode:
         with pytest.raises(ValueError):
             b58decode('l')
 
+    def test_b58decode_large_failure(self):
+        with pytest.raises(ValueError):
+            b58decode('2' * 300 + 'l' + '2' * 300)
+
+
+def digitwise_encode(num):
+    encoded = ''
+    while num > 0:
+        num, rem = divmod(num, 58)
+        encoded = BASE58_ALPHABET[rem] + encoded
+    return encoded
+
+
+class TestLargePayloads:
+    def test_matches_digitwise(self):
+        for size in (1, 20, 21, 64, 65, 100, 187, 188, 300, 700, 1500):
+            num = int.from_bytes(b'\xff' + os.urandom(size - 1), 'big')
+            string = digitwise_encode(num)
+
+            assert b58encode_large(num) == string
+            assert b58decode_large(string) == num
+
+    def test_leaf_boundaries(self):
+        for digits in (31, 32, 33, 63, 64, 65, 128, 129):
+            for num in (58 ** digits - 1, 58 ** digits, 58 ** digits + 1):
+                string = digitwise_encode(num)
+
+                assert b58encode_large(num) == string
+                assert b58decode_large(string) == num
+
+    def test_zero(self):
+        assert b58encode_large(0) == ''
+        assert b58decode_large('') == 0
+
+    def test_round_trip(self):
+        for size in (65, 200, 1000):
+            for zeros in (0, 1, 5):
+                bytestr = b'\x00' * zeros + b'\x01' + os.urandom(size)
+                string = b58encode(bytestr)
+
+                assert string.startswith('1' * zeros)
+                assert not string.startswith('1' * (zeros + 1))
+                assert b58decode(string) == bytestr
+
 
 class TestB58DecodeCheck:
     def test_b58decode_check_success(self):
@@ -31,3 +80,44 @@ class TestB58DecodeCheck:
     def test_b58decode_check_failure(self):
         with pytest.raises(ValueError):
             b58decode_check(LITECOIN_ADDRESS[:-1])
+
+
+class TestCheckMany:
+    def test_encode_matches(self):
+        payloads = [os.urandom(size) for size in (0, 1, 21, 33, 34, 38, 100)]
+        payloads += [b'\x00' * zeros + os.urandom(20) for zeros in (1, 2, 21)]
+        payloads.append(MAIN_PUBKEY_HASH + PUBKEY_HASH)
+
+        results = list(b58encode_check_many(payloads))
+
+        assert results == [(b58encode_check(payload), None) for payload in payloads]
+
+    def test_encode_error(self):
+        (encoded, error), = b58encode_check_many(['not bytes'])
+        assert encoded is None
+        assert isinstance(error, TypeError)
+
+    def test_decode_matches(self):
+        payloads = [os.urandom(size) for size in (1, 21, 34, 38, 200)]
+        payloads += [b'\x00' * zeros + os.urandom(20) for zeros in (1, 21)]
+        strings = [b58encode_check(payload) for payload in payloads]
+
+        assert list(b58decode_check_many(strings)) == [(payload, None) for payload in payloads]
+
+    def test_decode_errors(self):
+        address = b58encode_check(MAIN_PUBKEY_HASH + PUBKEY_HASH)
+        strings = [address, address[:-1], address + 'l', None, address]
+        results = list(b58decode_check_many(strings, length=21))
+
+        assert results[0] == results[-1] == (MAIN_PUBKEY_HASH + PUBKEY_HASH, None)
+        assert all(payload is None for payload, _ in results[1:4])
+        assert isinstance(results[1][1], ValueError)
+        assert '"l"' in str(results[2][1])
+        assert isinstance(results[3][1], TypeError)
+
+    def test_decode_length(self):
+        wif = b58encode_check(b'\x80' + b'\x01' * 32)
+        (payload, error), = b58decode_check_many([wif], length=21)
+
+        assert payload is None
+        assert isinstance(error, ValueError)
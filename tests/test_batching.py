@@ -0,0 +1,176 @@
+import threading
+
+import pytest
+
+from lit import PrivateKey
+from lit.batching import Payout, PayoutBatcher
+from lit.transaction import calc_txid_bytes
+
+ADDRESSES = [PrivateKey().address for _ in range(5)]
+
+
+class MockKey:
+    def __init__(self, fail_apply=False):
+        self.fail_apply = fail_apply
+        self.sent = []
+        self.applied = []
+
+    def create_transaction(self, outputs, fee=None, combine=True, as_bytes=False):
+        self.sent.append(outputs)
+        return 'tx{}'.format(len(self.sent)).encode()
+
+    def _apply_transaction(self, tx):
+        if self.fail_apply:
+            raise ValueError('Ledger out of sync.')
+        self.applied.append(tx)
+
+
+class MockNetwork:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.broadcast = []
+
+    def __call__(self, tx):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('All APIs are unreachable.')
+        self.broadcast.append(tx)
+
+
+@pytest.fixture
+def network(monkeypatch):
+    network = MockNetwork()
+    monkeypatch.setattr('lit.batching.NetworkAPI.broadcast_tx', network)
+    return network
+
+
+class TestPayoutBatcher:
+    def test_add_only_queues(self, network):
+        key = MockKey()
+        batcher = PayoutBatcher(key, max_outputs=2)
+
+        first = batcher.add(ADDRESSES[0], 1000)
+        second = batcher.add(ADDRESSES[1], 2000, 'satoshi')
+
+        assert key.sent == []
+        assert batcher.pending == 2
+        assert first.txid is second.txid is None
+
+    def test_flush_on_size(self, network):
+        key = MockKey()
+        batcher = PayoutBatcher(key, max_outputs=2, max_delay=3600)
+
+        first = batcher.add(ADDRESSES[0], 1000)
+        assert batcher.flush_due() is None
+
+        second = batcher.add(ADDRESSES[1], 2000, 'satoshi')
+        txid = batcher.flush_due()
+
+        assert txid == calc_txid_bytes(b'tx1')
+        assert key.sent == [[(ADDRESSES[0], 1000, 'satoshi'), (ADDRESSES[1], 2000, 'satoshi')]]
+        assert network.broadcast == key.applied == [b'tx1']
+        assert first.txid == second.txid == txid
+        assert batcher.pending == 0
+
+    def test_flush_due(self, network):
+        key = MockKey()
+        batcher = PayoutBatcher(key, max_delay=3600)
+        batcher.add(ADDRESSES[0], 1000)
+        assert batcher.flush_due() is None
+
+        batcher.max_delay = 0
+        assert batcher.flush_due() == calc_txid_bytes(b'tx1')
+        assert batcher.flush_due() is None
+
+    def test_add_rejects_invalid(self, network):
+        batcher = PayoutBatcher(MockKey())
+
+        with pytest.raises(ValueError):
+            batcher.add('address', 1000)
+        with pytest.raises(ValueError):
+            batcher.add(ADDRESSES[0], 'lots')
+        with pytest.raises(ValueError):
+            batcher.add(ADDRESSES[0], 1000, 'doubloons')
+        with pytest.raises(ValueError):
+            batcher.add(ADDRESSES[0], 0)
+
+        assert batcher.pending == 0
+
+    def test_add_during_broadcast(self, monkeypatch):
+        broadcasting = threading.Event()
+        release = threading.Event()
+
+        def broadcast(tx):
+            broadcasting.set()
+            release.wait(5)
+
+        monkeypatch.setattr('lit.batching.NetworkAPI.broadcast_tx', broadcast)
+        batcher = PayoutBatcher(MockKey())
+        batcher.add(ADDRESSES[0], 1000)
+
+        flushing = threading.Thread(target=batcher.flush)
+        flushing.start()
+        assert broadcasting.wait(5)
+
+        # Neither waits for the broadcast, nor is the new payout sent with it.
+        batcher.add(ADDRESSES[1], 1000)
+        assert batcher.metrics()['pending'] == 2
+
+        release.set()
+        flushing.join()
+        assert batcher.pending == 1
+
+    def test_flush_empty(self, network):
+        assert PayoutBatcher(MockKey()).flush() is None
+
+    def test_broadcast_failure_keeps_pending(self, network):
+        network.failures = 1
+        key = MockKey()
+        batcher = PayoutBatcher(key, max_outputs=1)
+        payout = batcher.add(ADDRESSES[0], 1000)
+
+        with pytest.raises(ConnectionError):
+            batcher.flush_due()
+
+        assert batcher.pending == 1
+        assert payout.txid is None
+        assert payout.latency is None
+        assert key.applied == []
+
+        # Retrying sends the payout exactly once.
+        assert batcher.flush_due() == calc_txid_bytes(b'tx2')
+        assert batcher.flush_due() is None
+        assert network.broadcast == [b'tx2']
+        assert key.sent[-1] == [(ADDRESSES[0], 1000, 'satoshi')]
+        assert payout.latency >= 0
+
+    def test_failure_after_broadcast(self, network):
+        key = MockKey(fail_apply=True)
+        batcher = PayoutBatcher(key)
+        payout = batcher.add(ADDRESSES[0], 1000)
+
+        with pytest.raises(ValueError):
+            batcher.flush()
+
+        assert batcher.pending == 0
+        assert payout.txid == calc_txid_bytes(b'tx1')
+        assert batcher.flush() is None
+        assert network.broadcast == [b'tx1']
+
+    def test_metrics(self, network):
+        batcher = PayoutBatcher(MockKey(), max_outputs=2)
+        for i in range(5):
+            batcher.add(ADDRESSES[i], 1000)
+            batcher.flush_due()
+
+        metrics = batcher.metrics()
+        assert metrics['pending'] == 1
+        assert metrics['payouts'] == 4
+        assert metrics['transactions'] == 2
+        assert metrics['mean_batch_size'] == 2
+        assert metrics['max_latency'] >= metrics['mean_latency'] >= 0
+
+
+def test_payout_repr():
+    payout = Payout('address', 1, 'satoshi', 0)
+    assert repr(payout) == "Payout(address='address', amount=1, currency='satoshi', txid=None)"
@@ -0,0 +1,83 @@
+import pytest
+
+from lit.bech32 import segwit_decode, segwit_decode_many, segwit_encode
+
+# From BIP173 and BIP350.
+VALID = [
+    ('BC1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4', 'bc', 0,
+     '751e76e8199196d454941c45d1b3a323f1433bd6'),
+    ('tb1qrp33g0q5c5txsp9arysrx4k6zdkfs4nce4xj0gdcccefvpysxf3q0sl5k7', 'tb', 0,
+     '1863143c14c5166804bd19203356da136c985678cd4d27a1b8c6329604903262'),
+    ('bc1pw508d6qejxtdg4y5r3zarvary0c5xw7kw508d6qejxtdg4y5r3zarvary0c5xw7kt5nd6y', 'bc', 1,
+     '751e76e8199196d454941c45d1b3a323f1433bd6751e76e8199196d454941c45d1b3a323f1433bd6'),
+    ('BC1SW50QGDZ25J', 'bc', 16, '751e'),
+    ('bc1zw508d6qejxtdg4y5r3zarvaryvaxxpcs', 'bc', 2, '751e76e8199196d454941c45d1b3a323'),
+    ('bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqzk5jj0', 'bc', 1,
+     '79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798'),
+]
+INVALID = [
+    # Invalid checksum.
+    'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t5',
+    # Bech32 checksum for a later version.
+    'bc1p0xlxvlhemja6c4dqv22uapctqupfhlxm9h8z3k2e72q4k9hcz7vqh2y7hd',
+    # Bech32m checksum for version 0.
+    'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kemeawh',
+    # Program too short.
+    'bc1pw5dgrnzv',
+    # More than four padding bits.
+    'bc1zw508d6qejxtdg4y5r3zarvaryvq37eag7',
+    # Mixed case.
+    'Bc1QW508D6QEJXTDG4Y5R3ZARVARY0C5XW7KV8F3T4',
+    # Invalid character.
+    'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3tb',
+    # Wrong hrp.
+    'tb1qw508d6qejxtdg4y5r3zarvary0c5xw7kxpjzsx',
+]
+
+
+class TestSegwitDecode:
+    def test_valid(self):
+        for address, hrp, witver, witprog in VALID:
+            assert segwit_decode(hrp, address) == (witver, bytes.fromhex(witprog))
+
+    def test_invalid(self):
+        for address in INVALID:
+            with pytest.raises(ValueError):
+                segwit_decode('bc', address)
+
+    def test_non_ascii(self):
+        with pytest.raises(ValueError):
+            segwit_decode('bc', 'bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3té')
+
+
+class TestSegwitEncode:
+    def test_valid(self):
+        for address, hrp, witver, witprog in VALID:
+            assert segwit_encode(hrp, witver, bytes.fromhex(witprog)) == address.lower()
+
+    def test_roundtrip_litecoin(self):
+        witprog = bytes(range(20))
+        address = segwit_encode('ltc', 0, witprog)
+        assert address.startswith('ltc1q')
+        assert segwit_decode('ltc', address) == (0, witprog)
+
+    def test_invalid_program(self):
+        with pytest.raises(ValueError):
+            segwit_encode('ltc', 0, bytes(21))
+        with pytest.raises(ValueError):
+            segwit_encode('ltc', 17, bytes(20))
+
+
+def test_segwit_decode_many():
+    addresses = [address for address, hrp, _, _ in VALID if hrp == 'bc'] + INVALID
+    decoded = segwit_decode_many('bc', addresses)
+
+    assert decoded[:5] == [segwit_decode('bc', address) for address in addresses[:5]]
+    assert decoded[5:] == [None] * len(INVALID)
+
+
+def test_segwit_decode_many_not_strings():
+    address = segwit_encode('bc', 0, bytes(20))
+
+    assert segwit_decode_many('bc', [None, address.encode(), 7, address]) == \
+        [None, None, None, (0, bytes(20))]
@@ -1,9 +1,15 @@
+import threading
+
 import pytest
 
+from lit.bech32 import segwit_encode
+from lit.crypto import ripemd160_sha256
 from lit.format import (
-    address_to_public_key_hash, bytes_to_wif, coords_to_public_key,
-    get_version, point_to_public_key, public_key_to_coords,
-    public_key_to_address, verify_sig, wif_checksum_check, wif_to_bytes
+    ADDRESS_CACHE, AddressCache, address_to_public_key_hash, bytes_to_wif, coords_to_public_key,
+    decode_address, get_version, is_valid_address, point_to_public_key, public_key_to_bech32_address,
+    public_key_to_coords, public_key_to_address, public_key_to_segwit_address,
+    public_keys_to_addresses, verify_sig,
+    wif_checksum_check, wif_to_bytes
 )
 from .samples import (
     LITECOIN_ADDRESS, LITECOIN_ADDRESS_COMPRESSED, LITECOIN_ADDRESS_PAY2SH,
@@ -52,6 +58,127 @@ class TestGetVersion:
             get_version(LITECOIN_ADDRESS_TEST_PAY2SH)
 
 
+class TestDecodeAddress:
+    def test_pubkey_hash(self):
+        assert decode_address(LITECOIN_ADDRESS_TEST) == ('p2pkh', 'test', PUBKEY_HASH)
+
+    def test_pay2sh(self):
+        assert decode_address(LITECOIN_ADDRESS_PAY2SH)[:2] == ('p2sh', 'main')
+        assert decode_address(LITECOIN_ADDRESS_TEST_PAY2SH)[:2] == ('p2sh', 'test')
+
+    def test_bech32(self):
+        program = bytes(range(32))
+        assert decode_address(public_key_to_bech32_address(PUBLIC_KEY_COMPRESSED)) == \
+            ('p2wpkh', 'main', PUBKEY_HASH_COMPRESSED)
+        assert decode_address(segwit_encode('tltc', 0, program)) == ('p2wsh', 'test', program)
+        assert decode_address(segwit_encode('ltc', 1, program).upper()) == ('p2tr', 'main', program)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            decode_address('dg2dNAjuezub6iJVPNML5pW5ZQvtA9ocL')
+        with pytest.raises(ValueError):
+            decode_address(segwit_encode('ltc', 2, bytes(20)))
+
+
+class TestAddressCache:
+    def test_hits(self):
+        cache = AddressCache()
+
+        assert cache.decode(LITECOIN_ADDRESS_TEST) == ('p2pkh', 'test', PUBKEY_HASH)
+        assert cache.decode(LITECOIN_ADDRESS_TEST) == ('p2pkh', 'test', PUBKEY_HASH)
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 4096}
+
+    def test_invalid_not_cached(self):
+        cache = AddressCache()
+
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                cache.decode('dg2dNAjuezub6iJVPNML5pW5ZQvtA9ocL')
+
+        assert cache.stats()['misses'] == 2
+        assert len(cache) == 0
+
+    def test_least_recently_used(self):
+        cache = AddressCache(maxsize=2)
+        cache.decode(LITECOIN_ADDRESS_TEST)
+        cache.decode(LITECOIN_ADDRESS_PAY2SH)
+        cache.decode(LITECOIN_ADDRESS_TEST)
+        cache.decode(LITECOIN_ADDRESS_TEST_PAY2SH)
+
+        assert list(cache._entries) == [LITECOIN_ADDRESS_TEST, LITECOIN_ADDRESS_TEST_PAY2SH]
+
+        cache.resize(1)
+        assert list(cache._entries) == [LITECOIN_ADDRESS_TEST_PAY2SH]
+
+        cache.resize(0)
+        cache.decode(LITECOIN_ADDRESS_TEST)
+        assert len(cache) == 0
+
+    def test_threads(self):
+        cache = AddressCache(maxsize=2)
+        addresses = [LITECOIN_ADDRESS_TEST, LITECOIN_ADDRESS_PAY2SH, LITECOIN_ADDRESS_TEST_PAY2SH]
+        expected = [decode_address(address) for address in addresses]
+        results = []
+
+        def work():
+            results.append([cache.decode(address) for address in addresses * 50] == expected * 50)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert results == [True] * 4
+        assert stats['hits'] + stats['misses'] == 600
+        assert stats['size'] == 2
+
+    def test_module_cache(self):
+        ADDRESS_CACHE.clear()
+        get_version(LITECOIN_ADDRESS_TEST)
+        address_to_public_key_hash(LITECOIN_ADDRESS_TEST)
+
+        assert ADDRESS_CACHE.stats()['hits'] == 1
+        assert ADDRESS_CACHE.stats()['misses'] == 1
+
+
+class TestIsValidAddress:
+    def test_valid(self):
+        addresses = [
+            LITECOIN_ADDRESS_PAY2SH, LITECOIN_ADDRESS_TEST, LITECOIN_ADDRESS_TEST_PAY2SH,
+            public_key_to_address(PUBLIC_KEY_COMPRESSED),
+            public_key_to_bech32_address(PUBLIC_KEY_COMPRESSED),
+            segwit_encode('tltc', 0, bytes(32)), segwit_encode('ltc', 1, bytes(32)).upper(),
+        ]
+
+        for address in addresses:
+            assert is_valid_address(address)
+            assert is_valid_address(address, checksum=False)
+
+    def test_version(self):
+        assert is_valid_address(LITECOIN_ADDRESS_PAY2SH, version='main')
+        assert not is_valid_address(LITECOIN_ADDRESS_PAY2SH, version='test')
+        assert is_valid_address(LITECOIN_ADDRESS_TEST, version='test')
+        assert not is_valid_address(LITECOIN_ADDRESS_TEST, version='main', checksum=False)
+        assert not is_valid_address(segwit_encode('tltc', 0, bytes(20)), version='main')
+
+    def test_screened(self):
+        # Bitcoin and malformed addresses fail without being decoded.
+        for address in ('1ExJJsNLQDNVVM1s1sdyt1o5P3GC5r32UG', LITECOIN_ADDRESS_TEST[:-1],
+                        LITECOIN_ADDRESS_TEST[:-1] + 'l', 'bc1' + 'q' * 39, 'ltc1' + 'q' * 40,
+                        'ltc1p' + 'q' * 38, 'ltc1q' + 'b' * 38, 'Ltc1' + 'q' * 39, '', None):
+            assert not is_valid_address(address, checksum=False)
+
+    def test_checksum(self):
+        address = LITECOIN_ADDRESS_TEST[:-1] + ('2' if LITECOIN_ADDRESS_TEST[-1] != '2' else '3')
+        bech32 = segwit_encode('ltc', 0, bytes(20))
+
+        assert is_valid_address(address, checksum=False)
+        assert not is_valid_address(address)
+        assert not is_valid_address(bech32[:-1] + ('q' if bech32[-1] != 'q' else 'p'))
+
+
 class TestVerifySig:
     def test_valid(self):
         assert verify_sig(VALID_SIGNATURE, DATA, PUBLIC_KEY_COMPRESSED)
@@ -138,6 +265,53 @@ class TestPublicKeyToAddress:
         assert public_key_to_address(PUBLIC_KEY_UNCOMPRESSED, version='test') == LITECOIN_ADDRESS_TEST
 
 
+class TestPublicKeysToAddresses:
+    def test_matches(self):
+        keys = [PUBLIC_KEY_COMPRESSED, PUBLIC_KEY_UNCOMPRESSED] * 3
+
+        for version in ('main', 'test'):
+            expected = [public_key_to_address(key, version=version) for key in keys]
+            assert list(public_keys_to_addresses(iter(keys), version=version)) == expected
+
+    def test_workers(self):
+        keys = [PUBLIC_KEY_COMPRESSED, PUBLIC_KEY_UNCOMPRESSED] * 10
+        expected = [public_key_to_address(key, version='test') for key in keys]
+
+        addresses = public_keys_to_addresses(keys, version='test', workers=2, chunksize=3)
+        assert list(addresses) == expected
+
+    def test_invalid_length(self):
+        with pytest.raises(ValueError):
+            list(public_keys_to_addresses([PUBLIC_KEY_COMPRESSED, PUBLIC_KEY_COMPRESSED[:-1]]))
+
+
+class TestPublicKeyToSegwitAddress:
+    def test_nested_p2wpkh(self):
+        address = public_key_to_segwit_address(PUBLIC_KEY_COMPRESSED)
+        redeem_script = b'\x00\x14' + PUBKEY_HASH_COMPRESSED
+        assert address.startswith('M')
+        assert decode_address(address) == ('p2sh', 'main', ripemd160_sha256(redeem_script))
+
+    def test_testnet(self):
+        address = public_key_to_segwit_address(PUBLIC_KEY_COMPRESSED, version='test')
+        assert address.startswith('Q')
+        assert decode_address(address)[:2] == ('p2sh', 'test')
+
+    def test_uncompressed(self):
+        with pytest.raises(ValueError):
+            public_key_to_segwit_address(PUBLIC_KEY_UNCOMPRESSED)
+
+
+class TestPublicKeyToBech32Address:
+    def test_p2wpkh(self):
+        assert public_key_to_bech32_address(PUBLIC_KEY_COMPRESSED).startswith('ltc1q')
+        assert public_key_to_bech32_address(PUBLIC_KEY_COMPRESSED, version='test').startswith('tltc1q')
+
+    def test_uncompressed(self):
+        with pytest.raises(ValueError):
+            public_key_to_bech32_address(PUBLIC_KEY_UNCOMPRESSED)
+
+
 class TestCoordsToPublicKey:
     def test_coords_to_public_key_compressed(self):
         assert coords_to_public_key(PUBLIC_KEY_X, PUBLIC_KEY_Y) == PUBLIC_KEY_COMPRESSED
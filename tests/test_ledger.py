@@ -0,0 +1,258 @@
+import threading
+
+import pytest
+
+from lit.exceptions import InsufficientFunds
+from lit.ledger import LeaseStore, SQLiteLeaseStore, UnspentLedger
+from lit.network.meta import Unspent
+from lit.transaction import (
+    address_to_scriptpubkey, bump_fee, calc_txid_bytes, create_p2pkh_transaction,
+    public_key_to_scripts
+)
+from lit.utils import bytes_to_hex
+from lit.wallet import PrivateKeyTestnet
+from .samples import RECIPIENT, TXID, WALLET_FORMAT_COMPRESSED_TEST, make_unspents
+
+
+def make_key_and_unspents():
+    private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+    script = address_to_scriptpubkey(private_key.address)
+    return private_key, script, make_unspents(bytes_to_hex(script), 3)
+
+
+class TestUnspentLedger:
+    def test_apply(self):
+        private_key, script, unspents = make_key_and_unspents()
+        tx = create_p2pkh_transaction(
+            private_key, unspents[:2], [(RECIPIENT, 5000), (private_key.address, 14000)], as_bytes=True
+        )
+
+        ledger = UnspentLedger()
+        tracked = unspents.copy()
+        created = ledger.apply(tracked, tx, (script,))
+
+        change = Unspent(14000, 0, bytes_to_hex(script), calc_txid_bytes(tx), 1)
+        assert created == [change]
+        assert tracked == [unspents[2], change]
+
+    def test_apply_segwit_change(self):
+        private_key, script, unspents = make_key_and_unspents()
+        tx = create_p2pkh_transaction(
+            private_key, unspents[:1], [(private_key.segwit_address, 9000)], as_bytes=True
+        )
+
+        ledger = UnspentLedger()
+        change, = ledger.apply([], tx, public_key_to_scripts(private_key.public_key))
+        assert change.script.startswith('a914')
+
+    def test_replace(self):
+        private_key, script, unspents = make_key_and_unspents()
+        tracked = unspents.copy()
+        ledger = UnspentLedger()
+
+        tx = create_p2pkh_transaction(
+            private_key, unspents[:2], [(RECIPIENT, 5000), (private_key.address, 14000)],
+            as_bytes=True, replaceable=True
+        )
+        ledger.apply(tracked, tx, (script,))
+        assert ledger.spent() == unspents[:2]
+
+        replacement = bump_fee(private_key, tx, ledger.spent(), 10, as_bytes=True)
+        change, = ledger.replace(tracked, tx, replacement, (script,))
+
+        assert change.txid == calc_txid_bytes(replacement)
+        assert tracked == [unspents[2], change]
+
+        ledger.sync(tracked, [unspents[2], change])
+        assert ledger.spent() == unspents[:2]
+
+    def test_sync_hides_spent_and_keeps_created(self):
+        private_key, script, unspents = make_key_and_unspents()
+        tx = create_p2pkh_transaction(
+            private_key, unspents[:1], [(private_key.address, 9000)], as_bytes=True
+        )
+
+        ledger = UnspentLedger()
+        tracked = unspents.copy()
+        change, = ledger.apply(tracked, tx, (script,))
+
+        # The network has not seen the transaction yet.
+        ledger.sync(tracked, unspents)
+        assert tracked == unspents[1:] + [change]
+
+        # The network has seen it.
+        ledger.sync(tracked, unspents[1:] + [change])
+        assert tracked == unspents[1:] + [change]
+        assert not ledger._created
+
+    def test_sync_forgets_spent_after_expiry(self):
+        private_key, script, unspents = make_key_and_unspents()
+        tx = create_p2pkh_transaction(
+            private_key, unspents[:1], [(RECIPIENT, 9000)], as_bytes=True
+        )
+
+        ledger = UnspentLedger(expiry=0)
+        ledger.apply(unspents.copy(), tx, (script,))
+
+        tracked = []
+        ledger.sync(tracked, unspents[1:])
+        assert not ledger._spent
+        assert tracked == unspents[1:]
+
+    def test_index_follows_ledger(self):
+        private_key, script, unspents = make_key_and_unspents()
+        tracked = unspents.copy()
+        ledger = UnspentLedger()
+        index = ledger.index(tracked)
+
+        tx = create_p2pkh_transaction(
+            private_key, unspents[:2], [(RECIPIENT, 5000), (private_key.address, 14000)],
+            as_bytes=True, replaceable=True
+        )
+        ledger.apply(tracked, tx, (script,))
+        assert ledger.index(tracked) is index
+        assert sorted(index, key=lambda u: u.amount) == sorted(tracked, key=lambda u: u.amount)
+
+        replacement = bump_fee(private_key, tx, ledger.spent(), 10, as_bytes=True)
+        ledger.replace(tracked, tx, replacement, (script,))
+        assert ledger.index(tracked) is index
+        assert list(index) == sorted(tracked, key=lambda u: u.amount)
+
+        ledger.sync(tracked, [unspents[2]])
+        assert ledger.index(tracked) is index
+        assert list(index) == tracked
+        assert index.total == sum(unspent.amount for unspent in tracked)
+
+    def test_index_rebuilt_after_outside_change(self):
+        _, _, unspents = make_key_and_unspents()
+        tracked = unspents.copy()
+        ledger = UnspentLedger()
+        index = ledger.index(tracked)
+
+        del tracked[0]
+        assert ledger.index(tracked) is not index
+        assert list(ledger.index(tracked)) == tracked
+
+
+def test_chained_sends(monkeypatch):
+    broadcast = []
+    monkeypatch.setattr('lit.wallet.NetworkAPI.broadcast_tx_testnet', broadcast.append)
+
+    private_key, script, unspents = make_key_and_unspents()
+    private_key.unspents[:] = unspents
+
+    first = private_key.send([(RECIPIENT, 12000, 'satoshi')], fee=1)
+    second = private_key.send([(RECIPIENT, 12000, 'satoshi')], fee=1)
+
+    assert [calc_txid_bytes(tx) for tx in broadcast] == [first, second]
+    assert all(unspent.txid != TXID for unspent in private_key.unspents)
+    assert private_key.unspents[0].txid == second
+    assert private_key.balance == private_key.unspents[0].amount
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'memory':
+        return LeaseStore()
+    return SQLiteLeaseStore(str(tmp_path / 'leases.db'))
+
+
+class TestLeaseStore:
+    def test_acquire_release(self, store):
+        unspents = make_key_and_unspents()[2]
+
+        assert store.acquire(unspents[:2], 'a')
+        assert not store.acquire(unspents[1:], 'b')
+        assert store.leased() == {(TXID, 0), (TXID, 1)}
+
+        store.release(unspents[:2], 'b')
+        assert store.leased() == {(TXID, 0), (TXID, 1)}
+
+        store.release(unspents[:2], 'a')
+        assert store.acquire(unspents[1:], 'b')
+        assert store.leased() == {(TXID, 1), (TXID, 2)}
+
+    def test_expiry(self, store):
+        unspents = make_key_and_unspents()[2]
+        store.ttl = 0
+
+        assert store.acquire(unspents, 'a')
+        assert store.leased() == set()
+        assert store.acquire(unspents, 'b')
+
+    def test_reserve_disjoint(self, store):
+        unspents = make_key_and_unspents()[2]
+        outputs = [(RECIPIENT, 5000, 'satoshi')]
+
+        first = store.reserve(unspents, outputs, 1, RECIPIENT)
+        second = store.reserve(unspents, outputs, 1, RECIPIENT)
+
+        assert len(first.unspents) == len(second.unspents) == 1
+        assert first.unspents != second.unspents
+        assert first.outputs[0] == (RECIPIENT, 5000)
+
+    def test_reserve_insufficient(self, store):
+        unspents = make_key_and_unspents()[2]
+        store.acquire(unspents[:2], 'a')
+
+        with pytest.raises(InsufficientFunds):
+            store.reserve(unspents, [(RECIPIENT, 15000, 'satoshi')], 1, RECIPIENT)
+
+    def test_release_on_failure(self, store):
+        unspents = make_key_and_unspents()[2]
+
+        with pytest.raises(ConnectionError):
+            with store.reserve(unspents, [(RECIPIENT, 5000, 'satoshi')], 1, RECIPIENT):
+                raise ConnectionError
+
+        assert store.leased() == set()
+
+        with store.reserve(unspents, [(RECIPIENT, 5000, 'satoshi')], 1, RECIPIENT) as reservation:
+            pass
+
+        assert store.leased() == {(u.txid, u.txindex) for u in reservation.unspents}
+
+
+def test_concurrent_reservations():
+    private_key, script, _ = make_key_and_unspents()
+    unspents = make_unspents(bytes_to_hex(script), 40)
+    store = LeaseStore()
+    reserved = []
+
+    def worker():
+        for _ in range(5):
+            reservation = store.reserve(unspents, [(RECIPIENT, 5000, 'satoshi')], 1, RECIPIENT)
+            reserved.extend(reservation.unspents)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(reserved) == 40
+    assert len({unspent.txindex for unspent in reserved}) == 40
+
+
+def test_send_with_leases(monkeypatch):
+    def broadcast(tx):
+        raise ConnectionError('All APIs are unreachable.')
+
+    monkeypatch.setattr('lit.wallet.NetworkAPI.broadcast_tx_testnet', broadcast)
+
+    private_key, script, unspents = make_key_and_unspents()
+    private_key.unspents[:] = unspents
+    store = LeaseStore()
+
+    with pytest.raises(ConnectionError):
+        private_key.send([(RECIPIENT, 5000, 'satoshi')], fee=1, combine=False, leases=store)
+
+    assert store.leased() == set()
+    assert private_key.unspents == unspents
+
+    monkeypatch.setattr('lit.wallet.NetworkAPI.broadcast_tx_testnet', lambda tx: None)
+    private_key.send([(RECIPIENT, 5000, 'satoshi')], fee=1, leases=store)
+
+    # With leases the UTXOs are not combined by default.
+    assert len(store.leased()) == 1
+    assert len(private_key.unspents) == 3
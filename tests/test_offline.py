@@ -0,0 +1,107 @@
+from io import BytesIO
+
+import pytest
+
+from lit.network.meta import Unspent
+from lit.offline import (
+    PREPARED_HEADER, PREPARED_MAGIC, decode_prepared, encode_prepared, prepared_from_bytes,
+    prepared_to_bytes, read_prepared, sign_prepared, write_prepared
+)
+from lit.transaction import create_p2pkh_transaction
+from lit.wallet import PrivateKeyTestnet
+from .samples import RECIPIENT, RECIPIENT_SCRIPT, TXID, WALLET_FORMAT_COMPRESSED_TEST, make_unspents
+
+
+def make_prepared(n):
+    unspents = [Unspent(10000 + i, i, RECIPIENT_SCRIPT, TXID, i) for i in range(n)]
+    outputs = [(RECIPIENT, 5000 * n), (b'hello', 0)]
+    return unspents, outputs
+
+
+class TestEncodePrepared:
+    def test_roundtrip(self):
+        unspents, outputs = make_prepared(3)
+        assert decode_prepared(encode_prepared(unspents, outputs)) == (unspents, outputs)
+
+    def test_confirmations_kept(self):
+        unspents, outputs = make_prepared(3)
+        decoded, _ = decode_prepared(encode_prepared(unspents, outputs))
+        assert [unspent.confirmations for unspent in decoded] == [0, 1, 2]
+
+    def test_smaller_than_json(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_unspents(RECIPIENT_SCRIPT, 3)
+        outputs = [(RECIPIENT, 5000, 'satoshi')]
+
+        prepared_json = private_key.prepare_transaction(
+            private_key.address, outputs, fee=1, unspents=unspents
+        )
+        prepared = private_key.prepare_transaction(
+            private_key.address, outputs, fee=1, unspents=unspents, as_bytes=True
+        )
+
+        assert len(prepared) < len(prepared_json) / 2
+
+    def test_truncated(self):
+        record = encode_prepared(*make_prepared(2))
+        with pytest.raises(ValueError):
+            decode_prepared(record[:-1])
+        with pytest.raises(ValueError):
+            decode_prepared(record + b'\x00')
+
+
+class TestReadPrepared:
+    def test_stream(self):
+        transactions = [make_prepared(n) for n in range(1, 300)]
+        stream = BytesIO()
+
+        assert write_prepared(stream, iter(transactions)) == len(transactions)
+
+        stream.seek(0)
+        assert list(read_prepared(stream)) == transactions
+
+    def test_empty(self):
+        assert list(read_prepared(BytesIO(PREPARED_HEADER))) == []
+
+    def test_bad_magic(self):
+        with pytest.raises(ValueError):
+            list(read_prepared(BytesIO(b'{"unspents":[]}')))
+
+    def test_unsupported_version(self):
+        with pytest.raises(ValueError):
+            list(read_prepared(BytesIO(PREPARED_MAGIC + b'\x02')))
+
+    def test_truncated(self):
+        data = prepared_to_bytes(*make_prepared(2))
+        with pytest.raises(ValueError):
+            list(read_prepared(BytesIO(data[:-1])))
+
+    def test_truncated_length(self):
+        data = prepared_to_bytes(*make_prepared(300))
+        assert data[len(PREPARED_HEADER)] == 0xfd
+
+        with pytest.raises(ValueError, match='truncated'):
+            list(read_prepared(BytesIO(data[:len(PREPARED_HEADER) + 1])))
+
+
+def test_prepared_from_bytes():
+    unspents, outputs = make_prepared(2)
+    assert prepared_from_bytes(prepared_to_bytes(unspents, outputs)) == (unspents, outputs)
+
+    stream = BytesIO()
+    write_prepared(stream, [make_prepared(1), make_prepared(2)])
+    with pytest.raises(ValueError):
+        prepared_from_bytes(stream.getvalue())
+
+
+def test_sign_prepared():
+    private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+    transactions = [make_prepared(n) for n in range(1, 4)]
+    stream = BytesIO()
+    write_prepared(stream, transactions)
+    stream.seek(0)
+
+    assert list(sign_prepared(private_key, stream)) == [
+        create_p2pkh_transaction(private_key, unspents, outputs)
+        for unspents, outputs in transactions
+    ]
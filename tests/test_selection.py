@@ -0,0 +1,93 @@
+import pytest
+
+from lit.exceptions import InsufficientFunds
+from lit.network.meta import Unspent
+from lit.selection import UnspentIndex, branch_and_bound
+
+
+def make_unspents(*amounts):
+    return [Unspent(amount, 0, '', '', i) for i, amount in enumerate(amounts)]
+
+
+class TestBranchAndBound:
+    def test_exact(self):
+        values = [9, 7, 5, 3, 1]
+        selection = branch_and_bound(values, 8, 0)
+        assert sum(values[i] for i in selection) == 8
+
+    def test_window(self):
+        values = [10, 6, 4]
+        selection = branch_and_bound(values, 9, 1)
+        assert sum(values[i] for i in selection) == 10
+
+    def test_prefers_least_excess(self):
+        values = [12, 11, 5, 5]
+        selection = branch_and_bound(values, 10, 2)
+        assert sum(values[i] for i in selection) == 10
+
+    def test_no_match(self):
+        assert branch_and_bound([10, 6], 5, 0) is None
+        assert branch_and_bound([2, 1], 5, 10) is None
+
+
+class TestUnspentIndex:
+    def test_sorted(self):
+        index = UnspentIndex(make_unspents(300, 100, 200))
+        assert [unspent.amount for unspent in index] == [100, 200, 300]
+        assert index.total == 600
+        assert len(index) == 3
+
+    def test_add_remove(self):
+        unspents = make_unspents(300, 100, 200)
+        index = UnspentIndex(unspents[:2])
+        index.add(unspents[2])
+        assert unspents[2] in index
+        assert index.total == 600
+
+        index.remove(unspents[0])
+        assert unspents[0] not in index
+        assert index.total == 300
+
+        with pytest.raises(ValueError):
+            index.remove(unspents[0])
+
+    def test_scripts(self):
+        unspents = [Unspent(1000 * (i + 1), 0, script, '', i) for i, script in enumerate('aab')]
+        index = UnspentIndex(unspents[:2])
+        assert set(index.scripts) == {'a'}
+
+        index.add(unspents[2])
+        assert set(index.scripts) == {'a', 'b'}
+
+        index.remove(unspents[0])
+        index.remove(unspents[2])
+        assert set(index.scripts) == {'a'}
+
+    def test_select_changeless(self):
+        index = UnspentIndex(make_unspents(5000, 3000, 2000, 1000))
+        selected, changeless = index.select(4000)
+        assert changeless
+        assert sum(unspent.amount for unspent in selected) == 4000
+
+    def test_select_changeless_input_cost(self):
+        index = UnspentIndex(make_unspents(5000, 3100, 2100, 1000))
+        selected, changeless = index.select(5000, input_cost=100)
+        assert changeless
+        assert sorted(unspent.amount for unspent in selected) == [2100, 3100]
+
+    def test_select_single_covering(self):
+        index = UnspentIndex(make_unspents(1000, 1000, 7000, 9000))
+        selected, changeless = index.select(1500, change_cost=10)
+        assert not changeless
+        assert selected == [Unspent(7000, 0, '', '', 2)]
+
+    def test_select_largest_first(self):
+        index = UnspentIndex(make_unspents(1000, 2000, 3000, 4000))
+        selected, changeless = index.select(6500, change_cost=10)
+        assert not changeless
+        assert [unspent.amount for unspent in selected] == [4000, 3000]
+
+    def test_select_insufficient(self):
+        index = UnspentIndex(make_unspents(1000, 2000))
+        with pytest.raises(InsufficientFunds):
+            index.select(3000, input_cost=1)
@@ -0,0 +1,125 @@
+import pytest
+
+from lit.format import verify_sig
+from lit.sweep import fetch_groups, plan_sweep, sweep
+from lit.transaction import (
+    LegacySighash, SegwitSighash, construct_output_block, create_multikey_transaction,
+    create_p2pkh_transaction, deserialize, public_key_to_scripts
+)
+from lit.utils import bytes_to_hex
+from lit.wallet import PrivateKeyTestnet
+from .samples import (
+    RECIPIENT as LEFTOVER, WALLET_FORMAT_COMPRESSED_TEST, WALLET_FORMAT_TEST, make_unspents
+)
+
+
+def make_groups(n_keys=3, n_unspents=2):
+    groups = []
+    for i in range(n_keys):
+        key = PrivateKeyTestnet(WALLET_FORMAT_TEST if i == 0 else None)
+        # The first key is uncompressed and can only have P2PKH UTXOs.
+        script = bytes_to_hex(public_key_to_scripts(key.public_key)[-1])
+        groups.append((key, make_unspents(script, n_unspents, start=i * n_unspents)))
+    return groups
+
+
+class TestCreateMultikeyTransaction:
+    def test_each_input_signed_by_its_key(self):
+        groups = make_groups()
+        outputs = [(LEFTOVER, 50000)]
+        parsed = deserialize(create_multikey_transaction(groups, outputs, as_bytes=True))
+
+        keys = [key for key, unspents in groups for _ in unspents]
+        unspents = [unspent for _, unspents in groups for unspent in unspents]
+        output_block = construct_output_block(outputs)
+        legacy = LegacySighash(parsed.inputs, output_block, len(outputs))
+        bip143 = SegwitSighash(parsed.inputs, output_block)
+
+        for i, (txin, key) in enumerate(zip(parsed.inputs, keys)):
+            scripts = public_key_to_scripts(key.public_key)
+
+            if key.is_compressed():
+                witness = bytes(txin.witness)
+                signature = witness[2:2 + witness[1] - 1]
+                digest = bip143.digest(i, scripts[0], unspents[i].amount)
+            else:
+                script_sig = bytes(txin.script)
+                signature = script_sig[1:1 + script_sig[0] - 1]
+                digest = legacy.digest(i, scripts[0])
+
+            assert verify_sig(signature, digest, key.public_key)
+
+    def test_single_key_matches(self):
+        key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_unspents('', 3)
+        outputs = [(LEFTOVER, 20000)]
+
+        assert create_multikey_transaction([(key, unspents[:1]), (key, unspents[1:])], outputs) == \
+            create_p2pkh_transaction(key, unspents, outputs)
+
+
+class TestPlanSweep:
+    def test_groups_keep_owners(self):
+        groups = make_groups(n_keys=4, n_unspents=3)
+        plan = plan_sweep(groups, LEFTOVER, 1, max_size=1200)
+
+        assert len(plan) > 1
+        owners = {(unspent.txid, unspent.txindex): key for key, unspents in groups for unspent in unspents}
+        swept = []
+        for batch_groups, outputs in plan.batches:
+            assert outputs[0][0] == LEFTOVER
+            for key, unspents in batch_groups:
+                assert all(owners[(unspent.txid, unspent.txindex)] is key for unspent in unspents)
+                swept.extend(unspents)
+
+        assert len(swept) == 12
+
+    def test_fee_paid_once_per_transaction(self):
+        groups = make_groups()
+        plan = plan_sweep(groups, LEFTOVER, 1)
+
+        assert len(plan) == 1
+        assert plan.batches[0][1][0][1] == 60000 - plan.fee
+
+
+def test_fetch_groups(monkeypatch):
+    groups = make_groups()
+    by_address = {key.address: unspents for key, unspents in groups}
+    monkeypatch.setattr('lit.wallet.NetworkAPI.get_unspent_testnet',
+                        lambda address: list(by_address.get(address, [])))
+
+    empty = PrivateKeyTestnet()
+    fetched = fetch_groups([key for key, _ in groups] + [empty], workers=2)
+
+    assert [key for key, _ in fetched] == [key for key, _ in groups]
+    assert [unspents for _, unspents in fetched] == [unspents for _, unspents in groups]
+
+
+def test_sweep(monkeypatch):
+    groups = make_groups()
+    broadcast = []
+    monkeypatch.setattr('lit.sweep.NetworkAPI.broadcast_tx_testnet', broadcast.append)
+
+    for key, unspents in groups:
+        key.unspents[:] = unspents
+
+    txids = sweep([key for key, _ in groups], LEFTOVER, fee=1, groups=groups, workers=2)
+
+    assert len(broadcast) == 1
+    assert txids == [deserialize(broadcast[0]).txid]
+    assert all(key.unspents == [] for key, _ in groups)
+
+
+def test_sweep_groups_only(monkeypatch):
+    groups = make_groups()
+    broadcast = []
+    monkeypatch.setattr('lit.sweep.NetworkAPI.broadcast_tx_testnet', broadcast.append)
+
+    assert sweep([], LEFTOVER, fee=1, groups=groups) == [deserialize(broadcast[0]).txid]
+
+
+def test_sweep_nothing():
+    with pytest.raises(ValueError):
+        sweep([], LEFTOVER, fee=1)
+    with pytest.raises(ValueError):
+        sweep([], LEFTOVER, fee=1, groups=[])
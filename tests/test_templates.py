@@ -0,0 +1,71 @@
+import pytest
+
+from lit.bech32 import segwit_encode
+from lit.templates import PayoutTemplate
+from lit.transaction import (
+    construct_output_block, create_p2pkh_transaction, deserialize, sanitize_tx_data
+)
+from lit.wallet import PrivateKeyTestnet
+from .samples import (
+    LITECOIN_ADDRESS_TEST, LITECOIN_ADDRESS_TEST_PAY2SH, WALLET_FORMAT_COMPRESSED_TEST, make_unspents
+)
+
+DESTINATIONS = [
+    LITECOIN_ADDRESS_TEST,
+    LITECOIN_ADDRESS_TEST_PAY2SH,
+    segwit_encode('tltc', 0, bytes(20)),
+    LITECOIN_ADDRESS_TEST,
+]
+
+
+class TestPayoutTemplate:
+    def test_output_block(self):
+        template = PayoutTemplate(DESTINATIONS)
+        outputs = template.outputs([1000, 2000, 3000, 4000])
+        assert template.output_block(outputs) == construct_output_block(outputs)
+
+    def test_message_output(self):
+        template = PayoutTemplate(DESTINATIONS)
+        outputs = template.outputs([1000, 2000, 3000, 4000]) + [(b'hello', 0)]
+
+        assert template.output_block(outputs) == construct_output_block(outputs)
+        assert b'hello' not in template._scripts
+
+    def test_compiles_new_destination(self):
+        template = PayoutTemplate(DESTINATIONS[:1])
+        outputs = [(LITECOIN_ADDRESS_TEST_PAY2SH, 1000)]
+        assert template.output_block(outputs) == construct_output_block(outputs)
+        assert template.output_block(outputs) == construct_output_block(outputs)
+
+    def test_amount_count(self):
+        with pytest.raises(ValueError):
+            PayoutTemplate(DESTINATIONS).outputs([1000])
+
+    def test_invalid_address(self):
+        with pytest.raises(ValueError):
+            PayoutTemplate(['mtrNwJxS1VyHYn3qBY1Qfsm3K3kh1mGRMt'])
+
+    def test_create_transaction_matches(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_unspents('', 3, amount=100000)
+        amounts = [1000, 2000, 3000, 4000]
+        template = PayoutTemplate(DESTINATIONS)
+
+        selected, outputs = sanitize_tx_data(
+            unspents, [(dest, amount, 'satoshi') for dest, amount in zip(DESTINATIONS, amounts)],
+            5, private_key.address, combine=False
+        )
+
+        assert template.create_transaction(private_key, unspents, amounts, fee=5, combine=False) == \
+            create_p2pkh_transaction(private_key, selected, outputs)
+
+    def test_leftover(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_unspents('', 1, amount=100000)
+        template = PayoutTemplate(DESTINATIONS[:1], leftover=LITECOIN_ADDRESS_TEST_PAY2SH)
+
+        tx = deserialize(template.create_transaction(private_key, unspents, [1000], fee=1,
+                                                     replaceable=True))
+
+        assert tx.replaceable
+        assert bytes(tx.outputs[1].script)[:2] == b'\xa9\x14'
@@ -1,14 +1,24 @@
 import pytest
 
+from lit.bech32 import segwit_encode
+from lit.crypto import double_sha256, sha256
 from lit.exceptions import InsufficientFunds
+from lit.format import verify_sig
 from lit.network.meta import Unspent
 from lit.transaction import (
-    TxIn, calc_txid, create_p2pkh_transaction, construct_input_block,
-    construct_output_block, estimate_tx_fee, sanitize_tx_data
+    INCREMENTAL_RELAY_FEE, RBF_SEQUENCE, ConsolidationPlan, LegacySighash, SegwitSighash,
+    TxIn, TxObj, TxOut, TxWriter, address_to_scriptpubkey, bump_fee, calc_cpfp_fee,
+    calc_output_block_size, calc_tx_size, calc_tx_vsize,
+    calc_txid, calc_txid_bytes, create_consolidation, create_p2pkh_transaction,
+    construct_input_block, construct_output_block, deserialize, estimate_tx_fee,
+    get_script_kind, public_key_to_scripts, sanitize_tx_data, plan_consolidation, plan_cpfp,
+    sign_digests, write_input_block
+)
+from lit.utils import bytes_to_hex, hex_to_bytes
+from lit.wallet import PrivateKey, PrivateKeyTestnet
+from .samples import (
+    LITECOIN_ADDRESS_TEST_PAY2SH, WALLET_FORMAT_COMPRESSED_TEST, WALLET_FORMAT_MAIN
 )
-from lit.utils import hex_to_bytes
-from lit.wallet import PrivateKey
-from .samples import WALLET_FORMAT_MAIN
 
 
 RETURN_ADDRESS = 'n2eMqTT929pb1RDNuqEnxdaLau1rxy3efi'
@@ -62,6 +72,14 @@ OUTPUT_BLOCK_MESSAGES = ('50c30000000000001976a914e7c1345fc8f87c68170b3aa798a956
                          '0888fc04000000001976a91492461bde6283b461ece7ddf4dbf1e0a48bd113d888ac'
                          '0000000000000000076a0568656c6c6f'
                          '0000000000000000076a057468657265')
+# The native P2WPKH example of BIP143, signing its second input.
+BIP143_UNSIGNED_TX = ('0100000002fff7f7881a8099afa6940d42d1e7f6362bec38171ea3edf433541db4e4ad'
+                      '969f0000000000eeffffffef51e1b804cc89d182d279655c3aa89e815b1b309fe287d9'
+                      'b2b55d57b90ec68a0100000000ffffffff02202cb206000000001976a9148280b37df3'
+                      '78db99f66f85c95a783a76ac7a6d5988ac9093510d000000001976a9143bde42dbee7e'
+                      '4dbe6a21b2d50ce2f0167faa815988ac11000000')
+BIP143_SCRIPT_CODE = '76a9141d0f172a0ecb48aee1be1f2687d2963ae33f71a188ac'
+BIP143_SIGHASH = 'c37af31116d1b27caf68aae9e3ac82f1477929014d5b917657d0eb49478cb670'
 SIGNED_DATA = (b'\x85\xc7\xf6\xc6\x80\x13\xc2g\xd3t\x8e\xb8\xb4\x1f\xcc'
                b'\x92x~\n\x1a\xac\xc0\xf0\xff\xf7\xda\xfe0\xb7!6t')
 
@@ -87,6 +105,172 @@ class TestTxIn:
         assert repr(txin) == "TxIn(b'script', {}, b'txid', {})" \
                              "".format(repr(b'\x06'), repr(b'\x04'))
 
+    def test_sequence(self):
+        txin1 = TxIn(b'script', b'\x06', b'txid', b'\x04')
+        txin2 = TxIn(b'script', b'\x06', b'txid', b'\x04', b'\xfd\xff\xff\xff')
+        assert txin1 != txin2
+        assert repr(txin2).endswith("{})".format(repr(b'\xfd\xff\xff\xff')))
+
+
+class TestDeserialize:
+    def test_fields(self):
+        tx = deserialize(FINAL_TX_1)
+        assert isinstance(tx, TxObj)
+        assert tx.version == 1
+        assert tx.locktime == 0
+        assert len(tx.inputs) == 1
+        assert tx.inputs[0].txid == INPUTS[0].txid
+        assert tx.inputs[0].txindex == INPUTS[0].txindex
+        assert tx.inputs[0].script_len == b'\x8a'
+        assert tx.outputs == [
+            TxOut(b'\x50\xc3\x00\x00\x00\x00\x00\x00', b'\x19', construct_output_block(OUTPUTS[:1])[9:]),
+            TxOut((83658760).to_bytes(8, 'little'), b'\x19', construct_output_block(OUTPUTS[1:])[9:])
+        ]
+
+    def test_zero_copy(self):
+        tx = deserialize(hex_to_bytes(FINAL_TX_1))
+        assert isinstance(tx.inputs[0].script, memoryview)
+        assert tx.inputs[0].script.obj is tx.outputs[0].script.obj
+
+    def test_txid(self):
+        assert deserialize(FINAL_TX_1).txid == calc_txid(FINAL_TX_1)
+
+    def test_roundtrip(self):
+        tx = hex_to_bytes(FINAL_TX_1)
+        parsed = deserialize(tx)
+        writer = TxWriter()
+        writer.write(tx[:4])
+        writer.write_varint(len(parsed.inputs))
+        write_input_block(writer, parsed.inputs)
+        writer.write_varint(len(parsed.outputs))
+        writer.write(construct_output_block(OUTPUTS))
+        writer.write(tx[-4:])
+        assert writer.getvalue() == tx
+
+    def test_truncated(self):
+        with pytest.raises(ValueError):
+            deserialize(FINAL_TX_1[:-10]).inputs
+
+    def test_trailing_data(self):
+        with pytest.raises(ValueError):
+            deserialize(FINAL_TX_1 + '00').outputs
+
+
+class TestTxWriter:
+    def test_write(self):
+        writer = TxWriter()
+        writer.write(b'\x01\x02')
+        writer.write(b'\x03')
+        assert writer.getvalue() == b'\x01\x02\x03'
+        assert len(writer) == 3
+
+    def test_integers(self):
+        writer = TxWriter()
+        writer.write_uint32(1)
+        writer.write_uint64(50000)
+        writer.write_varint(253)
+        assert writer.getvalue() == (b'\x01\x00\x00\x00'
+                                     b'\x50\xc3\x00\x00\x00\x00\x00\x00'
+                                     b'\xfd\xfd\x00')
+
+
+class TestLegacySighash:
+    def test_digest(self):
+        inputs = [TxIn(hex_to_bytes(UNSPENTS[0].script), b'\x19',
+                       INPUTS[0].txid, INPUTS[0].txindex)]
+        sighash = LegacySighash(inputs, construct_output_block(OUTPUTS), len(OUTPUTS))
+        assert sighash.digest(0) == SIGNED_DATA
+
+    def test_digests_match_digest(self):
+        inputs = [TxIn(hex_to_bytes(UNSPENTS[0].script), b'\x19',
+                       INPUTS[0].txid, i.to_bytes(4, byteorder='little'))
+                  for i in range(5)]
+        sighash = LegacySighash(inputs, construct_output_block(OUTPUTS), len(OUTPUTS))
+        digests = list(sighash.digests())
+        assert len(set(digests)) == 5
+        assert digests == [sighash.digest(i) for i in range(5)]
+
+    def test_script_code(self):
+        inputs = [TxIn(b'', b'\x00', INPUTS[0].txid, INPUTS[0].txindex)]
+        sighash = LegacySighash(inputs, construct_output_block(OUTPUTS), len(OUTPUTS))
+        assert sighash.digest(0, hex_to_bytes(UNSPENTS[0].script)) == SIGNED_DATA
+
+
+class TestSegwitSighash:
+    def test_bip143(self):
+        tx = hex_to_bytes(BIP143_UNSIGNED_TX)
+        parsed = deserialize(tx)
+        output_block = b''.join(
+            bytes(txout.amount) + bytes(txout.script_len) + bytes(txout.script)
+            for txout in parsed.outputs
+        )
+
+        sighash = SegwitSighash(parsed.inputs, output_block, tx[:4], tx[-4:])
+        digest = sighash.digest(1, hex_to_bytes(BIP143_SCRIPT_CODE), 600000000)
+
+        # Signing hashes the digest once more.
+        assert bytes_to_hex(sha256(digest)) == BIP143_SIGHASH
+
+
+def make_segwit_unspents(private_key):
+    p2pkh, p2wpkh, p2sh = (bytes_to_hex(script) for script in public_key_to_scripts(private_key.public_key))
+    return [Unspent(10000 * (i + 1), 1, script, UNSPENTS[0].txid, i)
+            for i, script in enumerate((p2wpkh, p2sh, p2pkh))]
+
+
+class TestCreateSegwitTransaction:
+    def test_signatures(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, OUTPUTS[:1], as_bytes=True)
+        parsed = deserialize(tx)
+
+        assert parsed.segwit
+        p2wpkh, p2sh, p2pkh = parsed.inputs
+        assert bytes(p2wpkh.script) == b''
+        assert bytes(p2sh.script) == b'\x16' + public_key_to_scripts(private_key.public_key)[1]
+        assert bytes(p2pkh.witness) == b'\x00'
+
+        script_code = public_key_to_scripts(private_key.public_key)[0]
+        sighash = SegwitSighash(parsed.inputs, construct_output_block(OUTPUTS[:1]))
+
+        for i, txin in enumerate(parsed.inputs[:2]):
+            witness = bytes(txin.witness)
+            assert witness[0] == 2
+            signature = witness[2:2 + witness[1] - 1]
+            assert verify_sig(signature, sighash.digest(i, script_code, unspents[i].amount),
+                              private_key.public_key)
+
+    def test_txid_excludes_witness(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        tx = create_p2pkh_transaction(private_key, make_segwit_unspents(private_key)[:1],
+                                      OUTPUTS[:1], as_bytes=True)
+        parsed = deserialize(tx)
+
+        witness = bytes(parsed.inputs[0].witness)
+        stripped = tx[:4] + tx[6:-4 - len(witness)] + tx[-4:]
+        assert parsed.txid == bytes_to_hex(double_sha256(stripped)[::-1])
+        assert calc_txid_bytes(tx) == parsed.txid
+        assert parsed.weight == len(stripped) * 3 + len(tx)
+
+    def test_vsize_bound(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, OUTPUTS, as_bytes=True)
+        estimate = calc_tx_vsize(unspents, calc_output_block_size(OUTPUTS))
+        assert 0 <= estimate - deserialize(tx).vsize <= 3
+
+    def test_foreign_unspent(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(PrivateKeyTestnet())
+        with pytest.raises(ValueError):
+            create_p2pkh_transaction(private_key, unspents[:1], OUTPUTS[:1])
+
+    def test_legacy_unchanged(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)[2:]
+        assert not deserialize(create_p2pkh_transaction(private_key, unspents, OUTPUTS)).segwit
+
 
 class TestSanitizeTxData:
     def test_no_input(self):
@@ -157,6 +341,18 @@ class TestSanitizeTxData:
                 combine=True, message=None
             )
 
+    def test_no_combine_segwit_fee(self):
+        unspents_original = [Unspent(100000, 0, '0014' + '00' * 20, '', 0)]
+        outputs_original = [('test', 2000, 'satoshi')]
+
+        unspents, outputs = sanitize_tx_data(
+            unspents_original, outputs_original, fee=1, leftover=RETURN_ADDRESS,
+            combine=False, message=None
+        )
+
+        assert 100000 - 2000 - outputs[1][1] == calc_tx_vsize(unspents, calc_output_block_size(outputs))
+        assert 100000 - 2000 - outputs[1][1] < calc_tx_size(1, calc_output_block_size(outputs))
+
     def test_no_combine_remaining(self):
         unspents_original = [Unspent(7000, 0, '', '', 0),
                              Unspent(3000, 0, '', '', 0)]
@@ -172,6 +368,32 @@ class TestSanitizeTxData:
         assert outputs[1][0] == RETURN_ADDRESS
         assert outputs[1][1] == 1000
 
+    def test_no_combine_changeless(self):
+        unspents_original = [Unspent(7000, 0, '', '', 0),
+                             Unspent(3000, 0, '', '', 0),
+                             Unspent(2000, 0, '', '', 0)]
+        outputs_original = [('test', 2000, 'satoshi')]
+
+        unspents, outputs = sanitize_tx_data(
+            unspents_original, outputs_original, fee=0, leftover=RETURN_ADDRESS,
+            combine=False, message=None
+        )
+
+        assert unspents == [Unspent(2000, 0, '', '', 0)]
+        assert outputs == [('test', 2000)]
+
+    def test_no_combine_fee_counts_selected_inputs(self):
+        unspents_original = [Unspent(100000, 0, '', '', i) for i in range(10)]
+        outputs_original = [('test', 2000, 'satoshi')]
+
+        unspents, outputs = sanitize_tx_data(
+            unspents_original, outputs_original, fee=1, leftover=RETURN_ADDRESS,
+            combine=False, message=None
+        )
+
+        assert len(unspents) == 1
+        assert outputs[1][1] == 100000 - 2000 - estimate_tx_fee(1, 2, 1, True)
+
     def test_no_combine_insufficient_funds(self):
         unspents_original = [Unspent(1000, 0, '', '', 0),
                              Unspent(1000, 0, '', '', 0)]
@@ -184,12 +406,187 @@ class TestSanitizeTxData:
             )
 
 
+class TestSignDigests:
+    def test_serial(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        digests = [bytes([i]) * 32 for i in range(3)]
+        assert sign_digests(private_key, digests) == [private_key.sign(d) for d in digests]
+
+    def test_workers_keep_order(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        digests = [bytes([i]) * 32 for i in range(9)]
+        assert sign_digests(private_key, digests, workers=4) == sign_digests(private_key, digests)
+
+
+class TestPlanConsolidation:
+    def test_single_transaction(self):
+        unspents = [Unspent(10000, 0, '', '', i) for i in range(3)]
+        plan = plan_consolidation(unspents, RETURN_ADDRESS, 1)
+        size = calc_tx_size(3, calc_output_block_size([(RETURN_ADDRESS, 1)]))
+
+        assert isinstance(plan, ConsolidationPlan)
+        assert len(plan) == 1
+        assert plan.size == size
+        assert plan.fee == size
+        assert plan.batches == [(unspents, [(RETURN_ADDRESS, 30000 - size)])]
+
+    def test_split_by_size(self):
+        unspents = [Unspent(10000, 0, '', '', i) for i in range(25)]
+        plan = plan_consolidation(unspents, RETURN_ADDRESS, 1, max_size=1500)
+
+        assert len(plan) == 3
+        assert [len(batch[0]) for batch in plan.batches] == [9, 8, 8]
+        assert all(calc_tx_size(len(batch[0]), 35) <= 1500 for batch in plan.batches)
+        assert sum(batch[1][0][1] for batch in plan.batches) + plan.fee == 250000
+
+    def test_skips_dust(self):
+        unspents = [Unspent(10000, 0, '', '', 0), Unspent(100, 0, '', '', 1)]
+        plan = plan_consolidation(unspents, RETURN_ADDRESS, 1)
+        assert plan.batches[0][0] == unspents[:1]
+
+    def test_too_small(self):
+        with pytest.raises(ValueError):
+            plan_consolidation([Unspent(10000, 0, '', '', 0)], RETURN_ADDRESS, 1, max_size=100)
+
+    def test_no_input(self):
+        with pytest.raises(ValueError):
+            plan_consolidation([Unspent(100, 0, '', '', 0)], RETURN_ADDRESS, 1)
+
+
+def test_create_consolidation():
+    private_key = PrivateKey(WALLET_FORMAT_MAIN)
+    unspents = [Unspent(10000, 0, UNSPENTS[0].script, UNSPENTS[0].txid, i) for i in range(5)]
+    plan = plan_consolidation(unspents, RETURN_ADDRESS, 1, max_size=600, compressed=False)
+
+    expected = [create_p2pkh_transaction(private_key, *batch) for batch in plan.batches]
+
+    assert len(plan) == 2
+    assert create_consolidation(private_key, plan, workers=2) == expected
+    assert create_consolidation(private_key, plan, workers=64) == expected
+    assert create_consolidation(private_key, plan) == expected
+
+
 class TestCreateSignedTransaction:
     def test_matching(self):
         private_key = PrivateKey(WALLET_FORMAT_MAIN)
         tx = create_p2pkh_transaction(private_key, UNSPENTS, OUTPUTS)
         assert tx[-288:] == FINAL_TX_1[-288:]
 
+    def test_as_bytes(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        tx = create_p2pkh_transaction(private_key, UNSPENTS, OUTPUTS, as_bytes=True)
+        assert isinstance(tx, bytes)
+        assert tx == hex_to_bytes(create_p2pkh_transaction(private_key, UNSPENTS, OUTPUTS))
+
+    def test_workers_deterministic(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        unspents = [Unspent(1000, 0, UNSPENTS[0].script, UNSPENTS[0].txid, i) for i in range(6)]
+        assert create_p2pkh_transaction(private_key, unspents, OUTPUTS, workers=3) == \
+            create_p2pkh_transaction(private_key, unspents, OUTPUTS)
+
+
+def make_replaceable(private_key, unspents, fee=1):
+    total_in = sum(unspent.amount for unspent in unspents)
+    outputs = [(RETURN_ADDRESS, 5000), (private_key.address, total_in - 5000)]
+    size = calc_tx_vsize(unspents, calc_output_block_size(outputs))
+    outputs[1] = (private_key.address, outputs[1][1] - size * fee)
+    return create_p2pkh_transaction(private_key, unspents, outputs, as_bytes=True,
+                                    replaceable=True)
+
+
+class TestBumpFee:
+    def test_replaceable(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)
+        tx = make_replaceable(private_key, unspents)
+
+        assert deserialize(tx).replaceable
+        assert all(bytes(txin.sequence) == RBF_SEQUENCE for txin in deserialize(tx).inputs)
+        assert not deserialize(create_p2pkh_transaction(private_key, unspents, OUTPUTS)).replaceable
+
+    def test_only_change_reduced(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)
+        tx = make_replaceable(private_key, unspents)
+        old, new = deserialize(tx), deserialize(bump_fee(private_key, tx, unspents, 10, as_bytes=True))
+
+        assert new.replaceable
+        assert [bytes(txin.txid) + bytes(txin.txindex) for txin in new.inputs] == \
+            [bytes(txin.txid) + bytes(txin.txindex) for txin in old.inputs]
+        assert bytes(new.outputs[0].amount) == bytes(old.outputs[0].amount)
+        assert bytes(new.outputs[1].script) == bytes(old.outputs[1].script)
+
+        total_in = sum(unspent.amount for unspent in unspents)
+        new_fee = total_in - sum(int.from_bytes(txout.amount, 'little') for txout in new.outputs)
+        assert 0 <= new_fee - new.vsize * 10 <= 3 * 10
+
+    def test_incremental_fee(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)
+        tx = make_replaceable(private_key, unspents, fee=5)
+        new = deserialize(bump_fee(private_key, tx, unspents, 5))
+
+        old_change = int.from_bytes(deserialize(tx).outputs[1].amount, 'little')
+        new_change = int.from_bytes(new.outputs[1].amount, 'little')
+        assert old_change - new_change >= new.vsize * INCREMENTAL_RELAY_FEE
+
+    def test_not_replaceable(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, OUTPUTS[:1])
+        with pytest.raises(ValueError):
+            bump_fee(private_key, tx, unspents, 10)
+
+    def test_missing_unspent(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)
+        tx = make_replaceable(private_key, unspents)
+        with pytest.raises(ValueError):
+            bump_fee(private_key, tx, unspents[1:], 10)
+
+    def test_insufficient_change(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_segwit_unspents(private_key)
+        tx = make_replaceable(private_key, unspents)
+        with pytest.raises(InsufficientFunds):
+            bump_fee(private_key, tx, unspents, 1000)
+
+
+class TestPlanCpfp:
+    def test_calc_cpfp_fee(self):
+        assert calc_cpfp_fee([(200, 200)], 100, 10) == 2800
+        assert calc_cpfp_fee([(200, 200), (300, 300)], 100, 10) == 5500
+        # Parents paying enough on their own leave the child the relay minimum.
+        assert calc_cpfp_fee([(200, 5000)], 100, 10) == 100
+
+    def test_package_fee_rate(self):
+        payer = PrivateKeyTestnet()
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        parents = []
+
+        for i in range(3):
+            unspents = [Unspent(100000, 1, '', UNSPENTS[0].txid, i)]
+            tx = create_p2pkh_transaction(
+                payer, unspents, [(private_key.segwit_address, 50000), (payer.address, 49900)],
+                as_bytes=True
+            )
+            parents.append((tx, 100))
+
+        scripts = public_key_to_scripts(private_key.public_key)
+        unspents, outputs = plan_cpfp(parents, scripts, private_key.address, 20)
+        child = deserialize(create_p2pkh_transaction(private_key, unspents, outputs, as_bytes=True))
+
+        assert len(unspents) == 3 and len(outputs) == 1
+        child_fee = 150000 - outputs[0][1]
+        package_size = child.vsize + sum(deserialize(tx).vsize for tx, _ in parents)
+        assert (child_fee + 300) / package_size >= 20
+
+    def test_parent_not_paying_key(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        tx = create_p2pkh_transaction(PrivateKey(WALLET_FORMAT_MAIN), UNSPENTS, OUTPUTS)
+        with pytest.raises(ValueError):
+            plan_cpfp([(tx, 100)], public_key_to_scripts(private_key.public_key), RETURN_ADDRESS, 10)
+
 
 class TestEstimateTxFee:
     def test_accurate_compressed(self):
@@ -201,6 +598,62 @@ class TestEstimateTxFee:
     def test_none(self):
         assert estimate_tx_fee(5, 5, 0, True) == 0
 
+    def test_varint_counts(self):
+        assert estimate_tx_fee(253, 1, 1, True) - estimate_tx_fee(252, 1, 1, True) == 148 + 2
+
+
+class TestCalcTxSize:
+    def test_output_block_size(self):
+        assert calc_output_block_size(OUTPUTS) == 1 + len(hex_to_bytes(OUTPUT_BLOCK))
+        assert calc_output_block_size(OUTPUTS + MESSAGES) == \
+            1 + len(hex_to_bytes(OUTPUT_BLOCK_MESSAGES))
+
+    def test_signed_size_bound(self):
+        private_key = PrivateKey(WALLET_FORMAT_MAIN)
+        unspents = [Unspent(1000, 0, UNSPENTS[0].script, UNSPENTS[0].txid, i) for i in range(3)]
+        actual = len(create_p2pkh_transaction(private_key, unspents, OUTPUTS, as_bytes=True))
+        size = calc_tx_size(3, calc_output_block_size(OUTPUTS), compressed=False)
+        assert 0 <= size - actual <= 3 * 2
+
+    def test_matches_estimate(self):
+        assert calc_tx_size(1, calc_output_block_size(OUTPUTS)) * 70 == \
+            estimate_tx_fee(1, 2, 70, True)
+
+    def test_vsize_legacy(self):
+        unspents = UNSPENTS * 3
+        assert calc_tx_vsize(unspents, 70) == calc_tx_size(3, 70)
+        assert calc_tx_vsize(unspents, 70, compressed=False) == calc_tx_size(3, 70, compressed=False)
+
+    def test_vsize_segwit(self):
+        script = '0014' + '00' * 20
+        unspents = [Unspent(1000, 0, script, UNSPENTS[0].txid, i) for i in range(2)]
+        # Version, input count and lock time, 68 per input, and the marker
+        # and flag's half a byte rounded up.
+        assert calc_tx_vsize(unspents, 35) == 4 + 1 + 35 + 4 + 2 * 68 + 1
+
+    def test_script_kind(self):
+        assert get_script_kind(UNSPENTS[0].script) == 'p2pkh'
+        assert get_script_kind('0014' + '00' * 20) == 'p2wpkh'
+        assert get_script_kind('a914' + '00' * 20 + '87') == 'p2sh'
+        assert get_script_kind('') == 'p2pkh'
+
+    def test_bech32_output_size(self):
+        outputs = [(segwit_encode('ltc', 0, bytes(20)), 1000),
+                   (segwit_encode('tltc', 0, bytes(32)), 1000),
+                   (segwit_encode('ltc', 1, bytes(32)).upper(), 1000)]
+        assert calc_output_block_size(outputs) == 1 + len(construct_output_block(outputs))
+        assert address_to_scriptpubkey(outputs[0][0]) == b'\x00\x14' + bytes(20)
+        assert address_to_scriptpubkey(outputs[2][0]) == b'\x51\x20' + bytes(32)
+
+    def test_pay2sh_output_size(self):
+        outputs = [(LITECOIN_ADDRESS_TEST_PAY2SH, 1000)]
+        assert calc_output_block_size(outputs) == 1 + len(construct_output_block(outputs))
+        assert address_to_scriptpubkey(LITECOIN_ADDRESS_TEST_PAY2SH)[-1:] == b'\x87'
+
+    def test_message_outputs_are_smaller(self):
+        assert calc_output_block_size(OUTPUTS + MESSAGES) < \
+            calc_output_block_size(OUTPUTS) + 2 * 34
+
 
 class TestConstructOutputBlock:
     def test_no_message(self):
@@ -223,3 +676,7 @@ def test_construct_input_block():
 
 def test_calc_txid():
     assert calc_txid(FINAL_TX_1) == 'e6922a6e3f1ff422113f15543fbe1340a727441202f55519640a70ac4636c16f'
+
+
+def test_calc_txid_bytes():
+    assert calc_txid_bytes(hex_to_bytes(FINAL_TX_1)) == calc_txid(FINAL_TX_1)
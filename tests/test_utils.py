@@ -1,6 +1,9 @@
+import pytest
+
 from lit.utils import (
     Decimal, bytes_to_hex, chunk_data, flip_hex_byte_order, hex_to_bytes,
-    hex_to_int, int_to_hex, int_to_unknown_bytes
+    hex_to_int, int_to_hex, int_to_unknown_bytes, int_to_varint,
+    map_chunks, read_varint
 )
 
 BIG_INT = 123456789 ** 5
@@ -39,6 +42,36 @@ class TestIntToUnknownBytes:
         assert int_to_unknown_bytes(0) == b'\x00'
 
 
+class TestIntToVarint:
+    def test_one_byte(self):
+        assert int_to_varint(0) == b'\x00'
+        assert int_to_varint(252) == b'\xfc'
+
+    def test_two_bytes(self):
+        assert int_to_varint(253) == b'\xfd\xfd\x00'
+        assert int_to_varint(0xffff) == b'\xfd\xff\xff'
+
+    def test_four_bytes(self):
+        assert int_to_varint(0x10000) == b'\xfe\x00\x00\x01\x00'
+
+    def test_eight_bytes(self):
+        assert int_to_varint(0x100000000) == b'\xff\x00\x00\x00\x00\x01\x00\x00\x00'
+
+
+class TestReadVarint:
+    def test_roundtrip(self):
+        for num in (0, 252, 253, 0xffff, 0x10000, 0x100000000):
+            assert read_varint(b'\xaa' + int_to_varint(num) + b'\xbb', 1) == \
+                (num, 1 + len(int_to_varint(num)))
+
+    def test_truncated(self):
+        with pytest.raises(ValueError):
+            read_varint(b'\xfd\x00')
+
+        with pytest.raises(ValueError):
+            read_varint(b'', 0)
+
+
 class TestIntToHex:
     def test_default(self):
         assert int_to_hex(BIG_INT) == HEX
@@ -66,3 +99,19 @@ def test_chunk_data():
         '8a', '78', '1a', 'a6', 'b9', '67', '79', '84', 'd3', 'e0', 'bd',
         '0b', 'fc', '52', 'b9', 'f3', 'b0', '38', '85', 'a0', '0'
     ]
+
+
+def test_map_chunks():
+    read = []
+
+    def items():
+        for i in range(1000):
+            read.append(i)
+            yield i
+
+    results = map_chunks(sorted, items(), 2, 3)
+
+    assert next(results) == 0
+    # Only a window of chunks has been read, not the whole stream.
+    assert len(read) <= 3 * (2 * 2 + 2)
+    assert list(results) == list(range(1, 1000))
@@ -0,0 +1,113 @@
+import pytest
+
+from lit.network.meta import Unspent
+from lit.transaction import create_multikey_transaction, create_p2pkh_transaction
+from lit.verify import read_pushes, read_witness, verify_inputs, verify_transaction, verify_transactions
+from lit.wallet import PrivateKeyTestnet
+from .samples import (
+    RECIPIENT, TXID, WALLET_FORMAT_COMPRESSED_TEST, WALLET_FORMAT_TEST, make_key_unspents
+)
+
+
+class TestVerifyInputs:
+    def test_mixed_kinds(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_key_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, [(RECIPIENT, 50000)], as_bytes=True)
+
+        assert verify_inputs(tx, unspents) == [True, True, True]
+
+    def test_legacy(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_TEST)
+        unspents = make_key_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, [(RECIPIENT, 5000)])
+
+        assert verify_transaction(tx, unspents)
+
+    def test_multikey(self):
+        keys = [PrivateKeyTestnet(WALLET_FORMAT_TEST), PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)]
+        groups = [(key, make_key_unspents(key, 3 * i)) for i, key in enumerate(keys)]
+        tx = create_multikey_transaction(groups, [(RECIPIENT, 50000)])
+
+        assert verify_transaction(tx, [unspent for _, unspents in groups for unspent in unspents])
+
+    def test_wrong_amount(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_key_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, [(RECIPIENT, 50000)], as_bytes=True)
+
+        unspents[1] = Unspent(unspents[1].amount + 1, 1, unspents[1].script, TXID, 1)
+        assert verify_inputs(tx, unspents) == [True, False, True]
+
+    def test_wrong_key(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_key_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, [(RECIPIENT, 50000)], as_bytes=True)
+
+        # Signed correctly, but not by the owner of the outputs spent.
+        foreign = make_key_unspents(PrivateKeyTestnet())
+        assert verify_inputs(tx, foreign) == [False, False, False]
+
+    def test_tampered_output(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_key_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, [(RECIPIENT, 50000)], as_bytes=True)
+
+        amount = (50000).to_bytes(8, 'little')
+        tampered = tx.replace(amount, (50001).to_bytes(8, 'little'))
+        assert tampered != tx
+        assert verify_inputs(tampered, unspents) == [False, False, False]
+
+    def test_missing_unspent(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = make_key_unspents(private_key)
+        tx = create_p2pkh_transaction(private_key, unspents, [(RECIPIENT, 50000)])
+
+        with pytest.raises(ValueError):
+            verify_inputs(tx, unspents[1:])
+
+
+def test_verify_transactions():
+    private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+    transactions = []
+
+    for i in range(6):
+        unspents = make_key_unspents(private_key, 3 * i)
+        tx = create_p2pkh_transaction(private_key, unspents, [(RECIPIENT, 50000)])
+        transactions.append((tx, unspents if i != 4 else make_key_unspents(PrivateKeyTestnet(), 3 * i)))
+
+    expected = [True, True, True, True, False, True]
+    assert list(verify_transactions(transactions)) == expected
+    assert list(verify_transactions(iter(transactions), workers=3)) == expected
+
+
+def test_verify_transactions_streams():
+    private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+    unspents = make_key_unspents(private_key)
+    tx = create_p2pkh_transaction(private_key, unspents, [(RECIPIENT, 50000)])
+    read = []
+
+    def transactions():
+        for i in range(200):
+            read.append(i)
+            yield tx, unspents
+
+    results = verify_transactions(transactions(), workers=2)
+
+    assert next(results)
+    # Only a window of transactions has been read, not the whole stream.
+    assert len(read) <= 2 * 2 + 2
+    assert all(results)
+    assert len(read) == 200
+
+
+def test_read_pushes():
+    assert read_pushes(b'\x02ab\x4c\x01c') == [b'ab', b'c']
+    assert read_pushes(b'') == []
+    assert read_pushes(b'\x76\xa9') is None
+    assert read_pushes(b'\x05ab') is None
+
+
+def test_read_witness():
+    assert read_witness(b'\x02\x02ab\x01c') == [b'ab', b'c']
+    assert read_witness(b'\x00') == []
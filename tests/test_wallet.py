@@ -8,9 +8,12 @@ from lit.crypto import ECPrivateKey
 from lit.curve import Point
 from lit.format import verify_sig
 from lit.network import NetworkAPI
+from lit.network.meta import Unspent
+from lit.transaction import deserialize, public_key_to_scripts
+from lit.utils import bytes_to_hex
 from lit.wallet import BaseKey, Key, PrivateKey, PrivateKeyTestnet, wif_to_key
 from .samples import (
-    LITECOIN_ADDRESS, LITECOIN_ADDRESS_TEST, PRIVATE_KEY_BYTES, PRIVATE_KEY_DER,
+    LITECOIN_ADDRESS, LITECOIN_ADDRESS_TEST, LITECOIN_ADDRESS_TEST_PAY2SH, PRIVATE_KEY_BYTES, PRIVATE_KEY_DER,
     PRIVATE_KEY_HEX, PRIVATE_KEY_NUM, PRIVATE_KEY_PEM,
     PUBLIC_KEY_COMPRESSED, PUBLIC_KEY_UNCOMPRESSED, PUBLIC_KEY_X,
     PUBLIC_KEY_Y, WALLET_FORMAT_COMPRESSED_MAIN, WALLET_FORMAT_COMPRESSED_TEST,
@@ -134,6 +137,14 @@ class TestPrivateKey:
         assert private_key.address == LITECOIN_ADDRESS
         assert private_key.address == LITECOIN_ADDRESS
 
+    def test_segwit_address(self):
+        assert PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN).segwit_address.startswith('M')
+        assert PrivateKey(WALLET_FORMAT_MAIN).segwit_address is None
+
+    def test_bech32_address(self):
+        assert PrivateKey(WALLET_FORMAT_COMPRESSED_MAIN).bech32_address.startswith('ltc1q')
+        assert PrivateKey(WALLET_FORMAT_MAIN).bech32_address is None
+
     def test_to_wif(self):
         private_key = PrivateKey(WALLET_FORMAT_MAIN)
         assert private_key.to_wif() == WALLET_FORMAT_MAIN
@@ -194,6 +205,14 @@ class TestPrivateKeyTestnet:
         assert private_key.address == LITECOIN_ADDRESS_TEST
         assert private_key.address == LITECOIN_ADDRESS_TEST
 
+    def test_segwit_address(self):
+        assert PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST).segwit_address.startswith('Q')
+        assert PrivateKeyTestnet(WALLET_FORMAT_TEST).segwit_address is None
+
+    def test_bech32_address(self):
+        assert PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST).bech32_address.startswith('tltc1q')
+        assert PrivateKeyTestnet(WALLET_FORMAT_TEST).bech32_address is None
+
     def test_to_wif(self):
         private_key = PrivateKeyTestnet(WALLET_FORMAT_TEST)
         assert private_key.to_wif() == WALLET_FORMAT_TEST
@@ -211,6 +230,29 @@ class TestPrivateKeyTestnet:
         unspent = private_key.get_unspents()
         assert unspent == private_key.unspents
 
+    def test_get_unspents_segwit_unsupported(self, monkeypatch):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        scripts = public_key_to_scripts(private_key.public_key)
+        legacy, p2wpkh = bytes_to_hex(scripts[0]), bytes_to_hex(scripts[1])
+        known = Unspent(5000, 1, p2wpkh, '11' * 32, 0)
+        private_key.unspents[:] = [known, Unspent(7000, 1, legacy, '22' * 32, 0)]
+        fetched = Unspent(6000, 1, legacy, '33' * 32, 0)
+
+        def get_unspent(address):
+            if address not in reachable:
+                raise ConnectionError('All APIs are unreachable.')
+            return [fetched]
+
+        monkeypatch.setattr('lit.wallet.NetworkAPI.get_unspent_testnet', get_unspent)
+
+        reachable = {private_key.address}
+        assert private_key.get_unspents() == [fetched, known]
+        assert private_key.balance == 11000
+
+        reachable = set()
+        with pytest.raises(ConnectionError):
+            private_key.get_unspents()
+
     def test_get_transactions(self):
         private_key = PrivateKeyTestnet(WALLET_FORMAT_TEST)
         transactions = private_key.get_transactions()
@@ -238,20 +280,79 @@ class TestPrivateKeyTestnet:
 
         assert current > initial
 
-    def test_send_pay2sh(self):
+    def test_create_transaction_pay2sh(self):
         """
-        We don't yet support pay2sh, so we must throw an exception if we get one.
-        Otherwise, we could send coins into an unrecoverable blackhole, needlessly.
-        pay2sh addresses begin with 2 in testnet and 3 on mainnet.
+        pay2sh addresses begin with 2 or Q in testnet and 3 or M on mainnet.
         """
-        if TRAVIS and sys.version_info[:2] != (3, 6):
-            return
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        unspents = [Unspent(100000, 1, '', '00' * 32, 0)]
+
+        tx = private_key.create_transaction(
+            [(LITECOIN_ADDRESS_TEST_PAY2SH, 1000, 'satoshi')], fee=1, unspents=unspents, as_bytes=True
+        )
+
+        script = bytes(deserialize(tx).outputs[0].script)
+        assert script[:2] == b'\xa9\x14' and script[-1:] == b'\x87'
 
+    def test_sign_transaction_bytes(self):
         private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
-        private_key.get_unspents()
+        unspents = [Unspent(100000, 1, '', '00' * 32, 0)]
+        outputs = [(LITECOIN_ADDRESS_TEST, 1000, 'satoshi')]
+
+        prepared = private_key.prepare_transaction(
+            private_key.address, outputs, fee=1, unspents=unspents, as_bytes=True
+        )
+        prepared_json = private_key.prepare_transaction(
+            private_key.address, outputs, fee=1, unspents=unspents
+        )
+
+        assert isinstance(prepared, bytes)
+        assert private_key.sign_transaction(prepared) == private_key.sign_transaction(prepared_json)
+
+    def test_sign_transactions(self):
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        prepared = [
+            private_key.prepare_transaction(
+                private_key.address, [(LITECOIN_ADDRESS_TEST, 1000 + i, 'satoshi')], fee=1,
+                unspents=[Unspent(100000, 1, '', '00' * 32, i)], as_bytes=bool(i % 2)
+            )
+            for i in range(40)
+        ]
+        expected = [private_key.sign_transaction(tx_data) for tx_data in prepared]
+
+        assert list(private_key.sign_transactions(prepared, workers=1)) == expected
+        assert list(private_key.sign_transactions(iter(prepared), workers=2, chunksize=3)) == expected
+
+    def test_bump_fee(self, monkeypatch):
+        broadcast = []
+        monkeypatch.setattr('lit.wallet.NetworkAPI.broadcast_tx_testnet', broadcast.append)
+
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        private_key.unspents[:] = [Unspent(100000, 1, '', '00' * 32, 0)]
+
+        txid = private_key.send([(LITECOIN_ADDRESS_TEST, 1000, 'satoshi')], fee=1, replaceable=True)
+        balance = private_key.balance
+        bumped = private_key.bump_fee(broadcast[0], fee=5)
+
+        assert deserialize(broadcast[1]).txid == bumped != txid
+        assert [unspent.txid for unspent in private_key.unspents] == [bumped]
+        assert private_key.balance < balance
+
+    def test_cpfp(self, monkeypatch):
+        broadcast = []
+        monkeypatch.setattr('lit.wallet.NetworkAPI.broadcast_tx_testnet', broadcast.append)
+
+        private_key = PrivateKeyTestnet(WALLET_FORMAT_COMPRESSED_TEST)
+        parent = PrivateKeyTestnet().create_transaction(
+            [(private_key.address, 50000, 'satoshi')], fee=1, combine=False,
+            unspents=[Unspent(100000, 1, '', '00' * 32, 0)], as_bytes=True
+        )
+        private_key.unspents[:] = [Unspent(50000, 0, '', deserialize(parent).txid, 0)]
+
+        txid = private_key.cpfp([(parent, 226)], fee=20)
 
-        with pytest.raises(ValueError):
-            private_key.send([('2NFKbBHzzh32q5DcZJNgZE9sF7gYmtPbawk', 1, 'jpy')])
+        assert deserialize(broadcast[0]).txid == txid
+        assert [unspent.txid for unspent in private_key.unspents] == [txid]
 
     def test_cold_storage(self):
         if TRAVIS and sys.version_info[:2] != (3, 6):